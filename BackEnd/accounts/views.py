@@ -4,7 +4,7 @@ from rest_framework.decorators import api_view
 from rest_framework import status, viewsets
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from movies.models import Actor, Movie, Genre, News
+from movies.models import Actor, Movie, MovieCard, Genre, News
 from community.models import Review, Post, Comment
 from accounts.models import CustomUser, Notification
 from accounts.serializers import UserProfileReadSerializer, UserProfileUpdateSerializer, DashboardSerializer, NotificationSerializer, CustomRegisterSerializer
@@ -319,8 +319,10 @@ def user_liked_movies_view(request, user_id):
     # 1. 특정 사용자 가져오기
     user = get_object_or_404(CustomUser, id=user_id)
 
-    # 2. 유저의 좋아하는 영화 쿼리셋
-    liked_movies_queryset = user.liked_movies.order_by('-normalized_popularity')
+    # 2. 유저의 좋아하는 영화 카드 쿼리셋 (장르가 카드 행에 포함되어 있어 추가 쿼리 없음)
+    liked_movies_queryset = MovieCard.objects.filter(
+        pk__in=user.liked_movies.values('id')
+    ).order_by('-normalized_popularity', '-pk')
 
     # 3. 페이지네이션 처리
     paginator = CommentsPagination()
@@ -333,7 +335,7 @@ def user_liked_movies_view(request, user_id):
             'title': movie.title,
             'poster_path': movie.poster_path,
             'normalized_popularity': movie.normalized_popularity,
-            'genres': [genre.name for genre in movie.genres.all()]
+            'genres': movie.genre_names
         }
         for movie in paginated_movies
     ]
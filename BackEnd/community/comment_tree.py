@@ -0,0 +1,98 @@
+# community/comment_tree.py
+from collections import defaultdict, deque, namedtuple
+
+from rest_framework.exceptions import ValidationError
+
+from community.models import Comment
+
+# 댓글을 달 수 있는 대상 (Comment 모델의 FK 이름)
+COMMENT_TARGETS = ('movie', 'actor', 'director', 'post', 'review')
+
+# comments: 작성일 내림차순 전체 댓글 목록, roots: 그 중 최상위 댓글 목록
+CommentTree = namedtuple('CommentTree', ['comments', 'roots'])
+
+
+def load_comment_tree(max_depth=None, replies_page_size=None, replies_after=(), **target):
+    """
+    대상(영화, 배우, 감독, 게시글, 리뷰)에 달린 모든 댓글을 한 번의 쿼리로 가져와
+    메모리에서 대댓글 트리를 구성합니다.
+
+    Args:
+        max_depth: 최상위 댓글을 0으로 했을 때 대댓글을 포함할 최대 깊이 (None 이면 제한 없음)
+        replies_page_size: 각 댓글에 붙일 대댓글 최대 개수 (None 이면 전부)
+        replies_after: 대댓글 커서 (대댓글 ID 목록). 커서 대댓글의 부모 댓글은 그 다음 대댓글부터 붙이며,
+            깊이와 상관없이 부모 댓글마다 하나씩 지정할 수 있습니다.
+        **target: movie=..., actor=..., director=..., post=..., review=... 중 하나
+
+    Returns:
+        CommentTree: 각 댓글에는 다음 속성이 채워집니다.
+            - tree_replies: 직렬화에 사용할 대댓글 목록 (작성일 오름차순)
+            - reply_count: 잘리기 전 전체 대댓글 수
+            - replies_next_cursor: 다음 대댓글 페이지의 replies_after 값 (남은 대댓글이 없으면 None)
+    """
+    if len(target) != 1 or next(iter(target)) not in COMMENT_TARGETS:
+        raise ValueError(f"댓글 대상은 {', '.join(COMMENT_TARGETS)} 중 하나만 지정해야 합니다.")
+
+    comments = list(
+        Comment.objects.filter(**target)
+        .select_related('user')
+        .order_by('-created_at', '-id')
+    )
+
+    replies_after = set(replies_after)
+    by_id = {comment.id: comment for comment in comments}
+    children = defaultdict(list)
+    roots = []
+    for comment in comments:
+        if comment.parent_id in by_id:
+            children[comment.parent_id].append(comment)
+        else:
+            # 부모가 없거나 다른 대상에 속한 경우 최상위 댓글로 취급
+            roots.append(comment)
+
+    # 최상위 댓글부터 너비 우선으로 깊이를 계산하며 대댓글을 연결
+    queue = deque((root, 0) for root in roots)
+    while queue:
+        comment, depth = queue.popleft()
+        replies = children.get(comment.id, [])[::-1]  # 대댓글은 작성일 오름차순
+        comment.reply_count = len(replies)
+        for reply in replies:
+            queue.append((reply, depth + 1))
+
+        comment.replies_next_cursor = None
+        if max_depth is not None and depth >= max_depth:
+            replies = []
+        else:
+            # 커서로 지정한 대댓글 다음부터 한 페이지
+            start = next((index + 1 for index, reply in enumerate(replies) if reply.id in replies_after), 0)
+            end = len(replies) if replies_page_size is None else start + replies_page_size
+            if end < len(replies) and end > start:
+                comment.replies_next_cursor = replies[end - 1].id
+            replies = replies[start:end]
+        comment.tree_replies = replies
+
+    return CommentTree(comments=comments, roots=roots)
+
+
+def comment_tree_options(request):
+    """
+    요청의 쿼리 파라미터(comment_depth, replies_page_size, replies_after)를 load_comment_tree 옵션으로 변환합니다.
+    replies_after 는 쉼표로 구분한 대댓글 ID 목록입니다. (예: ?replies_after=12,40)
+    """
+    options = {}
+    for param, option in (('comment_depth', 'max_depth'), ('replies_page_size', 'replies_page_size')):
+        value = request.query_params.get(param)
+        if value in (None, ''):
+            continue
+        try:
+            options[option] = max(0, int(value))
+        except ValueError:
+            raise ValidationError({param: "정수를 입력해주세요."})
+
+    value = request.query_params.get('replies_after')
+    if value:
+        try:
+            options['replies_after'] = tuple(sorted({int(reply_id) for reply_id in value.split(',') if reply_id.strip()}))
+        except ValueError:
+            raise ValidationError({'replies_after': "쉼표로 구분한 대댓글 ID 를 입력해주세요."})
+    return options
@@ -0,0 +1,31 @@
+# community/management/commands/backfill_comment_counts.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from community.models import Comment
+
+
+class Command(BaseCommand):
+    help = "댓글의 좋아요/싫어요 카운터(like_count, dislike_count)를 M2M 테이블 기준으로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="한 번에 갱신할 댓글 수 (기본값: 1000)"
+        )
+        parser.add_argument(
+            '--ids', type=int, nargs='+',
+            help="특정 댓글 ID만 갱신"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        comment_ids = options['ids'] or list(Comment.objects.order_by('pk').values_list('pk', flat=True))
+
+        updated = 0
+        for start in range(0, len(comment_ids), batch_size):
+            # 배치마다 트랜잭션을 나눠 잠금 시간을 짧게 유지
+            with transaction.atomic():
+                updated += Comment.recount(comment_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"댓글 {updated}개의 좋아요/싫어요 수를 갱신했습니다."))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_counts(apps, schema_editor):
+    """
+    기존 댓글의 좋아요/싫어요 수를 M2M 테이블 기준으로 채웁니다.
+    """
+    Comment = apps.get_model('community', 'Comment')
+
+    def m2m_count(through):
+        counts = (
+            through.objects.filter(comment_id=OuterRef('pk'))
+            .order_by()
+            .values('comment_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts, output_field=models.IntegerField()), Value(0))
+
+    Comment.objects.update(
+        like_count=m2m_count(Comment.likes.through),
+        dislike_count=m2m_count(Comment.dislikes.through),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0, help_text='싫어요 수'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, help_text='좋아요 수'),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from accounts.models import CustomUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from movies.models import Actor, Movie, Genre, News, Director
@@ -114,14 +116,33 @@ class Comment(models.Model):
         CustomUser, related_name='disliked_comments', blank=True,
         help_text="이 댓글을 싫어요 한 사용자들"
     )
+    # 목록 조회 시 COUNT 쿼리를 피하기 위한 비정규화 카운터 (좋아요/싫어요 토글 시 함께 갱신)
+    like_count = models.PositiveIntegerField(default=0, help_text="좋아요 수")
+    dislike_count = models.PositiveIntegerField(default=0, help_text="싫어요 수")
 
     def __str__(self):
         return f"Comment by {self.user.username}"
 
-    @property
-    def like_count(self):
-        return self.likes.count()
+    @classmethod
+    def recount(cls, comment_ids=None):
+        """
+        likes/dislikes M2M 테이블을 기준으로 저장된 좋아요/싫어요 수를 다시 계산합니다.
+        comment_ids 가 없으면 전체 댓글을 갱신하며, 갱신된 행 수를 반환합니다.
+        """
+        def m2m_count(through):
+            counts = (
+                through.objects.filter(comment_id=OuterRef('pk'))
+                .order_by()
+                .values('comment_id')
+                .annotate(total=Count('*'))
+                .values('total')
+            )
+            return Coalesce(Subquery(counts, output_field=models.IntegerField()), Value(0))
 
-    @property
-    def dislike_count(self):
-        return self.dislikes.count()
+        queryset = cls.objects.all()
+        if comment_ids is not None:
+            queryset = queryset.filter(pk__in=comment_ids)
+        return queryset.update(
+            like_count=m2m_count(cls.likes.through),
+            dislike_count=m2m_count(cls.dislikes.through),
+        )
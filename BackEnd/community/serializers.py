@@ -5,6 +5,8 @@ from movies.models import Movie, Genre, Actor, Director, News, ActorCharacter
 from community.models import Review, Post, Comment
 from accounts.models import CustomUser, Notification
 from django.db.models import Count
+from community.comment_tree import load_comment_tree
+from utils import get_liked_ids
 
         
 from rest_framework import serializers
@@ -32,6 +34,7 @@ class CommentSerializer(serializers.ModelSerializer):
     dislike_count = serializers.ReadOnlyField()  # 싫어요 수
     parent = serializers.PrimaryKeyRelatedField(queryset=Comment.objects.all(), allow_null=True)  # 부모 댓글 ID
     replies = serializers.SerializerMethodField()  # 대댓글
+    replies_next_cursor = serializers.SerializerMethodField()  # 다음 대댓글 페이지 커서
 
     class Meta:
         model = Comment
@@ -48,7 +51,8 @@ class CommentSerializer(serializers.ModelSerializer):
             "actor",         # 배우
             "director",      # 감독
             "movie",         # 영화
-            "replies"        # 대댓글 리스트
+            "replies",       # 대댓글 리스트
+            "replies_next_cursor"  # 다음 대댓글 페이지 커서 (replies_after)
         ]
         read_only_fields = [
             "id",
@@ -61,7 +65,8 @@ class CommentSerializer(serializers.ModelSerializer):
             "actor",
             "director",
             "movie",
-            "replies"
+            "replies",
+            "replies_next_cursor"
         ]
 
     def get_user(self, obj):
@@ -82,9 +87,19 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         대댓글 리스트 반환
         """
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.all(), many=True, context=self.context).data
-        return []
+        # load_comment_tree 로 미리 구성한 트리가 있으면 추가 쿼리 없이 사용
+        replies = getattr(obj, 'tree_replies', None)
+        if replies is None:
+            if not obj.replies.exists():
+                return []
+            replies = obj.replies.all()
+        return CommentSerializer(replies, many=True, context=self.context).data
+
+    def get_replies_next_cursor(self, obj):
+        """
+        다음 대댓글 페이지를 가져올 replies_after 값 (load_comment_tree 로 구성한 트리가 아니면 None)
+        """
+        return getattr(obj, 'replies_next_cursor', None)
 
     def create(self, validated_data):
         # user 및 movie를 저장 시 전달받아 사용
@@ -148,10 +163,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
 
     def get_is_liked(self, obj):
         """현재 사용자가 게시글에 좋아요를 눌렀는지 여부"""
-        user = self.context.get("request").user
-        if user.is_authenticated:
-            return obj.liked_posts_by_users.filter(id=user.id).exists()
-        return False
+        return get_liked_ids(self.context.get("request")).contains('post', obj)
 
     def get_comments(self, obj):
         """게시글에 달린 댓글 목록"""
@@ -294,17 +306,11 @@ class ReviewDetailSerializer(serializers.ModelSerializer):
 
         def get_is_liked(self, obj):
             """현재 사용자가 댓글을 좋아요했는지 여부"""
-            user = self.context.get("request").user
-            if user.is_authenticated:
-                return obj.likes.filter(id=user.id).exists()
-            return False
+            return get_liked_ids(self.context.get("request")).contains('comment', obj)
 
         def get_is_disliked(self, obj):
             """현재 사용자가 댓글을 싫어요했는지 여부"""
-            user = self.context.get("request").user
-            if user.is_authenticated:
-                return obj.dislikes.filter(id=user.id).exists()
-            return False
+            return get_liked_ids(self.context.get("request")).contains('disliked_comment', obj)
 
         class Meta:
             model = Comment
@@ -340,17 +346,12 @@ class ReviewDetailSerializer(serializers.ModelSerializer):
 
     def get_is_liked(self, obj):
         """현재 사용자가 리뷰를 좋아요했는지 여부"""
-        user = self.context.get("request").user
-        if user.is_authenticated:
-            return obj.liked_reviews_by_users.filter(id=user.id).exists()
-        return False
+        return get_liked_ids(self.context.get("request")).contains('review', obj)
 
     def get_comments(self, obj):
         """리뷰에 달린 댓글 목록"""
-        comments = obj.review_comments.annotate(
-            like_count=Count('likes'),         # 좋아요 수
-            dislike_count=Count('dislikes')   # 싫어요 수
-        )
+        # 좋아요/싫어요 수가 미리 집계된 댓글 목록을 한 번의 쿼리로 조회
+        comments = load_comment_tree(review=obj, **self.context.get("comment_tree_options", {})).comments
         return self.CommentSerializer(comments, many=True, context=self.context).data
 
     class Meta:
@@ -1,3 +1,132 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from community.comment_tree import load_comment_tree
+from community.models import Comment, Post, Review
+
+User = get_user_model()
+
+
+def create_user(username):
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password='pw')
+
+
+class CommentTreeTests(TestCase):
+    def setUp(self):
+        self.user = create_user('writer')
+        self.post = Post.objects.create(user=self.user, title="Post", content="Content")
+        self.root = Comment.objects.create(user=self.user, post=self.post, content="root")
+        self.replies = [
+            Comment.objects.create(user=self.user, post=self.post, parent=self.root, content=f"reply {index}")
+            for index in range(5)
+        ]
+        self.nested = [
+            Comment.objects.create(user=self.user, post=self.post, parent=self.replies[0], content=f"nested {index}")
+            for index in range(3)
+        ]
+        self.client = APIClient()
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            tree = load_comment_tree(post=self.post)
+        self.assertEqual(tree.roots, [self.root])
+        self.assertEqual(tree.roots[0].tree_replies, self.replies)
+
+    def test_cursor_pages_each_reply_level(self):
+        tree = load_comment_tree(replies_page_size=2, post=self.post)
+        root = tree.roots[0]
+        self.assertEqual(root.tree_replies, self.replies[:2])
+        self.assertEqual(root.replies_next_cursor, self.replies[1].id)
+        self.assertEqual(root.reply_count, 5)
+        self.assertEqual(root.tree_replies[0].replies_next_cursor, self.nested[1].id)
+
+        # 부모 댓글마다 커서를 하나씩 지정하면 각 단계가 독립적으로 다음 페이지로 넘어감
+        tree = load_comment_tree(
+            replies_page_size=2, replies_after=(self.replies[1].id, self.nested[1].id), post=self.post,
+        )
+        root = tree.roots[0]
+        self.assertEqual(root.tree_replies, self.replies[2:4])
+        self.assertEqual(root.replies_next_cursor, self.replies[3].id)
+        first_reply = next(comment for comment in tree.comments if comment.id == self.replies[0].id)
+        self.assertEqual(first_reply.tree_replies, self.nested[2:])
+        self.assertIsNone(first_reply.replies_next_cursor)
+
+    def test_post_detail_applies_comment_options(self):
+        response = self.client.get(
+            f'/community/posts/{self.post.pk}/',
+            {'replies_page_size': 2, 'replies_after': self.replies[1].id},
+        )
+        self.assertEqual(response.status_code, 200)
+        root = next(comment for comment in response.data['results']['comments'] if comment['id'] == self.root.id)
+        self.assertEqual([reply['id'] for reply in root['replies']], [reply.id for reply in self.replies[2:4]])
+        self.assertEqual(root['replies_next_cursor'], self.replies[3].id)
+
+        response = self.client.get(f'/community/posts/{self.post.pk}/', {'comment_depth': 0})
+        self.assertTrue(all(comment['replies'] == [] for comment in response.data['results']['comments']))
+
+    def test_review_detail_applies_comment_options(self):
+        review = Review.objects.create(user=self.user, title="Review", content="Content", rating=5)
+        root = Comment.objects.create(user=self.user, review=review, content="root")
+        reply = Comment.objects.create(user=self.user, review=review, parent=root, content="reply")
+
+        response = self.client.get(f'/community/reviews/{review.pk}/', {'comment_depth': 0})
+        self.assertEqual(response.status_code, 200)
+        comments = {comment['id']: comment for comment in response.data['results']['comments']}
+        self.assertEqual(comments[root.id]['replies'], [])
+
+        response = self.client.get(f'/community/reviews/{review.pk}/')
+        comments = {comment['id']: comment for comment in response.data['results']['comments']}
+        self.assertEqual([item['id'] for item in comments[root.id]['replies']], [reply.id])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(f'/community/posts/{self.post.pk}/', {'replies_after': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentCounterTests(TestCase):
+    def setUp(self):
+        self.writer = create_user('writer')
+        self.reader = create_user('reader')
+        post = Post.objects.create(user=self.writer, title="Post", content="Content")
+        self.comment = Comment.objects.create(user=self.writer, post=post, content="comment")
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def toggle(self, reaction):
+        response = self.client.post(f'/community/comments/{self.comment.pk}/{reaction}-toggle/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assertCounts(self, like_count, dislike_count):
+        self.comment.refresh_from_db()
+        self.assertEqual((self.comment.like_count, self.comment.dislike_count), (like_count, dislike_count))
+        self.assertEqual(
+            (self.comment.likes.count(), self.comment.dislikes.count()), (like_count, dislike_count)
+        )
+
+    def test_like_toggle_updates_counter(self):
+        self.assertEqual(self.toggle('like')['like_count'], 1)
+        self.assertCounts(1, 0)
+        self.assertEqual(self.toggle('like')['like_count'], 0)
+        self.assertCounts(0, 0)
+
+    def test_dislike_replaces_like(self):
+        self.toggle('like')
+        data = self.toggle('dislike')
+        self.assertEqual((data['like_count'], data['dislike_count']), (0, 1))
+        self.assertCounts(0, 1)
+        self.toggle('dislike')
+        self.assertCounts(0, 0)
+
+    def test_tree_uses_stored_counters(self):
+        self.toggle('like')
+        with self.assertNumQueries(1):
+            comment = load_comment_tree(post=self.comment.post_id).comments[0]
+        self.assertEqual(comment.like_count, 1)
+
+    def test_recount_repairs_counters(self):
+        self.comment.likes.add(self.reader, self.writer)
+        self.comment.dislikes.add(self.reader)
+        self.assertEqual(Comment.recount([self.comment.pk]), 1)
+        self.assertCounts(2, 1)
@@ -1,9 +1,10 @@
 from django.shortcuts import render
-from utils import create_notification
+from utils import create_notification, get_liked_ids
 from movies.models import Movie, Genre, Actor, Director, News, ActorCharacter
 from community.models import Review, Post, Comment
 from accounts.models import CustomUser, Notification 
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, F, Q
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
@@ -15,6 +16,8 @@ from django.shortcuts import get_object_or_404
 from .serializers import PostDetailSerializer
 from rest_framework.exceptions import NotFound
 from rest_framework import status
+from community.comment_tree import load_comment_tree, comment_tree_options
+from movies.cache import bump_movie_detail_version
 
 
 
@@ -240,7 +243,25 @@ class CommentPagination(PageNumberPagination):
             description="조회할 게시글의 ID",
             type=openapi.TYPE_INTEGER,
             required=True
-        )
+        ),
+        openapi.Parameter(
+            "comment_depth",
+            openapi.IN_QUERY,
+            description="대댓글을 포함할 최대 깊이 (0이면 최상위 댓글만, 기본값: 제한 없음)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            "replies_page_size",
+            openapi.IN_QUERY,
+            description="댓글마다 포함할 대댓글 최대 개수 (기본값: 전부)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            "replies_after",
+            openapi.IN_QUERY,
+            description="대댓글 커서 (댓글의 replies_next_cursor 값, 쉼표로 여러 개 지정)",
+            type=openapi.TYPE_STRING
+        ),
     ]
 )
 @api_view(['GET'])
@@ -256,11 +277,8 @@ def post_detail_view(request, post_id):
         comment_count=Count('post_comments')  # 게시글에 달린 댓글 수
     ), id=post_id)
 
-    # 댓글 목록 조회 및 페이지네이션 적용
-    comments = Comment.objects.filter(post=post).annotate(
-    annotated_like_count=Count('likes'),  # 이름 변경
-    annotated_dislike_count=Count('dislikes')  # 이름 변경
-).order_by('-created_at')
+    # 댓글 목록 조회 및 페이지네이션 적용 (대댓글 트리까지 한 번의 쿼리로 구성)
+    comments = load_comment_tree(post=post, **comment_tree_options(request)).comments
 
     paginator = CommentPagination()
     paginated_comments = paginator.paginate_queryset(comments, request)
@@ -826,6 +844,24 @@ from .serializers import ReviewDetailSerializer
             type=openapi.TYPE_INTEGER,
             required=False
         ),
+        openapi.Parameter(
+            "comment_depth",
+            openapi.IN_QUERY,
+            description="대댓글을 포함할 최대 깊이 (0이면 최상위 댓글만, 기본값: 제한 없음)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            "replies_page_size",
+            openapi.IN_QUERY,
+            description="댓글마다 포함할 대댓글 최대 개수 (기본값: 전부)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            "replies_after",
+            openapi.IN_QUERY,
+            description="대댓글 커서 (댓글의 replies_next_cursor 값, 쉼표로 여러 개 지정)",
+            type=openapi.TYPE_STRING
+        ),
     ]
 )
 @api_view(['GET'])
@@ -843,8 +879,8 @@ def review_detail_view(request, review_id):
     except Review.DoesNotExist:
         raise NotFound({"message": "리뷰를 찾을 수 없습니다."})
 
-    # 댓글 목록 조회
-    comments = Comment.objects.filter(review=review).select_related('user').prefetch_related('likes', 'dislikes').order_by('-created_at')
+    # 댓글 목록 조회 (대댓글 트리까지 한 번의 쿼리로 구성)
+    comments = load_comment_tree(review=review, **comment_tree_options(request)).comments
 
     # 페이지네이션 적용
     paginator = CommentPagination()
@@ -862,7 +898,7 @@ def review_detail_view(request, review_id):
         "created_at": review.created_at,
         "updated_at": review.updated_at,
         "like_count": review.like_count,
-        "is_liked": review.liked_reviews_by_users.filter(id=request.user.id).exists() if request.user.is_authenticated else False,
+        "is_liked": get_liked_ids(request).contains('review', review),
         "user": {
             "id": review.user.id,
             "username": review.user.username,
@@ -1401,6 +1437,28 @@ def delete_comment_view(request, comment_id):
 # 하단은 댓글 좋아요 관련
 
 
+def _remove_comment_reaction(through, comment, user):
+    """
+    댓글 좋아요/싫어요 M2M 행을 삭제하고 실제로 삭제되었는지 여부를 반환합니다.
+    """
+    deleted, _ = through.objects.filter(comment_id=comment.id, customuser_id=user.id).delete()
+    return deleted > 0
+
+
+def _adjust_comment_counts(comment, **deltas):
+    """
+    댓글의 비정규화 카운터를 F() 표현식으로 원자적으로 증감한 뒤 최신 값을 다시 읽어옵니다.
+    """
+    if not deltas:
+        return
+    Comment.objects.filter(pk=comment.pk).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    comment.refresh_from_db(fields=list(deltas))
+    # queryset.update() 는 post_save 시그널을 보내지 않으므로 영화 상세 캐시를 직접 무효화
+    bump_movie_detail_version(comment.movie_id)
+
+
 # 댓글 좋아요 토글
 @swagger_auto_schema(
     method='post',
@@ -1438,31 +1496,35 @@ def delete_comment_view(request, comment_id):
 def toggle_comment_like_view(request, comment_id):
     """
     댓글 좋아요/취소 토글 API
+    - M2M 변경과 카운터 갱신을 하나의 트랜잭션에서 처리합니다.
     """
-    comment = get_object_or_404(Comment, id=comment_id)
     user = request.user
 
     if user.is_authenticated:
-        if comment.likes.filter(id=user.id).exists():
-            comment.likes.remove(user)  # 좋아요 취소
-            liked = False
-        else:
-            comment.likes.add(user)  # 좋아요 추가
-            liked = True
-
-            # 좋아요 알림 생성
-            if comment.user != user:  # 자기 자신에게는 알림 X
-                create_notification(
-                    user=comment.user,
-                    content=f"'{user.username}'님이 댓글을 좋아합니다.",
-                    type='like',
-                    instance=comment
-                )
+        with transaction.atomic():
+            # 같은 댓글에 대한 동시 토글이 카운터를 어긋나게 하지 않도록 행 잠금
+            comment = get_object_or_404(Comment.objects.select_for_update(), id=comment_id)
+            if _remove_comment_reaction(Comment.likes.through, comment, user):
+                _adjust_comment_counts(comment, like_count=-1)  # 좋아요 취소
+                liked = False
+            else:
+                comment.likes.add(user)  # 좋아요 추가
+                _adjust_comment_counts(comment, like_count=1)
+                liked = True
+
+        # 좋아요 알림 생성
+        if liked and comment.user_id != user.id:  # 자기 자신에게는 알림 X
+            create_notification(
+                user=comment.user,
+                content=f"'{user.username}'님이 댓글을 좋아합니다.",
+                type='like',
+                instance=comment
+            )
 
         return Response({
             "message": "좋아요 상태가 변경되었습니다.",
             "liked": liked,
-            "like_count": comment.likes.count()
+            "like_count": comment.like_count
         }, status=200)
     return Response({"message": "로그인이 필요합니다."}, status=401)
 
@@ -1506,25 +1568,29 @@ def toggle_comment_dislike_view(request, comment_id):
     댓글 싫어요 토글 API
     - 싫어요 상태를 토글합니다.
     """
-    comment = get_object_or_404(Comment, id=comment_id)
     user = request.user
 
     if not user.is_authenticated:
         return Response({"message": "로그인이 필요합니다."}, status=401)
 
-    if user in comment.dislikes.all():
-        comment.dislikes.remove(user)
-        disliked = False
-        message = "댓글 싫어요를 취소했습니다."
-    else:
-        comment.dislikes.add(user)
-        comment.likes.remove(user)  # 좋아요 제거
-        disliked = True
-        message = "댓글 싫어요를 눌렀습니다."
+    with transaction.atomic():
+        comment = get_object_or_404(Comment.objects.select_for_update(), id=comment_id)
+        if _remove_comment_reaction(Comment.dislikes.through, comment, user):
+            _adjust_comment_counts(comment, dislike_count=-1)
+            disliked = False
+            message = "댓글 싫어요를 취소했습니다."
+        else:
+            comment.dislikes.add(user)
+            deltas = {'dislike_count': 1}
+            if _remove_comment_reaction(Comment.likes.through, comment, user):  # 좋아요 제거
+                deltas['like_count'] = -1
+            _adjust_comment_counts(comment, **deltas)
+            disliked = True
+            message = "댓글 싫어요를 눌렀습니다."
 
     return Response({
         "message": message,
         "disliked": disliked,
-        "like_count": comment.likes.count(),
-        "dislike_count": comment.dislikes.count()
+        "like_count": comment.like_count,
+        "dislike_count": comment.dislike_count
     }, status=200)
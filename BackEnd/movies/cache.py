@@ -0,0 +1,77 @@
+# movies/cache.py
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# 영화 상세 공용 응답 캐시 유지 시간 (초)
+MOVIE_DETAIL_CACHE_TIMEOUT = getattr(settings, 'MOVIE_DETAIL_CACHE_TIMEOUT', 60 * 10)
+
+
+def detail_cache_enabled():
+    """
+    공용 캐시 백엔드일 때만 상세 캐시를 사용합니다.
+    LocMemCache 는 워커 프로세스마다 따로라서 버전을 올려도 다른 워커는 만료될 때까지 이전 응답을 돌려주기 때문입니다.
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def _version_key(movie_id):
+    return f'movie-detail:version:{movie_id}'
+
+
+def get_movie_detail_version(movie_id):
+    """
+    영화 상세 캐시의 현재 버전을 반환합니다.
+    버전 키가 없으면(최초 조회 또는 캐시에서 밀려난 경우) 이전 값과 겹치지 않도록 현재 시각(ms)으로 시작합니다.
+    """
+    key = _version_key(movie_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_movie_detail_version(*movie_ids):
+    """
+    영화의 캐시 버전을 올려 기존 상세 응답 캐시를 무효화합니다.
+    (이전 버전 키의 데이터는 조회되지 않다가 만료됩니다)
+    """
+    if not detail_cache_enabled():
+        return
+    for movie_id in movie_ids:
+        if movie_id is None:
+            continue
+        try:
+            cache.incr(_version_key(movie_id))
+        except ValueError:
+            # 버전 키가 없다면 다음 조회 때 새 버전으로 시작하므로 할 일이 없음
+            pass
+
+
+def movie_detail_cache_key(movie_id, version, variant=''):
+    return f'movie-detail:{movie_id}:v{version}:{variant}'
+
+
+def get_or_build_movie_detail(movie_id, build, variant=''):
+    """
+    영화 상세의 공용(사용자와 무관한) 응답을 버전 키로 캐시합니다.
+
+    Args:
+        movie_id: 영화 ID
+        build: 캐시 미스 시 공용 응답 dict 를 만드는 함수
+        variant: 같은 영화라도 응답이 달라지는 조회 옵션 (댓글 깊이 등)
+
+    Returns:
+        dict: 공용 응답 (호출 측에서 사용자별 값을 덮어써도 캐시에 영향이 없도록 복사본 반환)
+    """
+    if not detail_cache_enabled():
+        return dict(build())
+    key = movie_detail_cache_key(movie_id, get_movie_detail_version(movie_id), variant)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=MOVIE_DETAIL_CACHE_TIMEOUT)
+    return dict(data)
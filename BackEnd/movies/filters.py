@@ -0,0 +1,98 @@
+# movies/filters.py
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+
+from movies.models import Genre, Movie
+
+
+def _parse_number(params, name, cast):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValidationError({name: "숫자를 입력해주세요."})
+
+
+def _clamp_year(year):
+    return min(max(year, date.min.year), date.max.year)
+
+
+def _genre_values(params):
+    """
+    genre 파라미터를 (장르 ID 목록, 장르 이름 목록)으로 나눕니다. 지정하지 않았거나 '전체'면 None
+    """
+    genre = params.get('genre', '').strip()
+    if not genre or genre == '전체':
+        return None
+    values = [value.strip() for value in genre.split(',') if value.strip()]
+    ids = [int(value) for value in values if value.isdigit()]
+    names = [value for value in values if not value.isdigit()]
+    return ids, names
+
+
+def genre_ids_from_params(params):
+    """
+    genre 파라미터(장르 이름 또는 ID, 쉼표로 여러 개)를 장르 ID 집합으로 바꿉니다.
+    지정하지 않았으면 None, 지정했지만 맞는 장르가 없으면 빈 집합을 반환합니다.
+    """
+    values = _genre_values(params)
+    if values is None:
+        return None
+    ids, names = values
+    genre_ids = set(ids)
+    if names:
+        genre_ids.update(Genre.objects.filter(name__in=names).values_list('id', flat=True))
+    return genre_ids
+
+
+def year_range_from_params(params):
+    """
+    year_min / year_max 파라미터 중 지정된 값만 담은 dict 를 반환합니다. (숫자가 아니면 ValidationError)
+    """
+    years = {}
+    for name in ('year_min', 'year_max'):
+        value = _parse_number(params, name, int)
+        if value is not None:
+            years[name] = value
+    return years
+
+
+def filter_movies(queryset, params):
+    """
+    영화(Movie) 또는 영화 카드(MovieCard) 쿼리셋에 서버 측 필터를 적용합니다.
+
+    지원 파라미터:
+        search: 제목 부분 일치
+        genre: 장르 이름 또는 ID (쉼표로 여러 개 지정 시 하나라도 포함하면 통과)
+        year_min / year_max: 개봉 연도 범위
+        popularity_min / popularity_max: normalized_popularity 범위 (0~10)
+    """
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(title__icontains=search)
+
+    genre_values = _genre_values(params)
+    if genre_values is not None:
+        ids, names = genre_values
+        # M2M 조인 대신 서브쿼리를 사용해 중복 행 없이 필터링
+        movie_genres = Movie.genres.through.objects.filter(genre__name__in=names) | \
+            Movie.genres.through.objects.filter(genre_id__in=ids)
+        queryset = queryset.filter(pk__in=movie_genres.values('movie_id'))
+
+    years = year_range_from_params(params)
+    if 'year_min' in years:
+        queryset = queryset.filter(release_date__gte=date(_clamp_year(years['year_min']), 1, 1))
+    if 'year_max' in years:
+        queryset = queryset.filter(release_date__lte=date(_clamp_year(years['year_max']), 12, 31))
+
+    popularity_min = _parse_number(params, 'popularity_min', float)
+    popularity_max = _parse_number(params, 'popularity_max', float)
+    if popularity_min is not None:
+        queryset = queryset.filter(normalized_popularity__gte=popularity_min)
+    if popularity_max is not None:
+        queryset = queryset.filter(normalized_popularity__lte=popularity_max)
+
+    return queryset
@@ -0,0 +1,223 @@
+# movies/management/commands/benchmark_recommendations.py
+import json
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from movies.recommendation import benchmark
+from movies.recommendation.als import ALSModel, als_recommendations
+from movies.recommendation.catalog import get_catalog
+from movies.recommendation.diversity import MMR_LAMBDA, mmr_rerank
+from movies.recommendation.embeddings import build_embedding_store, get_embedding_store, normalize_rows
+from movies.recommendation.batcher import keyword_encoder
+from movies.recommendation.interactions import Interactions
+from movies.recommendation.item_cf import ItemNeighbors, item_cf_recommendations
+from movies.recommendation.keyword import ANN_MIN_SIZE, build_keyword_index
+from movies.recommendation.model import get_sentence_model
+from movies.recommendation.personalized import personalized_recommendations
+from movies.recommendation.pipeline import two_stage_recommendations
+from movies.recommendation.query_cache import keyword_cache_stats, keyword_result_cache, keyword_vector_cache
+
+# 사용자 기반 추천 엔진: 이름 -> recommend(user, k)
+USER_ENGINES = {
+    'personalized': personalized_recommendations,
+    'two_stage': lambda user, k: two_stage_recommendations(user, k)["items"],
+    'item_cf': item_cf_recommendations,
+    'als': als_recommendations,
+    'popularity': benchmark.popularity_recommendations,
+}
+KEYWORD_ENGINE = 'keyword'
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class Rollback(Exception):
+    """합성 데이터를 지우기 위해 트랜잭션을 되돌릴 때 사용"""
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 사용자/좋아요/팔로우/즐겨찾기/리뷰 데이터를 실제 모델 테이블에 만들어 추천 엔진별 "
+        "p50/p95 지연 시간, 쿼리 수, 메모리, 보류 좋아요 기준 precision@k/recall@k 를 측정하고 JSON 으로 출력합니다. "
+        "합성 데이터는 끝나면 롤백됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="합성 사용자 수 (기본값: 1000)")
+        parser.add_argument('--movies', type=int, default=2000, help="합성 영화 수 (기본값: 2000)")
+        parser.add_argument('--genres', type=int, default=12, help=f"합성 장르 수 (최대 {len(benchmark.GENRE_WORDS)}, 기본값: 12)")
+        parser.add_argument('--likes-per-user', type=int, default=20, help="사용자당 평균 좋아요 수 (기본값: 20)")
+        parser.add_argument('--holdout', type=float, default=0.2, help="정답으로 남겨 둘 좋아요 비율 (기본값: 0.2)")
+        parser.add_argument('--sample-users', type=int, default=200, help="측정할 사용자 수 (기본값: 200)")
+        parser.add_argument('--k', type=int, default=10, help="precision@k / recall@k 의 k (기본값: 10)")
+        parser.add_argument(
+            '--engines', nargs='+', choices=sorted([*USER_ENGINES, KEYWORD_ENGINE]),
+            default=[*USER_ENGINES, KEYWORD_ENGINE], help="측정할 엔진 (기본값: 전부)"
+        )
+        parser.add_argument(
+            '--keyword-threads', type=int, default=8, help="동시 키워드 임베딩 처리량 측정 스레드 수 (기본값: 8)"
+        )
+        parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본값: 0)")
+        parser.add_argument('--output', help="결과 JSON 파일 경로 (없으면 표준 출력)")
+        parser.add_argument('--keep', action='store_true', help="합성 데이터를 롤백하지 않고 남김")
+
+    def handle(self, *args, **options):
+        engines = options['engines']
+        artifact_dir = tempfile.mkdtemp(prefix='movie-benchmark-')
+        report = {
+            'meta': {
+                'commit': _git_commit(),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'params': {
+                    key: options[key] for key in (
+                        'users', 'movies', 'genres', 'likes_per_user', 'holdout', 'sample_users', 'k', 'keyword_threads', 'seed',
+                    )
+                },
+            },
+            'build_seconds': {},
+            'engines': {},
+        }
+        try:
+            # 추천 산출물(.npy)은 임시 디렉터리에 만들어 운영 파일을 건드리지 않음
+            with override_settings(MOVIE_EMBEDDING_DIR=artifact_dir):
+                with transaction.atomic():
+                    self._run(report, engines, options, artifact_dir)
+                    if not options['keep']:
+                        raise Rollback
+        except Rollback:
+            pass
+        finally:
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            get_catalog(refresh=True)
+        report['max_rss_kb'] = benchmark.max_rss_kb()
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"결과를 {options['output']} 에 저장했습니다."))
+        else:
+            self.stdout.write(output)
+
+    def _timed(self, report, name, func):
+        started = time.perf_counter()
+        result = func()
+        report['build_seconds'][name] = round(time.perf_counter() - started, 3)
+        self.stderr.write(f"{name}: {report['build_seconds'][name]:.2f}초")
+        return result
+
+    def _run(self, report, engines, options, artifact_dir):
+        dataset = self._timed(report, 'synthetic_data', lambda: benchmark.generate_synthetic_dataset(
+            users=options['users'], movies=options['movies'], genres=options['genres'],
+            likes_per_user=options['likes_per_user'], holdout=options['holdout'], seed=options['seed'],
+        ))
+        self._timed(report, 'catalog', lambda: get_catalog(refresh=True))
+        if 'item_cf' in engines or 'als' in engines:
+            interactions = self._timed(report, 'interactions', Interactions.load)
+            if 'item_cf' in engines:
+                self._timed(report, 'item_cf', lambda: ItemNeighbors.build(interactions).save(artifact_dir))
+            if 'als' in engines:
+                self._timed(report, 'als', lambda: ALSModel.train(interactions).save(artifact_dir))
+
+        # 임베딩 저장소는 키워드 추천과 2단계 추천의 임베딩 이웃 후보가 함께 사용
+        sentence_model = None
+        if KEYWORD_ENGINE in engines or 'two_stage' in engines:
+            sentence_model = self._build_embeddings(report, artifact_dir)
+
+        rng = np.random.default_rng(options['seed'])
+        sample = [
+            dataset.users[index]
+            for index in rng.choice(len(dataset.users), min(options['sample_users'], len(dataset.users)), replace=False)
+        ]
+        for name in engines:
+            if name == KEYWORD_ENGINE:
+                continue
+            self.stderr.write(f"{name} 측정 중...")
+            report['engines'][name] = benchmark.evaluate_user_engine(
+                USER_ENGINES[name], sample, dataset.held_out, k=options['k'],
+            )
+
+        if KEYWORD_ENGINE in engines:
+            if sentence_model is None:
+                report['engines'][KEYWORD_ENGINE] = {'skipped': "문장 임베딩 모델을 불러올 수 없습니다."}
+            else:
+                report['engines'][KEYWORD_ENGINE] = self._run_keyword(dataset, sentence_model, options['keyword_threads'])
+        if sentence_model is not None:
+            report['mmr'] = self._run_mmr(options['k'], options['seed'])
+
+    def _build_embeddings(self, report, artifact_dir):
+        """
+        임베딩 저장소(와 영화 수가 많으면 IVF 인덱스)를 만듭니다. 모델을 불러올 수 없으면 None
+        """
+        try:
+            model = self._timed(report, 'sentence_model', get_sentence_model)
+        except ImportError as error:
+            self.stderr.write(f"문장 임베딩 모델을 불러올 수 없어 임베딩 단계를 건너뜁니다: {error}")
+            return None
+        self._timed(report, 'embedding_store', lambda: build_embedding_store(
+            model, settings.SENTENCE_TRANSFORMER_MODEL, artifact_dir,
+        ))
+        if len(get_embedding_store(artifact_dir)) >= ANN_MIN_SIZE:
+            self._timed(report, 'ann_index', build_keyword_index)
+        return model
+
+    def _run_keyword(self, dataset, model, threads):
+        from movies.views import keyword_based_recommendations_optimized
+
+        # 캐시를 비운 첫 호출(모델 추론 포함)과 같은 검색어를 다시 보낸 캐시 적중 호출을 따로 측정
+        keyword_vector_cache.clear()
+        keyword_result_cache.clear()
+        self.stderr.write("keyword 측정 중...")
+        cold = benchmark.evaluate_keyword_engine(keyword_based_recommendations_optimized, dataset.keywords)
+        warm = benchmark.evaluate_keyword_engine(keyword_based_recommendations_optimized, dataset.keywords)
+        return {
+            'cold': cold, 'cached': warm, 'cache': keyword_cache_stats(),
+            'concurrent_encode': self._run_concurrent_encode(dataset, model, threads),
+        }
+
+    def _run_concurrent_encode(self, dataset, model, threads):
+        """
+        여러 스레드가 처음 보는 키워드를 동시에 임베딩할 때, 요청마다 추론하는 경우와 묶음 처리 워커를 거치는 경우의 처리량
+        """
+        keywords = [f"{keyword} {index}" for index, keyword in enumerate(dataset.keywords * 4)]
+        self.stderr.write(f"동시 키워드 임베딩 측정 중... (스레드 {threads}개)")
+        unbatched = benchmark.measure_throughput(lambda keyword: normalize_rows(model.encode(keyword)), keywords, threads)
+        keyword_encoder.reset_stats()
+        batched = benchmark.measure_throughput(keyword_encoder.encode, keywords, threads)
+        return {'unbatched': unbatched, 'batched': batched, 'batcher': keyword_encoder.stats()}
+
+    def _run_mmr(self, k, seed, candidates=500, calls=50):
+        """
+        후보 candidates 개 목록을 MMR 로 k개 다시 고를 때 추가되는 지연 시간
+        """
+        store = get_embedding_store()
+        rng = np.random.default_rng(seed)
+        movie_ids = np.asarray(store.movie_ids)
+        count = min(candidates, len(movie_ids))
+        lists = [
+            [{"movie_id": int(movie_id), "score": float(score)}
+             for movie_id, score in zip(rng.choice(movie_ids, count, replace=False), np.sort(rng.random(count))[::-1])]
+            for _ in range(calls)
+        ]
+        self.stderr.write(f"MMR 재정렬 측정 중... (후보 {count}개)")
+        _, seconds, _ = benchmark.measure_calls(lambda items: mmr_rerank(items, k, MMR_LAMBDA, store), lists)
+        return {'candidates': count, 'k': k, 'lambda': MMR_LAMBDA, 'latency': benchmark.latency_summary(seconds)}
@@ -0,0 +1,43 @@
+# movies/management/commands/build_item_neighbors.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.recommendation.embeddings import get_embedding_dir
+from movies.recommendation.interactions import Interactions
+from movies.recommendation.item_cf import ItemNeighbors
+
+
+class Command(BaseCommand):
+    help = "좋아요/시청 기록/리뷰 별점으로 영화별 협업 필터링 이웃(코사인 상위 K개)을 계산해 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=20,
+            help="영화마다 저장할 이웃 영화 수 (기본값: 20)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1024,
+            help="유사도를 한 번에 계산할 영화 수 (메모리 사용량 조절, 기본값: 1024)"
+        )
+        parser.add_argument(
+            '--min-common', type=int, default=1,
+            help="이웃으로 인정할 최소 공통 사용자 수 (기본값: 1)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        interactions = Interactions.load()
+        users, movies = interactions.shape
+        self.stdout.write(f"사용자 {users}명, 영화 {movies}개, 상호작용 {interactions.matrix.nnz}건")
+
+        neighbors = ItemNeighbors.build(
+            interactions,
+            top_k=max(1, options['top_k']),
+            chunk_size=max(1, options['chunk_size']),
+            min_common=max(1, options['min_common']),
+        )
+        neighbors.save(get_embedding_dir())
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"영화 {len(neighbors)}개의 이웃 목록을 저장했습니다. ({elapsed:.2f}초)"))
@@ -0,0 +1,55 @@
+# movies/management/commands/build_movie_ann_index.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.recommendation.embeddings import get_embedding_store
+from movies.recommendation.keyword import ANN_NPROBE, ann_recall, build_keyword_index, keyword_query_vectors
+
+
+def read_keyword_queries(path):
+    """
+    키워드 파일을 읽어 질의 임베딩 행렬로 바꿉니다. (path 가 없으면 None)
+    """
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as f:
+        keywords = [line.strip() for line in f if line.strip()]
+    return keyword_query_vectors(keywords)
+
+
+class Command(BaseCommand):
+    help = "임베딩 저장소로 키워드 추천용 IVF 근사 검색 인덱스를 학습하고, 전수 검색 대비 재현율을 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nlist', type=int, default=None, help="클러스터 수 (기본값: 4 * sqrt(영화 수))")
+        parser.add_argument('--nprobe', type=int, default=ANN_NPROBE, help=f"검색 시 탐색할 클러스터 수 (기본값: {ANN_NPROBE})")
+        parser.add_argument('--iterations', type=int, default=10, help="k-means 반복 횟수 (기본값: 10)")
+        parser.add_argument('--eval-queries', type=int, default=100, help="재현율 측정에 쓸 질의 수 (0이면 생략)")
+        parser.add_argument(
+            '--eval-keywords', default=None,
+            help="한 줄에 키워드 하나씩 적은 파일. 주면 영화 벡터 대신 실제 키워드 임베딩으로 재현율을 잽니다. (모델을 불러옴)"
+        )
+
+    def handle(self, *args, **options):
+        store = get_embedding_store()
+        if store is None:
+            raise CommandError("임베딩 저장소가 없습니다. build_movie_embeddings 를 먼저 실행하세요.")
+
+        started = time.perf_counter()
+        index = build_keyword_index(
+            store, nlist=options['nlist'], nprobe=options['nprobe'], iterations=options['iterations'],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"IVF 인덱스 학습 완료: 클러스터 {index.nlist}개, 벡터 {len(index)}개 ({elapsed:.1f}초)")
+
+        # 전수 검색 top-10 대비 재현율 (인덱스에 들어 있는 벡터를 질의로 쓰지 않음)
+        if options['eval_queries'] > 0 or options['eval_keywords']:
+            recall = ann_recall(
+                store, index, queries=options['eval_queries'], query_vectors=read_keyword_queries(options['eval_keywords']),
+            )
+            source = "키워드" if options['eval_keywords'] else "떼어 낸 영화"
+            if recall['queries']:
+                self.stdout.write(f"recall@10 (nprobe={index.nprobe}, {source} 질의 {recall['queries']}개): {recall['recall']:.3f}")
+
+        self.stdout.write(self.style.SUCCESS("완료"))
@@ -0,0 +1,52 @@
+# movies/management/commands/build_movie_embeddings.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from movies.recommendation.embeddings import EmbeddingStore, build_embedding_store, get_embedding_dir
+from movies.recommendation.keyword import build_keyword_index, build_quantized_keyword_vectors
+from movies.recommendation.model import get_sentence_model
+
+
+class Command(BaseCommand):
+    help = "영화 제목/설명을 배치로 임베딩해 워커들이 메모리 맵으로 공유할 .npy 저장소를 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=64,
+            help="한 번에 임베딩할 문장 수 (기본값: 64)"
+        )
+        parser.add_argument(
+            '--dir', default=None,
+            help="저장 위치 (기본값: settings.MOVIE_EMBEDDING_DIR)"
+        )
+        parser.add_argument(
+            '--skip-ann', action='store_true',
+            help="IVF 근사 검색 인덱스 재학습을 건너뜀"
+        )
+        parser.add_argument(
+            '--skip-quantized', action='store_true',
+            help="int8 양자화 벡터 생성을 건너뜀"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        model_name = settings.SENTENCE_TRANSFORMER_MODEL
+        model = get_sentence_model()
+        directory = options['dir'] or get_embedding_dir()
+
+        meta = build_embedding_store(model, model_name, directory, batch_size=max(1, options['batch_size']))
+
+        if not options['skip_quantized']:
+            vectors = build_quantized_keyword_vectors(EmbeddingStore(directory))
+            self.stdout.write(f"int8 벡터: {len(vectors)}개")
+
+        if not options['skip_ann']:
+            index = build_keyword_index(EmbeddingStore(directory))
+            self.stdout.write(f"IVF 인덱스: 클러스터 {index.nlist}개, 벡터 {len(index)}개")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"영화 {meta['count']}개의 임베딩({meta['dimension']}차원)을 {directory} 에 저장했습니다. ({elapsed:.1f}초)"
+        ))
@@ -0,0 +1,32 @@
+# movies/management/commands/build_related_movies.py
+from django.core.management.base import BaseCommand
+
+from movies.related import RELATED_MOVIES_TOP_K, compute_related_movies, stale_movie_ids
+
+
+class Command(BaseCommand):
+    help = "영화별 관련 영화 목록(장르 Jaccard x 인기도 가중치)을 다시 계산해 RelatedMovies 테이블에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=RELATED_MOVIES_TOP_K,
+            help=f"영화마다 저장할 관련 영화 수 (기본값: {RELATED_MOVIES_TOP_K})"
+        )
+        parser.add_argument(
+            '--ids', type=int, nargs='+',
+            help="특정 영화 ID만 다시 계산"
+        )
+        parser.add_argument(
+            '--stale', action='store_true',
+            help="목록이 없거나 계산한 뒤 장르가 바뀐 영화만 다시 계산 (전체 실행은 장르를 공유하는 다른 영화의 목록까지 갱신)"
+        )
+
+    def handle(self, *args, **options):
+        movie_ids = options['ids']
+        if options['stale']:
+            movie_ids = stale_movie_ids()
+            if not movie_ids:
+                self.stdout.write("다시 계산할 영화가 없습니다.")
+                return
+        count = compute_related_movies(movie_ids, top_k=max(1, options['top_k']))
+        self.stdout.write(self.style.SUCCESS(f"영화 {count}개의 관련 영화 목록을 갱신했습니다."))
@@ -0,0 +1,37 @@
+# movies/management/commands/build_similar_movies.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.recommendation.similar import build_similar_movies
+
+
+class Command(BaseCommand):
+    help = "많이 본 영화마다 제목/설명 임베딩이 가까운 영화(코사인 상위 K개)를 미리 계산해 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=1000,
+            help="이웃을 미리 계산할 영화 수 (시청 기록이 많은 순, 기본값: 1000)"
+        )
+        parser.add_argument(
+            '--top-k', type=int, default=50,
+            help="영화마다 저장할 이웃 영화 수 (기본값: 50)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=256,
+            help="유사도를 한 번에 계산할 영화 수 (메모리 사용량 조절, 기본값: 256)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        similar = build_similar_movies(
+            limit=max(1, options['limit']),
+            top_k=max(1, options['top_k']),
+            chunk_size=max(1, options['chunk_size']),
+        )
+        if similar is None:
+            raise CommandError("임베딩 저장소가 없습니다. build_movie_embeddings 를 먼저 실행하세요.")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"영화 {len(similar)}개의 임베딩 이웃 목록을 저장했습니다. ({elapsed:.2f}초)"))
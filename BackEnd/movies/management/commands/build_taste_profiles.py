@@ -0,0 +1,30 @@
+# movies/management/commands/build_taste_profiles.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from movies.recommendation.embeddings import get_embedding_store
+from movies.recommendation.taste import build_taste_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "사용자 M2M 테이블을 다시 읽어 취향 프로필(선호 장르/배우/감독, 좋아요 목록, 좋아요 임베딩 합)을 새로 만듭니다. "
+        "(평소에는 좋아요/즐겨찾기 변경 시 증분 갱신되며, 첫 배포나 대량 적재 뒤에 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ids', type=int, nargs='+',
+            help="특정 사용자 ID만 다시 만듦"
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('id')
+        if options['ids']:
+            users = users.filter(id__in=options['ids'])
+        store = get_embedding_store()
+        count = 0
+        for user in users.iterator():
+            build_taste_profile(user, store)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"사용자 {count}명의 취향 프로필을 만들었습니다."))
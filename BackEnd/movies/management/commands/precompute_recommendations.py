@@ -0,0 +1,53 @@
+# movies/management/commands/precompute_recommendations.py
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.recommendation.precompute import PRECOMPUTE_TOP_K, USER_CHUNK_SIZE, precompute_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "활성 사용자마다 카탈로그 전체 개인화 점수를 묶음 행렬 곱으로 계산해 상위 K개를 PrecomputedRecommendations 에 저장합니다. "
+        "(야간 배치로 전체 실행, 낮에는 --stale-only 로 좋아요/선호가 바뀐 사용자만 다시 계산)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=PRECOMPUTE_TOP_K,
+            help=f"사용자마다 저장할 추천 수 (기본값: {PRECOMPUTE_TOP_K})"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=USER_CHUNK_SIZE,
+            help=f"한 번에 점수를 계산할 사용자 수 (기본값: {USER_CHUNK_SIZE})"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="점수 계산 프로세스 수 (기본값: CPU 코어 수)"
+        )
+        parser.add_argument(
+            '--stale-only', action='store_true',
+            help="목록이 없거나 계산 뒤 취향 프로필이 바뀐 사용자만 다시 계산"
+        )
+        parser.add_argument(
+            '--ids', type=int, nargs='+',
+            help="특정 사용자 ID만 다시 계산"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def report(done, total):
+            self.stderr.write(f"{done}/{total}명 ({time.perf_counter() - started:.1f}초)")
+
+        count = precompute_recommendations(
+            user_ids=options['ids'],
+            k=max(1, options['top_k']),
+            chunk_size=max(1, options['chunk_size']),
+            workers=max(1, options['workers']),
+            stale_only=options['stale_only'],
+            callback=report,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"사용자 {count}명의 추천 목록을 저장했습니다. ({elapsed:.1f}초)"))
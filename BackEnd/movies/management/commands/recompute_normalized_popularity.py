@@ -0,0 +1,80 @@
+# movies/management/commands/recompute_normalized_popularity.py
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.cache import bump_movie_detail_version
+from movies.models import Movie, MovieCard
+from movies.popularity import log_normalize
+from movies.related import compute_related_movies
+
+
+class Command(BaseCommand):
+    help = (
+        "전체 영화의 normalized_popularity 를 Movie.save 와 같은 로그 정규화로 NumPy 로 한 번에 다시 계산해 "
+        "bulk_update 로 저장합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help="bulk_update 한 번에 저장할 행 수 (기본값: 2000)"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="저장하지 않고 변경될 영화 수만 출력"
+        )
+        parser.add_argument(
+            '--rebuild-related', action='store_true',
+            help="관련 영화 목록(인기도 가중치 사용)도 전체 다시 계산 (기본값: 하지 않음, build_related_movies 로 따로 실행)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batch_size = max(1, options['batch_size'])
+
+        # 1. 전체 인기도를 배열로 로드 (없는 값은 NaN)
+        rows = list(Movie.objects.order_by('id').values_list('id', 'popularity', 'normalized_popularity'))
+        if not rows:
+            self.stdout.write("영화가 없습니다.")
+            return
+        movie_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        popularity = np.array([np.nan if row[1] is None else row[1] for row in rows], dtype=np.float64)
+        current = np.array([np.nan if row[2] is None else row[2] for row in rows], dtype=np.float64)
+
+        # 2. 벡터 연산으로 정규화 점수 계산 (Movie.save 와 같은 식이어야 이후 저장/수집과 척도가 섞이지 않음)
+        scores = log_normalize(popularity)
+
+        # 3. 값이 바뀐 영화만 저장
+        changed = np.flatnonzero(np.isnan(current) | ~np.isclose(current, scores))
+        self.stdout.write(f"영화 {len(rows)}개 중 {len(changed)}개의 normalized_popularity 가 변경됩니다.")
+        if options['dry_run'] or not len(changed):
+            return
+
+        changed_ids = movie_ids[changed].tolist()
+        changed_scores = scores[changed].tolist()
+        for start in range(0, len(changed_ids), batch_size):
+            ids = changed_ids[start:start + batch_size]
+            values = changed_scores[start:start + batch_size]
+            with transaction.atomic():
+                # Movie.save() 를 거치지 않으므로 카드 테이블도 함께 갱신
+                Movie.objects.bulk_update(
+                    [Movie(id=movie_id, normalized_popularity=value) for movie_id, value in zip(ids, values)],
+                    ['normalized_popularity'],
+                )
+                MovieCard.objects.bulk_update(
+                    [MovieCard(movie_id=movie_id, normalized_popularity=value) for movie_id, value in zip(ids, values)],
+                    ['normalized_popularity'],
+                )
+        bump_movie_detail_version(*changed_ids)
+
+        # 4. 관련 영화 점수는 인기도 가중치를 사용하므로, 요청한 경우에만 전체 다시 계산
+        if options['rebuild_related']:
+            compute_related_movies()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"영화 {len(changed_ids)}개를 갱신했습니다. ({elapsed:.2f}초)"))
+        if not options['rebuild_related']:
+            self.stdout.write("관련 영화 목록은 build_related_movies 를 실행해야 새 인기도가 반영됩니다.")
@@ -0,0 +1,39 @@
+# movies/management/commands/refresh_movie_embeddings.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.recommendation.embeddings import EmbeddingStore, get_embedding_dir
+from movies.recommendation.keyword import refresh_keyword_index
+
+
+class Command(BaseCommand):
+    help = (
+        "제목/설명 해시가 바뀌었거나 새로 추가된 영화만 다시 임베딩해 저장소와 IVF 인덱스/int8 벡터를 갱신합니다. "
+        "(야간 수집 뒤 실행, 전체 재임베딩은 build_movie_embeddings)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=64,
+            help="한 번에 임베딩할 문장 수 (기본값: 64)"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="다시 임베딩할 영화 수만 출력하고 파일은 바꾸지 않음"
+        )
+
+    def handle(self, *args, **options):
+        if EmbeddingStore.meta_mtime(get_embedding_dir()) is None:
+            raise CommandError("임베딩 저장소가 없습니다. 먼저 build_movie_embeddings 를 실행하세요.")
+
+        started = time.perf_counter()
+        summary = refresh_keyword_index(batch_size=max(1, options['batch_size']), dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        if options['dry_run']:
+            self.stdout.write(f"다시 임베딩할 영화 {summary['stale']}개, 삭제할 영화 {summary['removed']}개")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"영화 {summary['stale']}개를 다시 임베딩하고 {summary['removed']}개를 뺐습니다. ({elapsed:.1f}초)"
+        ))
@@ -0,0 +1,56 @@
+# movies/management/commands/train_als.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.recommendation.als import ALSModel, get_als_model
+from movies.recommendation.embeddings import get_embedding_dir
+from movies.recommendation.interactions import Interactions
+
+
+class Command(BaseCommand):
+    help = "좋아요/시청 기록/리뷰 별점으로 암묵적 피드백 ALS 행렬 분해를 학습해 사용자/영화 인자 행렬을 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--factors', type=int, default=32, help="잠재 인자 차원 (기본값: 32)")
+        parser.add_argument('--iterations', type=int, default=15, help="ALS 반복 횟수 (기본값: 15)")
+        parser.add_argument('--regularization', type=float, default=0.1, help="L2 정규화 계수 (기본값: 0.1)")
+        parser.add_argument('--alpha', type=float, default=40.0, help="신뢰도 가중치 (1 + alpha * 강도, 기본값: 40)")
+        parser.add_argument('--cg-steps', type=int, default=3, help="반복마다 CG 단계 수 (기본값: 3)")
+        parser.add_argument('--workers', type=int, default=None, help="학습 스레드 수 (기본값: CPU 코어 수)")
+        parser.add_argument(
+            '--warm-start', action='store_true',
+            help="저장된 이전 인자 행렬에서 시작 (인자 차원이 같을 때만, 보통 --iterations 를 줄여서 사용)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        interactions = Interactions.load()
+        users, movies = interactions.shape
+        self.stdout.write(f"사용자 {users}명, 영화 {movies}개, 상호작용 {interactions.matrix.nnz}건")
+        if not interactions.matrix.nnz:
+            self.stdout.write("학습할 상호작용이 없습니다.")
+            return
+
+        initial = get_als_model() if options['warm_start'] else None
+        if initial is not None and initial.factors != options['factors']:
+            self.stdout.write(f"이전 모델의 인자 차원({initial.factors})이 달라 처음부터 학습합니다.")
+            initial = None
+
+        model = ALSModel.train(
+            interactions,
+            factors=options['factors'],
+            iterations=options['iterations'],
+            regularization=options['regularization'],
+            alpha=options['alpha'],
+            cg_steps=max(1, options['cg_steps']),
+            workers=options['workers'],
+            initial=initial,
+            callback=lambda iteration, seconds: self.stdout.write(f"  반복 {iteration + 1}: {seconds:.2f}초"),
+        )
+        model.save(get_embedding_dir())
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"ALS 모델을 저장했습니다. (사용자 {users}명, 영화 {movies}개, 웜 스타트: {initial is not None}, {elapsed:.2f}초)"
+        ))
@@ -0,0 +1,28 @@
+# movies/management/commands/warmup_recommender.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.recommendation import get_catalog, get_embedding_store, model_status, warmup_sentence_model
+
+
+class Command(BaseCommand):
+    help = "추천에 필요한 문장 임베딩 모델, 임베딩 저장소, 카탈로그 행렬을 미리 로드합니다. (모델 다운로드/캐시 확인 용도)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        warmup_sentence_model()
+        status = model_status()
+        self.stdout.write(f"모델 준비 완료: {status['model']} (로드 {status['load_seconds']}초)")
+
+        store = get_embedding_store()
+        if store is None:
+            self.stdout.write(self.style.WARNING("임베딩 저장소가 없습니다. build_movie_embeddings 를 먼저 실행하세요."))
+        else:
+            self.stdout.write(f"임베딩 저장소: 영화 {len(store)}개")
+
+        catalog = get_catalog()
+        self.stdout.write(f"카탈로그 행렬: 영화 {len(catalog)}개")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"워밍업 완료 ({elapsed:.1f}초)"))
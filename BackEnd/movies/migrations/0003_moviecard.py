@@ -0,0 +1,56 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_movie_cards(apps, schema_editor):
+    """
+    기존 영화 데이터로 카드 테이블을 채웁니다.
+    """
+    Movie = apps.get_model('movies', 'Movie')
+    MovieCard = apps.get_model('movies', 'MovieCard')
+
+    genres_by_movie = {}
+    through = Movie.genres.through.objects.select_related('genre').order_by('genre_id')
+    for row in through:
+        genres_by_movie.setdefault(row.movie_id, []).append({'id': row.genre_id, 'name': row.genre.name})
+
+    MovieCard.objects.bulk_create([
+        MovieCard(
+            movie_id=movie.id,
+            title=movie.title,
+            poster_path=movie.poster_path,
+            release_date=movie.release_date,
+            popularity=movie.popularity,
+            normalized_popularity=movie.normalized_popularity,
+            genres=genres_by_movie.get(movie.id, []),
+        )
+        for movie in Movie.objects.all()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_movie_movie_popularity_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieCard',
+            fields=[
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='movies.movie')),
+                ('title', models.CharField(max_length=255)),
+                ('poster_path', models.CharField(blank=True, max_length=255, null=True)),
+                ('release_date', models.DateField(blank=True, null=True)),
+                ('popularity', models.FloatField(blank=True, null=True)),
+                ('normalized_popularity', models.FloatField(blank=True, null=True)),
+                ('genres', models.JSONField(default=list)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['normalized_popularity', 'movie'], name='card_popularity_idx'), models.Index(fields=['release_date', 'movie'], name='card_release_date_idx'), models.Index(fields=['title', 'movie'], name='card_title_idx')],
+            },
+        ),
+        migrations.RunPython(populate_movie_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-18 02:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_moviecard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedMovies',
+            fields=[
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related_index', serialize=False, to='movies.movie')),
+                ('movie_ids', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-18 03:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_alter_customuser_profile_image'),
+        ('movies', '0004_relatedmovies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTasteProfile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='taste_profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('favorite_genre_ids', models.JSONField(default=list)),
+                ('favorite_actor_ids', models.JSONField(default=list)),
+                ('favorite_director_ids', models.JSONField(default=list)),
+                ('liked_movie_ids', models.JSONField(default=list)),
+                ('liked_genre_counts', models.JSONField(default=dict)),
+                ('liked_vector_sum', models.BinaryField(blank=True, null=True)),
+                ('liked_vector_count', models.PositiveIntegerField(default=0)),
+                ('embedding_built_at', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 03:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_alter_customuser_profile_image'),
+        ('movies', '0005_usertasteprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecomputedRecommendations',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='precomputed_recommendations', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('movie_ids', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_precomputedrecommendations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='precomputedrecommendations',
+            name='preferences_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
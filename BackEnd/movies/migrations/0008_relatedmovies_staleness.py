@@ -0,0 +1,24 @@
+# Generated by Django 4.2.4 on 2026-10-18 03:32
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_precomputedrecommendations_preferences_changed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='relatedmovies',
+            name='computed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='relatedmovies',
+            name='genres_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 03:40
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_built_at(apps, schema_editor):
+    """
+    기존 프로필은 이미 만들어진 것으로 보고 마지막 갱신 시각을 채웁니다.
+    """
+    UserTasteProfile = apps.get_model('movies', 'UserTasteProfile')
+    UserTasteProfile.objects.update(built_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_relatedmovies_staleness'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertasteprofile',
+            name='built_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_built_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:12
+
+from django.db import migrations
+from django.utils import timezone
+import numpy as np
+
+from movies.related import _load_genre_matrix, score_related_movies
+
+
+def populate_related_movies(apps, schema_editor):
+    """
+    기존 영화 데이터로 관련 영화 테이블을 채웁니다. (0004 는 빈 테이블만 만들어 배포 직후 관련 영화가 비어 있었음)
+    """
+    Movie = apps.get_model('movies', 'Movie')
+    RelatedMovies = apps.get_model('movies', 'RelatedMovies')
+
+    computed_at = timezone.now()
+    all_ids, matrix, weights = _load_genre_matrix(Movie)
+    if not len(all_ids):
+        return
+    existing = set(RelatedMovies.objects.values_list('movie_id', flat=True))
+    rows = np.array([row for row, movie_id in enumerate(all_ids.tolist()) if movie_id not in existing], dtype=np.int64)
+
+    RelatedMovies.objects.bulk_create([
+        RelatedMovies(movie_id=movie_id, movie_ids=related_ids, scores=scores, computed_at=computed_at)
+        for movie_id, related_ids, scores in score_related_movies(all_ids, matrix, weights, rows)
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_usertasteprofile_built_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_related_movies, migrations.RunPython.noop),
+    ]
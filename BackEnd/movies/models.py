@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 import requests
 import math
 
@@ -52,6 +54,14 @@ class Movie(models.Model):
     genres = models.ManyToManyField('Genre', related_name="movies")  # 영화와 장르의 다대다 관계
     normalized_popularity = models.FloatField(null=True, blank=True)  # 새 필드
 
+    class Meta:
+        indexes = [
+            # 영화 목록 키셋 페이지네이션을 위한 (정렬 필드, id) 인덱스
+            models.Index(fields=['normalized_popularity', 'id'], name='movie_popularity_id_idx'),
+            models.Index(fields=['release_date', 'id'], name='movie_release_date_id_idx'),
+            models.Index(fields=['title', 'id'], name='movie_title_id_idx'),
+        ]
+
     def calculate_normalized_popularity(self):
         """
         popularity 값을 0-10 사이로 정규화
@@ -72,7 +82,136 @@ class Movie(models.Model):
     def __str__(self):
         return self.title  # 문자열 표현: 영화 제목
 
-    
+
+# 영화 카드 목록 조회용 비정규화 테이블 (Movie.save / movie.genres 변경 시 갱신)
+class MovieCard(models.Model):
+    movie = models.OneToOneField(Movie, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    title = models.CharField(max_length=255)  # 영화 제목
+    poster_path = models.CharField(max_length=255, null=True, blank=True)  # 포스터 이미지 경로
+    release_date = models.DateField(null=True, blank=True)  # 영화 개봉일
+    popularity = models.FloatField(null=True, blank=True)  # TMDB 인기 점수
+    normalized_popularity = models.FloatField(null=True, blank=True)  # 정규화된 평점
+    genres = models.JSONField(default=list)  # [{"id": 장르 ID, "name": 장르 이름}, ...]
+
+    class Meta:
+        indexes = [
+            # 카드 목록 키셋 페이지네이션을 위한 (정렬 필드, movie_id) 인덱스
+            models.Index(fields=['normalized_popularity', 'movie'], name='card_popularity_idx'),
+            models.Index(fields=['release_date', 'movie'], name='card_release_date_idx'),
+            models.Index(fields=['title', 'movie'], name='card_title_idx'),
+        ]
+
+    @property
+    def id(self):
+        return self.movie_id
+
+    @property
+    def genre_names(self):
+        return [genre['name'] for genre in self.genres]
+
+    @classmethod
+    def in_order(cls, movie_ids):
+        """
+        주어진 영화 ID 순서를 유지한 채 카드 목록을 한 번의 쿼리로 가져옵니다.
+        """
+        movie_ids = list(movie_ids)
+        cards = cls.objects.in_bulk(movie_ids)
+        return [cards[movie_id] for movie_id in movie_ids if movie_id in cards]
+
+    @classmethod
+    def refresh(cls, movie_ids=None):
+        """
+        주어진 영화(없으면 전체)의 카드 행을 Movie/Genre 테이블 기준으로 다시 만듭니다.
+        영화 1건당 쿼리를 날리지 않도록 장르는 중개 테이블에서 한 번에 가져옵니다.
+        """
+        movies = Movie.objects.all()
+        through = Movie.genres.through.objects.select_related('genre').order_by('genre_id')
+        if movie_ids is not None:
+            movie_ids = list(movie_ids)
+            movies = movies.filter(id__in=movie_ids)
+            through = through.filter(movie_id__in=movie_ids)
+
+        genres_by_movie = {}
+        for row in through:
+            genres_by_movie.setdefault(row.movie_id, []).append({'id': row.genre_id, 'name': row.genre.name})
+
+        cards = [
+            cls(
+                movie_id=movie.id,
+                title=movie.title,
+                poster_path=movie.poster_path,
+                release_date=movie.release_date,
+                popularity=movie.popularity,
+                normalized_popularity=movie.normalized_popularity,
+                genres=genres_by_movie.get(movie.id, []),
+            )
+            for movie in movies.only(
+                'id', 'title', 'poster_path', 'release_date', 'popularity', 'normalized_popularity'
+            )
+        ]
+        cls.objects.bulk_create(
+            cards,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['movie'],
+            update_fields=['title', 'poster_path', 'release_date', 'popularity', 'normalized_popularity', 'genres'],
+        )
+        return len(cards)
+
+    def __str__(self):
+        return self.title
+
+
+# 영화별 관련 영화(이웃) 목록을 미리 계산해 두는 테이블 (movies/related.py 에서 갱신)
+class RelatedMovies(models.Model):
+    movie = models.OneToOneField(Movie, on_delete=models.CASCADE, primary_key=True, related_name='related_index')
+    movie_ids = models.JSONField(default=list)  # 점수 내림차순 관련 영화 ID 목록
+    scores = models.JSONField(default=list)  # movie_ids 와 같은 순서의 점수 (장르 Jaccard x 인기도 가중치)
+    updated_at = models.DateTimeField(auto_now=True)  # 마지막 계산 시각
+    computed_at = models.DateTimeField(default=timezone.now)  # 계산에 쓴 장르/인기도를 읽기 시작한 시각
+    # 영화의 장르가 마지막으로 바뀐 시각 (computed_at 보다 늦으면 build_related_movies --stale 대상)
+    genres_changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Related movies of {self.movie_id}"
+
+
+# 사용자별 취향 프로필 (좋아요/선호 장르/즐겨찾기 배우·감독이 바뀔 때 movies/recommendation/taste.py 에서 증분 갱신)
+class UserTasteProfile(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='taste_profile'
+    )
+    favorite_genre_ids = models.JSONField(default=list)  # 선호 장르 ID 목록
+    favorite_actor_ids = models.JSONField(default=list)  # 즐겨찾기 배우 ID 목록
+    favorite_director_ids = models.JSONField(default=list)  # 즐겨찾기 감독 ID 목록
+    liked_movie_ids = models.JSONField(default=list)  # 좋아요한 영화 ID 목록 (좋아요 순서)
+    liked_genre_counts = models.JSONField(default=dict)  # {장르 ID: 좋아요한 영화 중 그 장르 영화 수}
+    liked_vector_sum = models.BinaryField(null=True, blank=True)  # 좋아요한 영화 임베딩 합 (float64 바이트)
+    liked_vector_count = models.PositiveIntegerField(default=0)  # 임베딩 합에 들어간 영화 수
+    embedding_built_at = models.FloatField(null=True, blank=True)  # 임베딩 합을 계산한 저장소의 built_at
+    # M2M 테이블 전체로 마지막에 다시 만든 시각 (비어 있으면 만드는 중인 행이라 조회에 쓰지 않음)
+    built_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 마지막 갱신 시각
+
+    def __str__(self):
+        return f"Taste profile of {self.user_id}"
+
+
+# 사용자별 개인화 추천 상위 K 목록을 미리 계산해 두는 테이블 (precompute_recommendations 명령에서 갱신)
+class PrecomputedRecommendations(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='precomputed_recommendations'
+    )
+    movie_ids = models.JSONField(default=list)  # 점수 내림차순 추천 영화 ID 목록 (좋아요/시청한 영화 제외)
+    scores = models.JSONField(default=list)  # movie_ids 와 같은 순서의 개인화 점수
+    computed_at = models.DateTimeField()  # 계산에 쓴 데이터를 읽기 시작한 시각
+    # 좋아요/시청/선호/팔로우(또는 팔로우한 사용자의 좋아요)가 마지막으로 바뀐 시각 (computed_at 보다 늦으면 만료)
+    preferences_changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Precomputed recommendations of {self.user_id}"
+
+
 # 배우 데이터를 저장하는 모델
 class Actor(models.Model):
     tmdb_id = models.IntegerField(unique=True)  # TMDB 고유 ID
@@ -0,0 +1,128 @@
+# movies/pagination.py
+import base64
+import json
+from datetime import date
+
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class MovieCursorPagination(BasePagination):
+    """
+    영화 목록 전용 키셋(커서) 페이지네이션 클래스:
+    - (정렬 필드 값, pk) 쌍을 커서로 사용하므로 페이지가 깊어져도 OFFSET 스캔이 발생하지 않습니다.
+    - 정렬 기준은 ORDERING_FIELDS 에 정의된 필드만 허용합니다.
+    - NULL 값은 가장 작은 값으로 취급합니다. (내림차순이면 마지막, 오름차순이면 처음)
+    """
+    page_size = 20  # 기본 페이지 크기
+    page_size_query_param = 'page_size'  # 클라이언트가 페이지 크기를 지정 가능
+    max_page_size = 100  # 최대 페이지 크기 제한
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_ordering = '-normalized_popularity'
+
+    # 허용된 정렬 필드 -> 커서 값 디코더
+    ORDERING_FIELDS = {
+        'normalized_popularity': float,
+        'release_date': date.fromisoformat,
+        'title': str,
+    }
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param) or self.default_ordering
+        if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+            raise ValidationError({
+                self.ordering_query_param: f"허용되지 않은 정렬 기준입니다. 사용 가능: {', '.join(self.ORDERING_FIELDS)}"
+            })
+        return ordering
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: "정수를 입력해주세요."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, ordering, value, pk):
+        if isinstance(value, date):
+            value = value.isoformat()
+        payload = json.dumps({'o': ordering, 'v': value, 'id': pk}, ensure_ascii=False)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request, ordering):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if payload['o'] != ordering:
+                raise ValueError('ordering mismatch')
+            value = payload['v']
+            if value is not None:
+                value = self.ORDERING_FIELDS[ordering.lstrip('-')](value)
+            return value, int(payload['id'])
+        except (KeyError, TypeError, ValueError, UnicodeDecodeError, json.JSONDecodeError):
+            raise ValidationError({self.cursor_query_param: "유효하지 않은 커서입니다."})
+
+    def get_keyset_filter(self, field, descending, value, pk):
+        """
+        커서 위치 이후의 행만 남기는 조건을 만듭니다.
+        """
+        is_null = Q(**{f'{field}__isnull': True})
+        if descending:
+            if value is None:
+                return is_null & Q(pk__lt=pk)
+            return (
+                Q(**{f'{field}__lt': value})
+                | Q(**{field: value, 'pk__lt': pk})
+                | is_null
+            )
+        if value is None:
+            return (is_null & Q(pk__gt=pk)) | ~is_null
+        return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(request)
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        page_size = self.get_page_size(request)
+
+        if descending:
+            queryset = queryset.order_by(F(field).desc(nulls_last=True), '-pk')
+        else:
+            queryset = queryset.order_by(F(field).asc(nulls_first=True), 'pk')
+
+        cursor = self.decode_cursor(request, self.ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(field, descending, *cursor))
+
+        # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = results[-1]
+            self.next_cursor = self.encode_cursor(self.ordering, getattr(last, field), last.pk)
+        return results
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'cursor': self.next_cursor,  # 다음 페이지 요청 시 사용할 커서
+            'results': data,
+        })
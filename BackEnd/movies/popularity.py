@@ -0,0 +1,23 @@
+# movies/popularity.py
+import numpy as np
+
+# Movie.calculate_normalized_popularity 와 같은 로그 정규화 상수
+LOG_BASE = 1000
+LOG_SCALE = 7
+MAX_SCORE = 10
+
+
+def log_normalize(popularity):
+    """
+    Movie.calculate_normalized_popularity 와 같은 로그 정규화를 배열 전체에 한 번에 적용합니다.
+    (popularity 가 없으면 0, 최대 10, 소수점 한 자리)
+
+    Args:
+        popularity (ndarray): 인기도 배열 (없는 값은 NaN)
+    """
+    popularity = np.asarray(popularity, dtype=np.float64)
+    missing = np.isnan(popularity)
+    values = np.log1p(np.maximum(np.where(missing, 0, popularity), 0)) / np.log1p(LOG_BASE) * LOG_SCALE
+    values = np.minimum(np.round(values, 1), MAX_SCORE)
+    values[missing] = 0
+    return values
@@ -0,0 +1,105 @@
+# movies/recommendation/__init__.py
+
+from .catalog import Catalog, get_catalog  # 영화 x 장르/배우/감독 희소 행렬
+from .personalized import personalized_recommendations, personalized_scores, top_k  # 개인화 추천
+from .taste import build_taste_profile, get_taste_profile, taste_vector, update_taste_profile  # 사용자 취향 프로필
+from .embeddings import (  # 메모리 맵 임베딩 저장소
+    EmbeddingStore, build_embedding_store, content_hash, get_embedding_store, stale_movie_ids,
+)
+from .ann import IVFIndex, get_ann_index  # NumPy IVF 근사 최근접 이웃 인덱스
+from .keyword import (  # 키워드 기반 추천
+    ann_recall, build_keyword_index, build_quantized_keyword_vectors,
+    keyword_query_vectors, keyword_recommendations, keyword_scores, keyword_vector, quantized_recall,
+    refresh_keyword_index, search_store,
+)
+from .quantized import QuantizedVectors, get_quantized_vectors, quantize_rows  # int8 양자화 벡터
+from .batcher import EncodeBatcher, encode_batcher_stats, keyword_encoder  # 문장 임베딩 마이크로 배치 워커
+from .query_cache import TTLLRUCache, keyword_cache_stats, normalize_keyword  # 키워드 질의 캐시
+from .interactions import Interactions  # 사용자 x 영화 상호작용 행렬
+from .item_cf import (  # 아이템 기반 협업 필터링
+    ItemNeighbors, also_liked_recommendations, get_item_neighbors, item_cf_recommendations,
+)
+from .similar import (  # 제목/설명 임베딩 기반 비슷한 영화
+    SimilarMovies, build_similar_movies, get_similar_movies, similar_movies,
+)
+from .diversity import mmr_order, mmr_rerank  # MMR 다양성 재정렬
+from .als import ALSModel, als_recommendations, als_scores, get_als_model  # 암묵적 피드백 ALS 행렬 분해
+from .pipeline import CANDIDATE_GENERATORS, RecommendationContext, two_stage_recommendations  # 후보 생성 -> 재정렬
+from .precompute import (  # 사용자별 추천 목록 야간 배치 계산
+    BatchScorer, get_precomputed_recommendations, mark_recommendations_stale, precompute_recommendations,
+    stale_user_ids,
+)
+from .budget import (  # 추천 소스별 요청 시간 제한과 인기순 대체 추천
+    SourceStats, budget_stats, popular_fallback, run_with_budget, source_stats,
+)
+from .model import get_sentence_model, is_model_ready, model_status, warmup_sentence_model  # 지연 로딩 모델
+
+__all__ = [
+    'Catalog',
+    'get_catalog',
+    'personalized_recommendations',
+    'personalized_scores',
+    'top_k',
+    'build_taste_profile',
+    'get_taste_profile',
+    'taste_vector',
+    'update_taste_profile',
+    'EmbeddingStore',
+    'build_embedding_store',
+    'content_hash',
+    'get_embedding_store',
+    'stale_movie_ids',
+    'IVFIndex',
+    'get_ann_index',
+    'ann_recall',
+    'build_keyword_index',
+    'keyword_recommendations',
+    'build_quantized_keyword_vectors',
+    'keyword_query_vectors',
+    'keyword_scores',
+    'keyword_vector',
+    'quantized_recall',
+    'refresh_keyword_index',
+    'search_store',
+    'QuantizedVectors',
+    'get_quantized_vectors',
+    'quantize_rows',
+    'EncodeBatcher',
+    'encode_batcher_stats',
+    'keyword_encoder',
+    'TTLLRUCache',
+    'keyword_cache_stats',
+    'normalize_keyword',
+    'Interactions',
+    'ItemNeighbors',
+    'also_liked_recommendations',
+    'get_item_neighbors',
+    'item_cf_recommendations',
+    'SimilarMovies',
+    'build_similar_movies',
+    'get_similar_movies',
+    'similar_movies',
+    'mmr_order',
+    'mmr_rerank',
+    'ALSModel',
+    'als_recommendations',
+    'als_scores',
+    'get_als_model',
+    'CANDIDATE_GENERATORS',
+    'RecommendationContext',
+    'two_stage_recommendations',
+    'BatchScorer',
+    'get_precomputed_recommendations',
+    'mark_recommendations_stale',
+    'precompute_recommendations',
+    'stale_user_ids',
+    'SourceStats',
+    'budget_stats',
+    'popular_fallback',
+    'run_with_budget',
+    'source_stats',
+    'get_sentence_model',
+    'is_model_ready',
+    'model_status',
+    'warmup_sentence_model',
+]
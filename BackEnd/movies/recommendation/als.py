@@ -0,0 +1,331 @@
+# movies/recommendation/als.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from movies.recommendation.embeddings import get_embedding_dir
+from movies.recommendation.personalized import top_k
+
+# 저장 파일 이름
+USER_IDS_FILE = 'als_user_ids.npy'
+MOVIE_IDS_FILE = 'als_movie_ids.npy'
+USER_FACTORS_FILE = 'als_user_factors.npy'
+ITEM_FACTORS_FILE = 'als_item_factors.npy'
+META_FILE = 'als_meta.json'
+
+# 스레드 하나가 맡을 행 묶음 크기 (행 수 / 묶음 안의 상호작용 수 상한, 메모리 사용량 조절)
+CHUNK_ROWS = 4096
+CHUNK_NNZ = 1 << 18
+
+
+def _row_chunks(indptr, max_rows=CHUNK_ROWS, max_nnz=CHUNK_NNZ):
+    """
+    CSR 행을 (시작, 끝) 구간으로 나눕니다. 구간마다 행 수와 상호작용 수가 상한을 넘지 않도록 하되,
+    상호작용이 상한보다 많은 행은 혼자 한 구간이 됩니다.
+    """
+    start, count = 0, len(indptr) - 1
+    while start < count:
+        limit = int(np.searchsorted(indptr, indptr[start] + max_nnz, side='right')) - 1
+        stop = max(start + 1, min(start + max_rows, limit, count))
+        yield start, stop
+        start = stop
+
+
+def _solve_exact(movie_cols, confidence, fixed, gram, regularization):
+    """
+    한 행(사용자)에 대한 암묵적 피드백 ALS 식을 정확히 풉니다. (fold-in 용)
+
+        (Y^T Y + Y_u^T (C_u - I) Y_u + λI) x_u = Y_u^T C_u p_u
+    """
+    fixed_rows = fixed[movie_cols]
+    lhs = gram + (fixed_rows.T * (confidence - 1)) @ fixed_rows
+    lhs[np.diag_indices(len(gram))] += regularization
+    return np.linalg.solve(lhs, fixed_rows.T @ confidence)
+
+
+def _conjugate_gradient_rows(confidence, fixed, gram, current, regularization, cg_steps, start, stop):
+    """
+    start:stop 행의 ALS 식을 현재 인자에서 출발해 켤레 기울기법(CG) cg_steps 번으로 근사해 풉니다.
+    (Takács et al. 2011, 행마다 f x f 행렬을 만들지 않고 희소 행렬 곱만 사용)
+    """
+    block = confidence[start:stop]
+    nnz_rows = np.repeat(np.arange(stop - start), np.diff(block.indptr))
+    fixed_rows = fixed[block.indices]
+    extra = block.data - 1
+
+    def multiply(vectors):
+        # (Y^T Y + Y^T (C - I) Y + λI) @ vectors 를 모든 행에 대해 한 번에 계산
+        dots = np.einsum('nf,nf->n', fixed_rows, vectors[nnz_rows])
+        weighted = sparse.csr_matrix((extra * dots, block.indices, block.indptr), shape=block.shape)
+        return vectors @ gram + weighted @ fixed + regularization * vectors
+
+    solution = np.array(current[start:stop], dtype=np.float32)
+    residual = block @ fixed - multiply(solution)
+    direction = residual.copy()
+    residual_norm = np.einsum('nf,nf->n', residual, residual)
+    for _ in range(cg_steps):
+        product = multiply(direction)
+        denominator = np.einsum('nf,nf->n', direction, product)
+        step = np.divide(residual_norm, denominator, out=np.zeros_like(residual_norm), where=denominator > 0)
+        solution += step[:, None] * direction
+        residual -= step[:, None] * product
+        new_norm = np.einsum('nf,nf->n', residual, residual)
+        if new_norm.max(initial=0) < 1e-10:
+            break
+        ratio = np.divide(new_norm, residual_norm, out=np.zeros_like(new_norm), where=residual_norm > 0)
+        direction = residual + ratio[:, None] * direction
+        residual_norm = new_norm
+    return solution
+
+
+def _als_step(confidence, fixed, current, regularization, cg_steps, executor):
+    """
+    다른 쪽 인자 행렬(fixed)을 고정하고 confidence 의 모든 행에 대한 인자를 갱신합니다.
+    행 묶음을 스레드 풀에 나눠 맡기며, NumPy/BLAS 연산은 GIL 을 풀기 때문에 여러 코어를 사용합니다.
+    """
+    gram = fixed.T @ fixed
+    result = np.empty_like(current)
+    futures = [
+        (start, stop, executor.submit(
+            _conjugate_gradient_rows, confidence, fixed, gram, current, regularization, cg_steps, start, stop,
+        ))
+        for start, stop in _row_chunks(confidence.indptr)
+    ]
+    for start, stop, future in futures:
+        result[start:stop] = future.result()
+    return result
+
+
+class ALSModel:
+    """
+    암묵적 피드백 행렬 분해 모델 (사용자/영화 잠재 인자 행렬)
+
+    - user_factors[i] 는 user_ids[i] 사용자, item_factors[j] 는 movie_ids[j] 영화의 인자 벡터입니다.
+    - 사용자의 전체 영화 점수는 item_factors @ user_factors[i] 한 번의 행렬-벡터 곱입니다.
+    """
+
+    def __init__(self, user_ids, movie_ids, user_factors, item_factors, meta=None):
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.meta = meta or {}
+        self.user_row_of = {user_id: row for row, user_id in enumerate(self.user_ids.tolist())}
+        self.movie_col_of = {movie_id: col for col, movie_id in enumerate(self.movie_ids.tolist())}
+
+    @property
+    def factors(self):
+        return self.item_factors.shape[1]
+
+    @classmethod
+    def train(cls, interactions, factors=32, iterations=15, regularization=0.1, alpha=40.0,
+              cg_steps=3, workers=None, initial=None, seed=0, callback=None):
+        """
+        상호작용 행렬로 ALS 를 학습합니다.
+
+        Args:
+            interactions: Interactions (값은 0 < r <= 1 강도, 신뢰도는 1 + alpha * r)
+            cg_steps: 반복마다 각 행의 식을 푸는 CG 단계 수 (이전 인자에서 이어서 풀기 때문에 몇 번이면 충분)
+            workers: 스레드 수 (기본값: CPU 코어 수)
+            initial: 이전 ALSModel. 겹치는 사용자/영화는 이전 인자에서 시작(웜 스타트)해 적은 반복으로 수렴합니다.
+            callback: 반복마다 callback(iteration, seconds) 호출
+        """
+        rng = np.random.default_rng(seed)
+        num_users, num_movies = interactions.shape
+        user_factors = (rng.standard_normal((num_users, factors)) * 0.01).astype(np.float32)
+        item_factors = (rng.standard_normal((num_movies, factors)) * 0.01).astype(np.float32)
+        if initial is not None and initial.factors == factors:
+            _copy_known(user_factors, interactions.user_ids, initial.user_factors, initial.user_row_of)
+            _copy_known(item_factors, interactions.movie_ids, initial.item_factors, initial.movie_col_of)
+
+        user_confidence = sparse.csr_matrix(interactions.matrix, dtype=np.float32, copy=True)
+        user_confidence.data = 1 + alpha * user_confidence.data
+        item_confidence = user_confidence.T.tocsr()
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for iteration in range(iterations):
+                started = time.perf_counter()
+                user_factors = _als_step(
+                    user_confidence, item_factors, user_factors, regularization, cg_steps, executor,
+                )
+                item_factors = _als_step(
+                    item_confidence, user_factors, item_factors, regularization, cg_steps, executor,
+                )
+                if callback:
+                    callback(iteration, time.perf_counter() - started)
+
+        meta = {
+            'factors': factors,
+            'iterations': iterations,
+            'regularization': regularization,
+            'alpha': alpha,
+            'cg_steps': cg_steps,
+            'warm_start': initial is not None,
+            'trained_at': time.time(),
+        }
+        return cls(interactions.user_ids, interactions.movie_ids, user_factors, item_factors, meta)
+
+    # 점수 계산
+
+    def fold_in(self, movie_ids, strengths):
+        """
+        학습 이후 생긴 사용자처럼 인자가 없는 사용자의 벡터를, 영화 인자를 고정한 채 한 번의 선형 방정식으로 구합니다.
+        """
+        cols = [self.movie_col_of[movie_id] for movie_id in movie_ids if movie_id in self.movie_col_of]
+        weights = np.array(
+            [strength for movie_id, strength in zip(movie_ids, strengths) if movie_id in self.movie_col_of],
+            dtype=np.float32,
+        )
+        if not cols:
+            return None
+        item_factors = np.asarray(self.item_factors)
+        return _solve_exact(
+            np.array(cols), 1 + self.meta.get('alpha', 40.0) * weights,
+            item_factors, item_factors.T @ item_factors, self.meta.get('regularization', 0.1),
+        )
+
+    def user_vector(self, user_id):
+        row = self.user_row_of.get(user_id)
+        return None if row is None else np.asarray(self.user_factors[row])
+
+    def scores(self, user_vector):
+        """
+        사용자 벡터와 전체 영화 인자의 내적 (movie_ids 순서의 점수 배열)
+        """
+        return np.asarray(self.item_factors) @ user_vector
+
+    # 저장 / 로드
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (
+            (USER_IDS_FILE, self.user_ids),
+            (MOVIE_IDS_FILE, self.movie_ids),
+            (USER_FACTORS_FILE, np.asarray(self.user_factors, dtype=np.float32)),
+            (ITEM_FACTORS_FILE, np.asarray(self.item_factors, dtype=np.float32)),
+        ):
+            path = os.path.join(directory, name)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        meta = dict(self.meta, users=len(self.user_ids), movies=len(self.movie_ids))
+        meta_path = os.path.join(directory, META_FILE)
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        model = cls(
+            np.load(os.path.join(directory, USER_IDS_FILE)),
+            np.load(os.path.join(directory, MOVIE_IDS_FILE)),
+            np.load(os.path.join(directory, USER_FACTORS_FILE), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, ITEM_FACTORS_FILE), mmap_mode=mmap_mode),
+            meta,
+        )
+        if len(model.user_factors) != meta['users'] or len(model.item_factors) != meta['movies']:
+            raise ValueError("ALS 인자 파일이 서로 일치하지 않습니다.")
+        return model
+
+    @staticmethod
+    def meta_mtime(directory):
+        try:
+            return os.stat(os.path.join(directory, META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+def _copy_known(target, ids, previous_factors, previous_row_of):
+    """
+    이전 모델에도 있던 ID 의 인자를 새 행렬의 같은 ID 위치로 복사합니다. (웜 스타트)
+    """
+    pairs = [(row, previous_row_of[key]) for row, key in enumerate(ids.tolist()) if key in previous_row_of]
+    if pairs:
+        rows, previous_rows = map(np.array, zip(*pairs))
+        target[rows] = previous_factors[previous_rows]
+
+
+_model = None
+_model_mtime = None
+_model_lock = threading.Lock()
+
+
+def get_als_model(directory=None):
+    """
+    프로세스 단위로 ALS 인자 행렬을 메모리 맵으로 열어 재사용합니다. (학습 결과가 없으면 None)
+    """
+    global _model, _model_mtime
+    directory = directory or get_embedding_dir()
+    mtime = ALSModel.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _model_lock:
+        if _model is None or _model_mtime != mtime:
+            try:
+                _model = ALSModel.load(directory)
+                _model_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                if _model is None:
+                    return None
+        return _model
+
+
+def _user_interactions(user):
+    """
+    사용자 한 명의 (영화 ID 목록, 강도 목록) (Interactions.load 와 같은 가중치, 같은 영화는 최댓값)
+    """
+    from community.models import Review
+    from movies.recommendation.interactions import LIKED_WEIGHT, RATING_WEIGHTS, WATCHED_WEIGHT
+
+    strengths = {}
+    for movie_id in user.watched_movies.values_list('id', flat=True):
+        strengths[movie_id] = max(strengths.get(movie_id, 0), WATCHED_WEIGHT)
+    for movie_id, rating in Review.objects.filter(user=user).exclude(movie=None).values_list('movie_id', 'rating'):
+        strengths[movie_id] = max(strengths.get(movie_id, 0), RATING_WEIGHTS.get(rating, 0.0))
+    for movie_id in user.liked_movies.values_list('id', flat=True):
+        strengths[movie_id] = max(strengths.get(movie_id, 0), LIKED_WEIGHT)
+    strengths = {movie_id: strength for movie_id, strength in strengths.items() if strength > 0}
+    return list(strengths), list(strengths.values())
+
+
+def als_scores(user, model=None):
+    """
+    사용자의 전체 영화 ALS 점수
+
+    - 학습에 포함된 사용자는 저장된 인자 벡터를, 새 사용자는 현재 상호작용으로 fold-in 한 벡터를 사용합니다.
+
+    Returns:
+        (movie_ids, scores, seen_ids): 상호작용이 없어 점수를 낼 수 없으면 (None, None, seen_ids)
+    """
+    model = model or get_als_model()
+    seen_ids, strengths = _user_interactions(user)
+    if model is None:
+        return None, None, seen_ids
+    vector = model.user_vector(user.pk)
+    if vector is None:
+        vector = model.fold_in(seen_ids, strengths)
+    if vector is None:
+        return None, None, seen_ids
+    return model.movie_ids, model.scores(vector), seen_ids
+
+
+def als_recommendations(user, k=10, exclude_seen=True):
+    """
+    ALS 협업 필터링 추천 (이미 좋아요/시청/리뷰한 영화는 제외)
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...] (모델이 없거나 상호작용이 없으면 빈 목록)
+    """
+    movie_ids, scores, seen_ids = als_scores(user)
+    if scores is None:
+        return []
+    return top_k(movie_ids, scores, k, exclude_ids=seen_ids if exclude_seen else ())
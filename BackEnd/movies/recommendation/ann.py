@@ -0,0 +1,243 @@
+# movies/recommendation/ann.py
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from movies.recommendation.embeddings import get_embedding_dir, normalize_rows
+
+# 저장 파일 이름
+CENTROIDS_FILE = 'ivf_centroids.npy'
+VECTORS_FILE = 'ivf_vectors.npy'
+IDS_FILE = 'ivf_ids.npy'
+OFFSETS_FILE = 'ivf_offsets.npy'
+META_FILE = 'ivf_meta.json'
+
+
+def default_nlist(count):
+    """
+    데이터 수에 맞는 기본 클러스터 수 (대략 4 * sqrt(N), 최소 1)
+    """
+    return max(1, int(4 * np.sqrt(max(count, 1))))
+
+
+def _save_npy(path, array):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class IVFIndex:
+    """
+    NumPy 로 구현한 IVF(Inverted File) 근사 최근접 이웃 인덱스 (내적 기준)
+
+    - 학습: 벡터 방향을 구면 k-means 로 nlist 개 클러스터로 나눕니다.
+    - 검색: 질의와 내적이 큰 중심점 nprobe 개의 클러스터에 속한 벡터만 점수를 계산합니다.
+      nprobe 를 키울수록 재현율이 오르고 지연 시간이 늘어납니다. (nprobe = nlist 이면 전수 검색과 동일)
+    - 벡터는 클러스터 순서로 정렬해 저장하므로 클러스터 i 의 벡터는 vectors[offsets[i]:offsets[i + 1]] 입니다.
+    """
+
+    def __init__(self, centroids, vectors, ids, offsets, nprobe=8, meta=None):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        self.nprobe = nprobe
+        self.meta = meta or {}
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # 학습 / 추가
+
+    @classmethod
+    def train(cls, ids, vectors, nlist=None, nprobe=8, iterations=10, sample_size=None, seed=0):
+        """
+        벡터로 클러스터 중심점을 학습하고 모든 벡터를 추가한 인덱스를 만듭니다.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        nlist = min(nlist or default_nlist(len(vectors)), max(len(vectors), 1))
+        directions = normalize_rows(vectors)
+        rng = np.random.default_rng(seed)
+
+        # 클러스터당 64개 정도만 샘플링해 학습 (대용량에서도 학습 시간을 제한)
+        sample_size = sample_size or nlist * 64
+        if len(directions) > sample_size:
+            sample = directions[rng.choice(len(directions), sample_size, replace=False)]
+        else:
+            sample = directions
+
+        if len(sample):
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        else:
+            centroids = np.zeros((nlist, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+        for _ in range(iterations):
+            if not len(sample):
+                break
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            # 클러스터별 벡터 합: (클러스터 x 샘플) 원-핫 희소 행렬 @ 샘플
+            one_hot = sparse.csr_matrix(
+                (np.ones(len(sample), dtype=np.float32), (assignments, np.arange(len(sample)))),
+                shape=(nlist, len(sample)),
+            )
+            sums = np.asarray(one_hot @ sample, dtype=np.float32)
+            counts = np.bincount(assignments, minlength=nlist)
+            empty = counts == 0
+            # 비어 있는 클러스터는 임의의 샘플로 다시 시작
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        index = cls(
+            centroids=centroids,
+            vectors=np.zeros((0, centroids.shape[1]), dtype=np.float32),
+            ids=np.zeros(0, dtype=np.int64),
+            offsets=np.zeros(nlist + 1, dtype=np.int64),
+            nprobe=nprobe,
+            meta={'trained_at': time.time(), 'iterations': iterations},
+        )
+        index.add(ids, vectors)
+        return index
+
+    def assign(self, vectors):
+        """
+        각 벡터가 속할 클러스터 번호 (방향이 가장 가까운 중심점)
+        """
+        return np.argmax(normalize_rows(vectors) @ self.centroids.T, axis=1)
+
+    def add(self, ids, vectors):
+        """
+        벡터를 추가합니다. 이미 있는 ID 는 새 벡터로 교체합니다. (중심점은 다시 학습하지 않음)
+
+        새 벡터는 배정된 클러스터 구간의 끝에 끼워 넣습니다. 벡터가 클러스터 순서로 이어 붙어 있으므로
+        제자리 추가가 아니라 전체 배열을 한 번 복사하며(O(N + 추가 수 x log 추가 수), 전체 재정렬은 하지 않음),
+        교체할 ID 가 있으면 remove 의 복사가 한 번 더 듭니다. 여러 영화는 한 번에 모아서 추가하세요.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if not len(ids):
+            return
+        if np.isin(self.ids, ids).any():
+            self.remove(ids)
+
+        lists = self.assign(vectors)
+        order = np.argsort(lists, kind='stable')
+        lists = lists[order]
+        # 클러스터 i 로 가는 벡터는 현재 offsets[i + 1] 위치(클러스터 i 구간의 끝)에 삽입
+        positions = self.offsets[lists + 1]
+        self.ids = np.insert(np.asarray(self.ids), positions, ids[order])
+        self.vectors = np.ascontiguousarray(np.insert(np.asarray(self.vectors), positions, vectors[order], axis=0))
+        self.offsets = self.offsets + np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=self.nlist))])
+
+    def remove(self, ids):
+        """
+        주어진 ID 의 벡터를 뺍니다. (없는 ID 는 무시)
+        """
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        counts = np.bincount(self.list_numbers()[keep], minlength=self.nlist)
+        self.ids = np.asarray(self.ids)[keep]
+        self.vectors = np.ascontiguousarray(np.asarray(self.vectors)[keep])
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def list_numbers(self):
+        """
+        저장된 각 벡터의 클러스터 번호 배열
+        """
+        return np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+
+    # 검색
+
+    def search(self, query, k=10, nprobe=None):
+        """
+        질의 벡터와 내적이 큰 상위 k개의 (ID 배열, 점수 배열)을 반환합니다.
+        """
+        if not len(self.ids) or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+
+        centroid_scores = self.centroids @ normalize_rows(query)
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        slices = [slice(self.offsets[i], self.offsets[i + 1]) for i in probes if self.offsets[i + 1] > self.offsets[i]]
+        if not slices:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        candidate_ids = np.concatenate([self.ids[s] for s in slices])
+        scores = np.concatenate([self.vectors[s] @ query for s in slices])
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((candidate_ids[top], -scores[top]))]
+        return candidate_ids[top], scores[top]
+
+    # 저장 / 로드
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        _save_npy(os.path.join(directory, CENTROIDS_FILE), np.asarray(self.centroids, dtype=np.float32))
+        _save_npy(os.path.join(directory, VECTORS_FILE), np.asarray(self.vectors, dtype=np.float32))
+        _save_npy(os.path.join(directory, IDS_FILE), np.asarray(self.ids, dtype=np.int64))
+        _save_npy(os.path.join(directory, OFFSETS_FILE), np.asarray(self.offsets, dtype=np.int64))
+        meta = dict(self.meta, nlist=self.nlist, nprobe=self.nprobe, count=len(self), saved_at=time.time())
+        meta_path = os.path.join(directory, META_FILE)
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory, nprobe=None, mmap_mode='r'):
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        index = cls(
+            centroids=np.load(os.path.join(directory, CENTROIDS_FILE)),
+            vectors=np.load(os.path.join(directory, VECTORS_FILE), mmap_mode=mmap_mode),
+            ids=np.load(os.path.join(directory, IDS_FILE), mmap_mode=mmap_mode),
+            offsets=np.load(os.path.join(directory, OFFSETS_FILE)),
+            nprobe=nprobe or meta.get('nprobe', 8),
+            meta=meta,
+        )
+        if not len(index.ids) == len(index.vectors) == meta['count'] or index.offsets[-1] != meta['count']:
+            raise ValueError("IVF 인덱스 파일이 서로 일치하지 않습니다.")
+        return index
+
+    @staticmethod
+    def meta_mtime(directory):
+        try:
+            return os.stat(os.path.join(directory, META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def get_ann_index(directory=None):
+    """
+    프로세스 단위로 IVF 인덱스를 메모리 맵으로 열어 재사용합니다. (인덱스가 없으면 None)
+    """
+    global _index, _index_mtime
+    directory = directory or get_embedding_dir()
+    mtime = IVFIndex.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _index_lock:
+        if _index is None or _index_mtime != mtime:
+            try:
+                _index = IVFIndex.load(directory)
+                _index_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                # 다른 프로세스가 교체 중이면 기존 인덱스를 계속 사용
+                if _index is None:
+                    return None
+        return _index
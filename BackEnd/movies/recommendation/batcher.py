@@ -0,0 +1,164 @@
+# movies/recommendation/batcher.py
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from movies.recommendation.embeddings import normalize_rows
+from movies.recommendation.model import get_sentence_model
+
+logger = logging.getLogger(__name__)
+
+# 키워드 임베딩 마이크로 배치 설정 (최대 묶음 크기 / 첫 요청 이후 더 모을 최대 대기 시간(ms))
+KEYWORD_ENCODE_BATCHING = getattr(settings, 'KEYWORD_ENCODE_BATCHING', True)
+KEYWORD_ENCODE_BATCH_SIZE = getattr(settings, 'KEYWORD_ENCODE_BATCH_SIZE', 32)
+KEYWORD_ENCODE_MAX_WAIT_MS = getattr(settings, 'KEYWORD_ENCODE_MAX_WAIT_MS', 5)
+
+
+class EncodeBatcher:
+    """
+    여러 스레드의 문장 임베딩 요청을 짧은 시간 모아 한 번의 model.encode 로 처리하는 워커 스레드
+
+    - submit(text) 는 바로 Future 를 반환하고, 워커가 묶음을 처리하면 정규화된 벡터가 채워집니다.
+    - 첫 요청이 들어온 뒤 max_wait_ms 동안(또는 max_batch_size 개가 찰 때까지) 요청을 더 모읍니다.
+    - 한 묶음 안의 같은 문장은 한 번만 임베딩합니다.
+    - 워커 스레드는 처음 요청할 때 띄우며, fork 된 워커 프로세스에서는 새로 띄웁니다.
+    - 대기열 길이와 묶음 크기 통계를 stats() 로 노출합니다.
+    """
+
+    def __init__(self, model_getter=get_sentence_model, max_batch_size=32, max_wait_ms=5, name=''):
+        self.model_getter = model_getter
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.encoded = 0
+        self.errors = 0
+        self.max_batch = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = 0.0
+        self.inference_seconds = 0.0
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != pid or not self._thread.is_alive():
+                if self._pid != pid:
+                    # fork 전 부모의 대기열/스레드는 자식 프로세스에서 쓸 수 없음
+                    self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name=f'encode-batcher-{self.name}', daemon=True)
+                self._pid = pid
+                self._thread.start()
+
+    def submit(self, text):
+        """
+        문장 하나의 임베딩을 요청하고 Future 를 반환합니다. (result() 는 정규화된 float32 벡터)
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        with self._lock:
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def encode(self, text, timeout=None):
+        """
+        submit 후 결과를 기다려 반환합니다.
+        """
+        return self.submit(text).result(timeout)
+
+    def _collect(self):
+        """
+        첫 요청을 기다린 뒤, 대기 시간이 끝나거나 묶음이 찰 때까지 요청을 더 모읍니다.
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            try:
+                model = self.model_getter()
+                vectors = normalize_rows(model.encode(
+                    texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False,
+                ))
+            except Exception as error:  # 요청한 스레드에서 예외를 다시 던지도록 Future 에 전달
+                logger.exception("문장 임베딩 묶음 처리 실패 (%d개)", len(batch))
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                with self._lock:
+                    self.errors += 1
+                continue
+            finished = time.perf_counter()
+
+            row_of = {text: row for row, text in enumerate(texts)}
+            for text, future, _ in batch:
+                future.set_result(vectors[row_of[text]])
+            with self._lock:
+                self.batches += 1
+                self.batched += len(batch)
+                self.encoded += len(texts)
+                self.max_batch = max(self.max_batch, len(batch))
+                self.wait_seconds += sum(started - queued_at for _, _, queued_at in batch)
+                self.inference_seconds += finished - started
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name': self.name,
+                'running': self._thread is not None and self._pid == os.getpid() and self._thread.is_alive(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'requests': self.requests,
+                'batches': self.batches,
+                'encoded': self.encoded,
+                'errors': self.errors,
+                'mean_batch_size': round(self.batched / self.batches, 3) if self.batches else None,
+                'max_batch': self.max_batch,
+                'mean_wait_ms': round(self.wait_seconds * 1000 / self.batched, 3) if self.batched else None,
+                'mean_inference_ms': round(self.inference_seconds * 1000 / self.batches, 3) if self.batches else None,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._reset_stats()
+
+
+# 키워드 질의 임베딩 (keyword_vector 가 캐시 미스일 때 사용)
+keyword_encoder = EncodeBatcher(
+    max_batch_size=KEYWORD_ENCODE_BATCH_SIZE, max_wait_ms=KEYWORD_ENCODE_MAX_WAIT_MS, name='keyword',
+)
+
+
+def encode_batcher_stats():
+    """
+    키워드 임베딩 묶음 처리 통계 (추천 지표 API 에서 노출)
+    """
+    return keyword_encoder.stats()
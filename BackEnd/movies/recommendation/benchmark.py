@@ -0,0 +1,322 @@
+# movies/recommendation/benchmark.py
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import CustomUser
+from community.models import Review
+from movies.models import Actor, Director, Genre, Movie, MovieCard
+from movies.popularity import log_normalize
+
+# 합성 데이터 식별용 (실제 TMDB ID 와 겹치지 않도록 음수 ID 사용)
+SYNTHETIC_PREFIX = 'bench'
+
+# 장르마다 제목/설명/검색어에 쓰는 단어 (키워드 추천 지연 시간 측정용)
+GENRE_WORDS = [
+    'space', 'zombie', 'romance', 'detective', 'dragon', 'robot',
+    'heist', 'ghost', 'war', 'ocean', 'family', 'time travel',
+    'vampire', 'samurai', 'alien', 'music', 'sports', 'magic',
+]
+FILLER_WORDS = ['story', 'journey', 'secret', 'night', 'city', 'friend', 'last', 'lost', 'world', 'dream']
+
+
+class SyntheticDataset:
+    """
+    벤치마크용 합성 데이터 (실제 모델 테이블에 bulk_create 로 저장)
+
+    - held_out[user_id]: 저장하지 않고 남겨 둔 좋아요 영화 ID 집합 (precision/recall 정답)
+    - keywords: 키워드 추천에 쓸 검색어 목록
+    """
+
+    def __init__(self, users, movies, held_out, keywords):
+        self.users = users
+        self.movies = movies
+        self.held_out = held_out
+        self.keywords = keywords
+
+
+def _through_rows(through, source_field, target_field, pairs):
+    through.objects.bulk_create(
+        [through(**{source_field: int(source), target_field: int(target)}) for source, target in pairs],
+        batch_size=5000, ignore_conflicts=True,
+    )
+
+
+def generate_synthetic_dataset(users=1000, movies=2000, genres=12, likes_per_user=20,
+                               holdout=0.2, follows_per_user=5, seed=0):
+    """
+    실제 모델(CustomUser, Movie, Genre, Actor, Director, Review 및 M2M 중개 테이블)에 합성 데이터를 만듭니다.
+
+    사용자마다 선호 장르 1~2개를 정하고 좋아요의 80% 는 선호 장르 영화에서 인기도 가중치로 고르므로,
+    장르/협업 신호를 쓰는 추천은 무작위보다 높은 precision 을 보여야 합니다.
+    좋아요 중 holdout 비율은 저장하지 않고 정답으로 남겨 둡니다.
+    """
+    rng = np.random.default_rng(seed)
+    genres = min(genres, len(GENRE_WORDS))
+    tag = f'{SYNTHETIC_PREFIX}{seed}'
+    id_base = -(seed + 1) * 10_000_000
+
+    genre_objects = Genre.objects.bulk_create(
+        [Genre(tmdb_id=id_base - index, name=f'{tag}-{GENRE_WORDS[index]}') for index in range(genres)]
+    )
+    genre_ids = np.array([genre.id for genre in genre_objects])
+
+    # 영화: 대표 장르 1개 + 추가 장르 0~2개, 인기도는 로그 정규 분포
+    main_genre = rng.integers(0, genres, movies)
+    popularity = rng.lognormal(mean=2.5, sigma=1.2, size=movies)
+    normalized = log_normalize(popularity)
+    movie_objects = []
+    for index in range(movies):
+        word = GENRE_WORDS[main_genre[index]]
+        fillers = rng.choice(FILLER_WORDS, 3)
+        movie_objects.append(Movie(
+            tmdb_id=id_base - index,
+            title=f'{fillers[0].title()} {word.title()} {index}',
+            overview=f'A {fillers[1]} {word} {fillers[2]} about {word} and {rng.choice(FILLER_WORDS)}.',
+            popularity=float(popularity[index]),
+            normalized_popularity=float(normalized[index]),
+        ))
+    movie_objects = Movie.objects.bulk_create(movie_objects, batch_size=2000)
+    movie_ids = np.array([movie.id for movie in movie_objects])
+
+    genre_pairs = set()
+    for index in range(movies):
+        genre_pairs.add((movie_ids[index], genre_ids[main_genre[index]]))
+        for extra in rng.choice(genres, rng.integers(0, 3), replace=False):
+            genre_pairs.add((movie_ids[index], genre_ids[extra]))
+    _through_rows(Movie.genres.through, 'movie_id', 'genre_id', genre_pairs)
+
+    # 배우/감독: 같은 장르 영화에 자주 나오도록 장르별로 묶어서 배정
+    actor_objects = Actor.objects.bulk_create(
+        [Actor(tmdb_id=id_base - index, name=f'{tag}-actor-{index}') for index in range(max(movies // 2, 1))],
+        batch_size=2000,
+    )
+    director_objects = Director.objects.bulk_create(
+        [Director(tmdb_id=id_base - index, name=f'{tag}-director-{index}') for index in range(max(movies // 10, 1))],
+        batch_size=2000,
+    )
+    actor_ids = np.array([actor.id for actor in actor_objects])
+    director_ids = np.array([director.id for director in director_objects])
+    actor_pairs, director_pairs = set(), set()
+    for index in range(movies):
+        actor_group = actor_ids[main_genre[index]::genres] if len(actor_ids) > genres else actor_ids
+        director_group = director_ids[main_genre[index]::genres] if len(director_ids) > genres else director_ids
+        for actor_id in rng.choice(actor_group, min(3, len(actor_group)), replace=False):
+            actor_pairs.add((actor_id, movie_ids[index]))
+        director_pairs.add((rng.choice(director_group), movie_ids[index]))
+    _through_rows(Actor.movies.through, 'actor_id', 'movie_id', actor_pairs)
+    _through_rows(Director.movies.through, 'director_id', 'movie_id', director_pairs)
+    MovieCard.refresh(movie_ids.tolist())
+
+    # 사용자
+    user_objects = CustomUser.objects.bulk_create(
+        [CustomUser(username=f'{tag}-user-{index}', password='!') for index in range(users)],
+        batch_size=2000,
+    )
+    user_ids = np.array([user.id for user in user_objects])
+    by_genre = [np.flatnonzero(main_genre == genre) for genre in range(genres)]
+    weights = popularity / popularity.sum()
+
+    actors_of, directors_of = {}, {}
+    for actor_id, movie_id in actor_pairs:
+        actors_of.setdefault(movie_id, []).append(actor_id)
+    for director_id, movie_id in director_pairs:
+        directors_of.setdefault(movie_id, []).append(director_id)
+
+    favorite_genre_pairs, like_pairs, watch_pairs, reviews = set(), set(), set(), []
+    favorite_actor_pairs, favorite_director_pairs = set(), set()
+    held_out = {}
+    user_genres = []
+    for index, user_id in enumerate(user_ids):
+        favorites = rng.choice(genres, rng.integers(1, 3), replace=False)
+        user_genres.append(set(favorites.tolist()))
+        favorite_genre_pairs.update((user_id, genre_ids[genre]) for genre in favorites)
+
+        preferred = np.concatenate([by_genre[genre] for genre in favorites])
+        count = max(2, int(rng.poisson(likes_per_user)))
+        from_preferred = min(len(preferred), int(round(count * 0.8)))
+        picks = set()
+        if from_preferred:
+            preferred_weights = weights[preferred] / weights[preferred].sum()
+            picks.update(rng.choice(preferred, from_preferred, replace=False, p=preferred_weights).tolist())
+        picks.update(rng.choice(movies, count - from_preferred, replace=False, p=weights).tolist())
+        picks = rng.permutation(sorted(picks))
+
+        test_count = int(round(len(picks) * holdout))
+        test, train = picks[:test_count], picks[test_count:]
+        held_out[int(user_id)] = set(movie_ids[test].tolist())
+        like_pairs.update((user_id, movie_ids[movie]) for movie in train)
+        watch_pairs.update((user_id, movie_ids[movie]) for movie in train)
+        watch_pairs.update((user_id, movie_ids[movie]) for movie in rng.choice(movies, 3, replace=False))
+        for movie in train[: max(1, len(train) // 4)]:
+            reviews.append(Review(
+                user_id=int(user_id), movie_id=int(movie_ids[movie]), title=f'{tag}-review',
+                content='synthetic', rating=int(rng.integers(4, 6)),
+            ))
+        # 좋아요한 첫 영화의 배우 2명/감독을 즐겨찾기
+        if len(train):
+            first_movie = movie_ids[train[0]]
+            favorite_actor_pairs.update((user_id, actor_id) for actor_id in actors_of.get(first_movie, [])[:2])
+            favorite_director_pairs.update((user_id, director_id) for director_id in directors_of.get(first_movie, []))
+
+    # 팔로우: 선호 장르가 겹치는 사용자 위주
+    follow_pairs = set()
+    for index, user_id in enumerate(user_ids):
+        candidates = rng.choice(users, min(users, follows_per_user * 4), replace=False)
+        similar = [other for other in candidates if other != index and user_genres[other] & user_genres[index]]
+        follow_pairs.update((user_id, user_ids[other]) for other in similar[:follows_per_user])
+
+    _through_rows(CustomUser.favorite_genres.through, 'customuser_id', 'genre_id', favorite_genre_pairs)
+    _through_rows(CustomUser.liked_movies.through, 'customuser_id', 'movie_id', like_pairs)
+    _through_rows(CustomUser.watched_movies.through, 'customuser_id', 'movie_id', watch_pairs)
+    _through_rows(CustomUser.favorite_actors.through, 'customuser_id', 'actor_id', favorite_actor_pairs)
+    _through_rows(CustomUser.favorite_directors.through, 'customuser_id', 'director_id', favorite_director_pairs)
+    _through_rows(CustomUser.following.through, 'from_customuser_id', 'to_customuser_id', follow_pairs)
+    Review.objects.bulk_create(reviews, batch_size=2000, ignore_conflicts=True)
+
+    keywords = [GENRE_WORDS[genre] for genre in range(genres)]
+    keywords += [f'{GENRE_WORDS[genre]} {word}' for genre in range(genres) for word in FILLER_WORDS[:3]]
+    return SyntheticDataset(user_objects, movie_ids, held_out, keywords)
+
+
+# 측정 도구
+
+def latency_summary(seconds):
+    """
+    호출별 소요 시간(초) 목록 -> p50/p95/평균/최대 (밀리초)
+    """
+    if not seconds:
+        return {'count': 0}
+    values = np.asarray(seconds) * 1000
+    return {
+        'count': len(values),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'mean_ms': round(float(values.mean()), 3),
+        'max_ms': round(float(values.max()), 3),
+    }
+
+
+def precision_recall_at_k(recommended, relevant, k):
+    """
+    추천 목록 상위 k개의 (precision@k, recall@k) (정답이 없으면 None)
+    """
+    if not relevant:
+        return None
+    hits = len(set(recommended[:k]) & relevant)
+    return hits / k, hits / len(relevant)
+
+
+def measure_calls(call, arguments):
+    """
+    arguments 의 각 값으로 call 을 실행하며 호출별 소요 시간과 SQL 쿼리 수를 잽니다.
+
+    Returns:
+        (results, seconds, query_counts)
+    """
+    results, seconds, query_counts = [], [], []
+    for argument in arguments:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            results.append(call(argument))
+            seconds.append(time.perf_counter() - started)
+        query_counts.append(len(queries))
+    return results, seconds, query_counts
+
+
+def measure_memory(call, arguments):
+    """
+    tracemalloc 으로 잰 호출 중 최대 Python 할당량(KB) (NumPy 배열 포함)
+    """
+    tracemalloc.start()
+    try:
+        for argument in arguments:
+            call(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def measure_throughput(call, arguments, threads=8):
+    """
+    threads 개 스레드가 동시에 call 을 실행할 때의 처리량과 호출별 지연 시간
+    """
+    def timed(argument):
+        started = time.perf_counter()
+        call(argument)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        seconds = list(executor.map(timed, arguments))
+    elapsed = time.perf_counter() - started
+    return {
+        'threads': threads,
+        'calls': len(seconds),
+        'seconds': round(elapsed, 3),
+        'calls_per_second': round(len(seconds) / elapsed, 1) if elapsed > 0 else None,
+        'latency': latency_summary(seconds),
+    }
+
+
+def max_rss_kb():
+    """
+    프로세스 최대 상주 메모리 (KB, Linux 기준)
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def evaluate_user_engine(recommend, users, held_out, k=10, memory_samples=20):
+    """
+    사용자 기반 추천 함수 recommend(user, k) 의 지연 시간, 쿼리 수, 메모리, precision@k/recall@k 를 측정합니다.
+    이미 좋아요한(학습용) 영화는 정답 평가에서 제외하기 위해 k + 좋아요 수 만큼 받아서 걸러냅니다.
+    """
+    liked = {
+        user.pk: set(user.liked_movies.values_list('id', flat=True)) for user in users
+    }
+    results, seconds, query_counts = measure_calls(
+        lambda user: recommend(user, k + len(liked[user.pk])), users,
+    )
+    precisions, recalls = [], []
+    for user, recommendations in zip(users, results):
+        ranked = [rec["movie_id"] for rec in recommendations if rec["movie_id"] not in liked[user.pk]]
+        scores = precision_recall_at_k(ranked, held_out.get(user.pk, set()), k)
+        if scores is not None:
+            precisions.append(scores[0])
+            recalls.append(scores[1])
+    return {
+        'latency': latency_summary(seconds),
+        'queries_per_call': round(float(np.mean(query_counts)), 2) if query_counts else 0,
+        'peak_alloc_kb': measure_memory(lambda user: recommend(user, k), users[:memory_samples]),
+        f'precision@{k}': round(float(np.mean(precisions)), 4) if precisions else None,
+        f'recall@{k}': round(float(np.mean(recalls)), 4) if recalls else None,
+        'evaluated_users': len(precisions),
+    }
+
+
+def evaluate_keyword_engine(recommend, keywords, k=10, memory_samples=20):
+    """
+    키워드 추천 함수 recommend(keyword) 의 지연 시간, 쿼리 수, 메모리를 측정합니다. (정답 데이터가 없으므로 품질 지표 없음)
+    """
+    _, seconds, query_counts = measure_calls(recommend, keywords)
+    return {
+        'latency': latency_summary(seconds),
+        'queries_per_call': round(float(np.mean(query_counts)), 2) if query_counts else 0,
+        'peak_alloc_kb': measure_memory(recommend, keywords[:memory_samples]),
+    }
+
+
+def popularity_recommendations(user, k=10):
+    """
+    비교 기준선: 전체 인기순 (사용자와 무관)
+    """
+    rows = MovieCard.objects.order_by('-normalized_popularity', 'movie_id').values_list(
+        'movie_id', 'normalized_popularity'
+    )[:k]
+    return [{"movie_id": movie_id, "score": score or 0.0} for movie_id, score in rows]
@@ -0,0 +1,181 @@
+# movies/recommendation/budget.py
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from movies.recommendation.catalog import get_cached_catalog
+
+logger = logging.getLogger(__name__)
+
+# 추천 요청 하나에 허용하는 시간 (ms, None 이면 제한 없이 요청 스레드에서 차례로 실행)
+RECOMMENDATION_TIME_BUDGET_MS = getattr(settings, 'RECOMMENDATION_TIME_BUDGET_MS', 500)
+# 추천 소스를 실행할 워커 프로세스당 스레드 수
+RECOMMENDATION_SOURCE_THREADS = getattr(settings, 'RECOMMENDATION_SOURCE_THREADS', 8)
+
+
+class SourceStats:
+    """
+    소스별 실행/시간 초과/오류 횟수 (추천 지표 API 에서 노출, 스레드 안전)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, status):
+        with self._lock:
+            counts = self._counts.setdefault(name, {'calls': 0, 'ok': 0, 'timeout': 0, 'error': 0})
+            counts['calls'] += 1
+            counts[status] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(counts, fallback_rate=round((counts['timeout'] + counts['error']) / counts['calls'], 4))
+                for name, counts in self._counts.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+source_stats = SourceStats()
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    프로세스 단위 스레드 풀 (fork 된 워커 프로세스에서는 새로 만듦)
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=RECOMMENDATION_SOURCE_THREADS, thread_name_prefix='recommendation-source',
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run_source(func, timing):
+    """
+    소스를 실행하고 timing 에 소스 자신의 시작/종료 시각을 기록합니다. (대기열에서 기다린 시간은 빠짐)
+    """
+    timing['started'] = time.perf_counter()
+    try:
+        return func()
+    finally:
+        timing['finished'] = time.perf_counter()
+        # 풀 스레드가 연 DB 연결은 요청/응답 주기 밖이므로 직접 정리
+        close_old_connections()
+
+
+def popular_fallback(limit=10, genre_ids=()):
+    """
+    메모리에 있는 카탈로그의 인기순 목록으로 만든 대체 추천
+    genre_ids 가 있으면 그 장르 영화 중 인기순을 먼저, 모자라면 전체 인기순으로 채웁니다.
+
+    카탈로그를 다시 만들거나 기다리지 않고 지금 메모리에 있는 것(만료됐어도)을 쓰며, 아직 없으면 빈 목록입니다.
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 정규화 인기도}, ...]
+    """
+    catalog = get_cached_catalog()
+    if catalog is None:
+        return []
+    rows = catalog.top_rows_for('genres', genre_ids, limit).tolist() if genre_ids else []
+    if len(rows) < limit:
+        chosen = set(rows)
+        rows += [row for row in catalog.popular_rows(limit + len(rows)).tolist() if row not in chosen][:limit - len(rows)]
+    return [{"movie_id": int(catalog.movie_ids[row]), "score": float(catalog.popularity[row])} for row in rows]
+
+
+def run_with_budget(sources, fallbacks, budget_ms=RECOMMENDATION_TIME_BUDGET_MS, defaults=None):
+    """
+    추천 소스들을 스레드 풀에서 동시에 실행하고, 요청 단위 마감 시각까지 끝나지 않거나 오류가 난 소스는
+    fallbacks 의 결과로 대신합니다. 마감을 넘긴 소스는 아직 시작 전이면 취소하고, 실행 중이면 결과를 버립니다.
+    (요청을 처리하는 워커는 마감 시각 이후 더 기다리지 않음)
+
+    Args:
+        sources: {이름: 인자 없는 함수}
+        fallbacks: {이름: 인자 없는 함수} (DB 를 읽지 않고 메모리만 쓰는 빠른 함수)
+        budget_ms: 요청 전체 시간 제한 (None 이면 제한 없이 요청 스레드에서 차례로 실행)
+        defaults: {이름: 대체 추천까지 실패했을 때 쓸 값} (없으면 빈 목록)
+
+    Returns:
+        (results, report): {이름: 결과},
+            {"budget_ms", "elapsed_ms", "degraded": [이름, ...],
+             "sources": {이름: {"status", "ms", "fallback_ms"}}}
+            ms 는 소스가 실제로 실행된 시간입니다. (시간 초과면 마감까지 실행한 시간, 시작도 못 했으면 None)
+            fallback_ms 는 대체 추천에 걸린 시간입니다. (status 가 ok 면 None)
+    """
+    started = time.perf_counter()
+    defaults = defaults or {}
+    results, report = {}, {'budget_ms': budget_ms, 'degraded': [], 'sources': {}}
+
+    def finish(name, status, result, timing):
+        now = time.perf_counter()
+        source_ms = None
+        if 'started' in timing:
+            source_ms = round((timing.get('finished', now) - timing['started']) * 1000, 3)
+        fallback_ms = None
+        if status != 'ok':
+            try:
+                result = fallbacks[name]()
+            except Exception:
+                # 대체 추천이 실패해도 요청 전체를 실패시키지 않음
+                logger.exception("추천 소스 %s 의 대체 추천 실패", name)
+                result = defaults.get(name, [])
+            fallback_ms = round((time.perf_counter() - now) * 1000, 3)
+            report['degraded'].append(name)
+        results[name] = result
+        report['sources'][name] = {'status': status, 'ms': source_ms, 'fallback_ms': fallback_ms}
+        source_stats.record(name, status)
+
+    if budget_ms is None:
+        for name, func in sources.items():
+            timing = {'started': time.perf_counter()}
+            try:
+                result = func()
+                timing['finished'] = time.perf_counter()
+                finish(name, 'ok', result, timing)
+            except Exception:
+                timing['finished'] = time.perf_counter()
+                logger.exception("추천 소스 %s 실행 실패", name)
+                finish(name, 'error', None, timing)
+    else:
+        deadline = started + budget_ms / 1000
+        executor = _get_executor()
+        timings = {name: {} for name in sources}
+        futures = {name: executor.submit(_run_source, func, timings[name]) for name, func in sources.items()}
+        for name, future in futures.items():
+            try:
+                result = future.result(timeout=max(0, deadline - time.perf_counter()))
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("추천 소스 %s 가 %sms 안에 끝나지 않아 대체 추천을 사용합니다.", name, budget_ms)
+                finish(name, 'timeout', None, dict(timings[name]))
+            except Exception:
+                logger.exception("추천 소스 %s 실행 실패", name)
+                finish(name, 'error', None, timings[name])
+            else:
+                finish(name, 'ok', result, timings[name])
+
+    report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return results, report
+
+
+def budget_stats():
+    """
+    소스별 실행/대체 횟수 (추천 지표 API 에서 노출)
+    """
+    return {'budget_ms': RECOMMENDATION_TIME_BUDGET_MS, 'sources': source_stats.stats()}
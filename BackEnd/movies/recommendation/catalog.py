@@ -0,0 +1,160 @@
+# movies/recommendation/catalog.py
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from movies.models import Actor, Director, Movie
+
+# 카탈로그 행렬을 다시 만들기 전까지 재사용할 시간 (초)
+CATALOG_TTL = getattr(settings, 'RECOMMENDATION_CATALOG_TTL', 60 * 5)
+
+
+def _incidence_matrix(pairs, row_of, columns):
+    """
+    (영화 ID, 대상 ID) 쌍 목록으로 (영화 수, 대상 수) 0/1 희소 행렬(CSR)을 만듭니다.
+    """
+    col_of = {column: index for index, column in enumerate(columns)}
+    pairs = [(row_of[movie_id], col_of[target_id]) for movie_id, target_id in pairs if movie_id in row_of]
+    rows = [row for row, _ in pairs]
+    cols = [col for _, col in pairs]
+    data = np.ones(len(pairs), dtype=np.float32)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(row_of), len(columns)), dtype=np.float32)
+    matrix.data[:] = 1  # 중복 쌍이 합쳐져 1보다 커지는 것을 방지
+    return matrix
+
+
+class Catalog:
+    """
+    추천 계산에 쓰는 영화 카탈로그 행렬 묶음
+
+    - movie_ids: 행 순서의 영화 ID 배열
+    - popularity: 행 순서의 normalized_popularity 배열
+    - release_years: 행 순서의 개봉 연도 배열 (개봉일이 없으면 0)
+    - genres / actors / directors: (영화 수, 장르/배우/감독 수) 0/1 희소 행렬
+    - genre_ids / actor_ids / director_ids: 각 행렬의 열 순서 ID 배열
+    """
+
+    def __init__(self):
+        movies = list(Movie.objects.order_by('id').values_list('id', 'normalized_popularity', 'release_date'))
+        self.movie_ids = np.array([movie_id for movie_id, _, _ in movies], dtype=np.int64)
+        self.popularity = np.array([popularity or 0.0 for _, popularity, _ in movies], dtype=np.float64)
+        self.release_years = np.array(
+            [release_date.year if release_date else 0 for _, _, release_date in movies], dtype=np.int32,
+        )
+        # 인기순(동점은 영화 ID 순) 행 번호와 각 행의 인기 순위
+        self.popularity_order = np.lexsort((self.movie_ids, -self.popularity))
+        self.popularity_rank = np.empty(len(movies), dtype=np.int64)
+        self.popularity_rank[self.popularity_order] = np.arange(len(movies))
+        self._postings = {}
+        self.row_of = {movie_id: row for row, movie_id in enumerate(self.movie_ids.tolist())}
+
+        self.genre_ids, self.genres = self._build(
+            Movie.genres.through.objects.values_list('movie_id', 'genre_id'),
+        )
+        self.actor_ids, self.actors = self._build(
+            Actor.movies.through.objects.values_list('movie_id', 'actor_id'),
+        )
+        self.director_ids, self.directors = self._build(
+            Director.movies.through.objects.values_list('movie_id', 'director_id'),
+        )
+        self.built_at = time.monotonic()
+
+    def _build(self, pairs):
+        pairs = list(pairs)
+        columns = sorted({target_id for _, target_id in pairs})
+        return np.array(columns, dtype=np.int64), _incidence_matrix(pairs, self.row_of, columns)
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def rows(self, movie_ids):
+        """
+        영화 ID 목록을 카탈로그 행 번호 배열로 변환합니다. (카탈로그에 없는 ID는 제외)
+        """
+        return np.array([self.row_of[movie_id] for movie_id in movie_ids if movie_id in self.row_of], dtype=np.int64)
+
+    def popular_rows(self, limit):
+        """
+        인기순 상위 limit 개 행 번호
+        """
+        return self.popularity_order[:limit]
+
+    def top_rows_for(self, name, selected_ids, limit):
+        """
+        선택한 장르/배우/감독(name = 'genres' | 'actors' | 'directors') 중 하나라도 포함하는 영화 가운데
+        인기순 상위 limit 개 행 번호를 반환합니다.
+
+        열마다 영화를 인기순으로 정렬해 둔 역색인을 쓰므로, 비용은 카탈로그 크기가 아니라
+        선택한 열 수 x limit 에 비례합니다.
+        """
+        column_ids = getattr(self, f'{name[:-1]}_ids')
+        columns = self.columns(column_ids, selected_ids)
+        if not len(columns) or limit <= 0:
+            return np.zeros(0, dtype=np.int64)
+        postings = self._postings.get(name)
+        if postings is None:
+            # 행을 인기 순위 순서로 바꾼 CSC 행렬: 열마다 indices 가 곧 인기 순위 오름차순
+            postings = self._postings[name] = sparse.csc_matrix(getattr(self, name)[self.popularity_order])
+            postings.sort_indices()
+        ranks = np.unique(np.concatenate([
+            postings.indices[postings.indptr[column]:min(postings.indptr[column] + limit, postings.indptr[column + 1])]
+            for column in columns
+        ]))[:limit]
+        return self.popularity_order[ranks]
+
+    @staticmethod
+    def columns(column_ids, selected_ids):
+        """
+        정렬된 열 ID 배열에서 selected_ids 의 열 번호 (없는 ID 는 제외)
+        """
+        selected = np.asarray(sorted(selected_ids), dtype=np.int64)
+        positions = np.searchsorted(column_ids, selected)
+        found = positions < len(column_ids)
+        found[found] = column_ids[positions[found]] == selected[found]
+        return positions[found]
+
+    @staticmethod
+    def indicator(column_ids, selected_ids):
+        """
+        열 ID 배열 기준으로 selected_ids 에 포함된 위치만 1인 벡터를 만듭니다.
+        """
+        return np.isin(column_ids, list(selected_ids)).astype(np.float32)
+
+
+_catalog = None
+# 카탈로그를 다시 만드는 스레드를 하나로 제한하는 잠금 (읽기는 잠그지 않음)
+_catalog_lock = threading.Lock()
+
+
+def get_cached_catalog():
+    """
+    지금 메모리에 있는 카탈로그 (만료됐어도 그대로, 없으면 None). 절대 DB 를 읽거나 기다리지 않습니다.
+    """
+    return _catalog
+
+
+def get_catalog(refresh=False):
+    """
+    프로세스 단위로 카탈로그 행렬을 캐시해 반환합니다. (CATALOG_TTL 이 지나면 다시 생성)
+
+    카탈로그는 잠금 밖의 변수에 통째로 바꿔 끼우므로, 다른 스레드가 다시 만드는 동안에는 기다리지 않고
+    이전 카탈로그를 그대로 반환합니다. 처음 만들 때와 refresh=True 일 때만 만드는 스레드를 기다립니다.
+    """
+    global _catalog
+    catalog = _catalog
+    if not refresh and catalog is not None and time.monotonic() - catalog.built_at <= CATALOG_TTL:
+        return catalog
+    if not _catalog_lock.acquire(blocking=refresh or catalog is None):
+        return catalog
+    try:
+        current = _catalog
+        if current is not catalog and current is not None:
+            # 기다리는 동안 다른 스레드가 새로 만듦
+            return current
+        _catalog = Catalog()
+        return _catalog
+    finally:
+        _catalog_lock.release()
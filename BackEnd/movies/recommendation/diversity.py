@@ -0,0 +1,87 @@
+# movies/recommendation/diversity.py
+import numpy as np
+from django.conf import settings
+
+from movies.recommendation.embeddings import get_embedding_store
+from movies.recommendation.keyword import OVERVIEW_WEIGHT, TITLE_WEIGHT
+
+# MMR 기본 가중치 (1 이면 점수 순서 그대로, 0 에 가까울수록 서로 다른 영화 우선)
+MMR_LAMBDA = getattr(settings, 'RECOMMENDATION_MMR_LAMBDA', 0.7)
+# MMR 을 쓸 때 추천 소스마다 가져올 후보 수 (이 중에서 k개를 다시 고름)
+MMR_CANDIDATES = getattr(settings, 'RECOMMENDATION_MMR_CANDIDATES', 50)
+
+
+def mmr_order(relevance, vectors, k, lambda_=MMR_LAMBDA):
+    """
+    Maximal Marginal Relevance 로 k개를 고른 순서 (후보 위치 배열)
+
+    매 단계 lambda_ * 점수 - (1 - lambda_) * (이미 고른 영화와의 최대 유사도) 가 가장 큰 후보를 고릅니다.
+    (후보 x 후보) 유사도 행렬 전체를 만들지 않고, 고른 영화 벡터와 후보 행렬의 행렬-벡터 곱 한 번으로
+    최대 유사도 배열만 np.maximum 으로 갱신합니다. (단계당 후보 수 x 차원에 비례, 동점은 앞선 후보)
+
+    Args:
+        relevance: (후보 수,) 점수 (0~1 로 맞춘 값)
+        vectors: (후보 수, 차원) 정규화된 벡터 (벡터가 없는 후보는 0 벡터 -> 유사도 0)
+    """
+    count = min(k, len(relevance))
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    relevance = np.asarray(relevance, dtype=np.float32)
+
+    order = np.empty(count, dtype=np.int64)
+    order[0] = np.argmax(relevance)
+    max_similarity = vectors @ vectors[order[0]]
+    available = np.ones(len(relevance), dtype=bool)
+    available[order[0]] = False
+    for step in range(1, count):
+        marginal = lambda_ * relevance - (1 - lambda_) * max_similarity
+        marginal[~available] = -np.inf
+        order[step] = np.argmax(marginal)
+        available[order[step]] = False
+        np.maximum(max_similarity, vectors @ vectors[order[step]], out=max_similarity)
+    return order
+
+
+def _candidate_vectors(items, store):
+    """
+    후보 순서의 정규화된 제목/설명 가중합 벡터 (저장소에 없는 영화는 0 벡터)
+    임시 배열을 줄이려고 모아 온 행 위에서 바로 가중합/정규화합니다.
+    """
+    row_of = store.row_of
+    rows = np.array([row_of.get(item["movie_id"], -1) for item in items], dtype=np.int64)
+    found = rows >= 0
+    vectors = np.take(np.asarray(store.titles), np.maximum(rows, 0), axis=0).astype(np.float32, copy=False)
+    overviews = np.take(np.asarray(store.overviews), np.maximum(rows, 0), axis=0).astype(np.float32, copy=False)
+    vectors *= TITLE_WEIGHT
+    overviews *= OVERVIEW_WEIGHT
+    vectors += overviews
+    norms = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    np.divide(vectors, norms[:, None], out=vectors, where=norms[:, None] > 0)
+    vectors[~found] = 0
+    return vectors
+
+
+def mmr_rerank(items, k=10, lambda_=MMR_LAMBDA, store=None):
+    """
+    추천 목록(개인화/키워드 추천 결과)을 MMR 로 다시 정렬해 상위 k개를 반환합니다.
+
+    - 영화 벡터는 키워드 추천과 같은 임베딩 저장소의 제목/설명 가중합을 씁니다. (요청 시 모델을 호출하지 않음)
+    - 추천 소스마다 점수 범위가 다르므로 후보 점수를 0~1 로 맞춘 뒤 lambda_ 를 적용합니다.
+    - 저장소가 없거나 lambda_ >= 1 이면 점수 순서 그대로 상위 k개를 반환합니다.
+
+    Args:
+        items: [{"movie_id": 영화 ID, "score": 점수, ...}, ...] (점수 내림차순)
+
+    Returns:
+        list[dict]: items 의 항목을 고른 순서대로
+    """
+    store = store or get_embedding_store()
+    if store is None or not len(store) or lambda_ >= 1 or len(items) <= 1:
+        return list(items[:k])
+
+    scores = np.array([item["score"] for item in items], dtype=np.float32)
+    spread = scores.max() - scores.min()
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+
+    return [items[index] for index in mmr_order(relevance, _candidate_vectors(items, store), k, lambda_).tolist()]
+
@@ -0,0 +1,250 @@
+# movies/recommendation/embeddings.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+# 저장 파일 이름
+MOVIE_IDS_FILE = 'movie_ids.npy'
+TITLE_FILE = 'title_embeddings.npy'
+OVERVIEW_FILE = 'overview_embeddings.npy'
+HASHES_FILE = 'content_hashes.npy'
+META_FILE = 'meta.json'
+
+
+def get_embedding_dir():
+    return getattr(settings, 'MOVIE_EMBEDDING_DIR', os.path.join(settings.BASE_DIR, 'embeddings'))
+
+
+def normalize_rows(vectors):
+    """
+    행 벡터를 L2 정규화합니다. (내적이 곧 코사인 유사도가 되도록, 0 벡터는 그대로 0)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _save_npy(directory, name, array):
+    """
+    임시 파일에 쓴 뒤 이름을 바꿔, 읽고 있는 워커가 쓰다 만 파일을 보지 않도록 합니다.
+    """
+    path = os.path.join(directory, name)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def content_hash(title, overview):
+    """
+    임베딩 입력(제목 + 설명)의 64비트 해시. 값이 바뀐 영화만 다시 임베딩하는 데 사용합니다.
+    """
+    text = f"{title or ''}\x00{overview or ''}"
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+def _content_hashes(movies):
+    return np.array([content_hash(title, overview) for _, title, overview in movies], dtype=np.int64)
+
+
+def encode_texts(model, texts, batch_size=64):
+    """
+    문장 목록을 배치로 임베딩해 정규화된 float32 행렬로 반환합니다.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    vectors = model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+    return normalize_rows(vectors)
+
+
+def write_embedding_store(directory, movie_ids, title_vectors, overview_vectors, model_name, content_hashes=None):
+    """
+    영화 ID 인덱스와 제목/설명 임베딩 행렬, 영화별 내용 해시를 .npy 파일로 저장합니다.
+    meta.json 을 마지막에 교체하므로, 워커는 meta.json 이 바뀐 것을 보고 새 파일을 다시 엽니다.
+    (content_hashes 가 없으면 0 으로 채워, 다음 증분 갱신 때 모두 다시 임베딩됩니다)
+    """
+    os.makedirs(directory, exist_ok=True)
+    if content_hashes is None:
+        content_hashes = np.zeros(len(movie_ids), dtype=np.int64)
+    _save_npy(directory, MOVIE_IDS_FILE, np.asarray(movie_ids, dtype=np.int64))
+    _save_npy(directory, TITLE_FILE, np.asarray(title_vectors, dtype=np.float32))
+    _save_npy(directory, OVERVIEW_FILE, np.asarray(overview_vectors, dtype=np.float32))
+    _save_npy(directory, HASHES_FILE, np.asarray(content_hashes, dtype=np.int64))
+
+    meta = {
+        'model': model_name,
+        'count': int(len(movie_ids)),
+        'dimension': int(np.asarray(title_vectors).shape[1]) if len(movie_ids) else 0,
+        'built_at': time.time(),
+    }
+    meta_path = os.path.join(directory, META_FILE)
+    tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+    return meta
+
+
+def build_embedding_store(model, model_name, directory=None, batch_size=64, queryset=None):
+    """
+    영화 제목과 설명을 배치로 임베딩해 저장소 파일을 만듭니다.
+    """
+    from movies.models import Movie
+
+    directory = directory or get_embedding_dir()
+    queryset = Movie.objects.all() if queryset is None else queryset
+    movies = list(queryset.order_by('id').values_list('id', 'title', 'overview'))
+    movie_ids = [movie_id for movie_id, _, _ in movies]
+    title_vectors = encode_texts(model, [title for _, title, _ in movies], batch_size)
+    overview_vectors = encode_texts(model, [overview or "" for _, _, overview in movies], batch_size)
+    return write_embedding_store(
+        directory, movie_ids, title_vectors, overview_vectors, model_name, _content_hashes(movies),
+    )
+
+
+def upsert_embedding_store(model, model_name, movie_ids, directory=None, batch_size=64, removed_ids=()):
+    """
+    주어진 영화들만 임베딩해 기존 저장소에 추가(이미 있으면 교체)하고, removed_ids 는 저장소에서 뺀 뒤 다시 저장합니다.
+    저장소가 없으면 전체를 새로 만듭니다.
+
+    Returns:
+        (meta, movie_ids, title_vectors, overview_vectors): 새로 임베딩한 영화와 벡터
+    """
+    from movies.models import Movie
+
+    directory = directory or get_embedding_dir()
+    movies = list(Movie.objects.filter(id__in=list(movie_ids)).order_by('id').values_list('id', 'title', 'overview'))
+    new_ids = np.array([movie_id for movie_id, _, _ in movies], dtype=np.int64)
+    new_titles = encode_texts(model, [title for _, title, _ in movies], batch_size)
+    new_overviews = encode_texts(model, [overview or "" for _, _, overview in movies], batch_size)
+
+    if EmbeddingStore.meta_mtime(directory) is None:
+        meta = build_embedding_store(model, model_name, directory, batch_size)
+        return meta, new_ids, new_titles, new_overviews
+    removed_ids = np.asarray(list(removed_ids), dtype=np.int64)
+    if not len(new_ids) and not len(removed_ids):
+        return EmbeddingStore(directory).meta, new_ids, new_titles, new_overviews
+
+    store = EmbeddingStore(directory)
+    keep = ~np.isin(store.movie_ids, np.concatenate([new_ids, removed_ids]))
+    dimension = store.titles.shape[1]
+    meta = write_embedding_store(
+        directory,
+        np.concatenate([store.movie_ids[keep], new_ids]),
+        np.concatenate([store.titles[keep], new_titles.reshape(len(new_ids), dimension)]),
+        np.concatenate([store.overviews[keep], new_overviews.reshape(len(new_ids), dimension)]),
+        model_name,
+        np.concatenate([store.content_hashes[keep], _content_hashes(movies)]),
+    )
+    return meta, new_ids, new_titles, new_overviews
+
+
+def stale_movie_ids(store):
+    """
+    저장소에 없거나 제목/설명 해시가 저장된 값과 다른 영화(다시 임베딩할 대상)와,
+    저장소에는 있지만 DB 에서 사라진 영화를 찾습니다. (임베딩 없이 해시만 비교)
+
+    Returns:
+        (stale_ids, removed_ids): 정렬된 int64 배열 2개
+    """
+    from movies.models import Movie
+
+    movies = list(Movie.objects.order_by('id').values_list('id', 'title', 'overview'))
+    movie_ids = np.array([movie_id for movie_id, _, _ in movies], dtype=np.int64)
+    if store is None or not len(store):
+        return movie_ids, np.zeros(0, dtype=np.int64)
+
+    hashes = _content_hashes(movies)
+    stored_ids = np.asarray(store.movie_ids)
+    order = np.argsort(stored_ids)
+    positions = np.searchsorted(stored_ids, movie_ids, sorter=order).clip(max=len(stored_ids) - 1)
+    rows = order[positions]
+    known = stored_ids[rows] == movie_ids
+    changed = ~known | (np.asarray(store.content_hashes)[rows] != hashes)
+    return movie_ids[changed], np.setdiff1d(stored_ids, movie_ids)
+
+
+class EmbeddingStore:
+    """
+    디스크에 저장된 영화 임베딩을 읽기 전용 메모리 맵으로 여는 클래스
+
+    - 여러 워커 프로세스가 같은 파일을 열면 운영체제 페이지 캐시를 통해 한 벌의 벡터를 공유합니다.
+    - 벡터는 L2 정규화되어 있어 내적이 곧 코사인 유사도입니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.movie_ids = np.load(os.path.join(directory, MOVIE_IDS_FILE), mmap_mode='r')
+        self.titles = np.load(os.path.join(directory, TITLE_FILE), mmap_mode='r')
+        self.overviews = np.load(os.path.join(directory, OVERVIEW_FILE), mmap_mode='r')
+        if not len(self.movie_ids) == len(self.titles) == len(self.overviews) == self.meta['count']:
+            # 다른 프로세스가 파일을 교체하는 중인 경우
+            raise ValueError("임베딩 저장소 파일이 서로 일치하지 않습니다.")
+        self._row_of = None
+        self._content_hashes = None
+
+    @property
+    def content_hashes(self):
+        """
+        영화별 제목/설명 해시 (해시 파일이 없던 예전 저장소는 0 으로 채워 전부 다시 임베딩 대상이 됨)
+        """
+        if self._content_hashes is None:
+            path = os.path.join(self.directory, HASHES_FILE)
+            hashes = np.load(path) if os.path.exists(path) else None
+            if hashes is None or len(hashes) != len(self.movie_ids):
+                hashes = np.zeros(len(self.movie_ids), dtype=np.int64)
+            self._content_hashes = hashes
+        return self._content_hashes
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    @property
+    def row_of(self):
+        """
+        영화 ID -> 행 번호 사전 (처음 필요할 때 생성)
+        """
+        if self._row_of is None:
+            self._row_of = {movie_id: row for row, movie_id in enumerate(self.movie_ids.tolist())}
+        return self._row_of
+
+    @staticmethod
+    def meta_mtime(directory):
+        try:
+            return os.stat(os.path.join(directory, META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+_store = None
+_store_mtime = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store(directory=None):
+    """
+    프로세스 단위로 임베딩 저장소를 열어 재사용합니다.
+    저장소가 다시 만들어지면(meta.json 변경) 새 파일을 다시 열고, 저장소가 없으면 None 을 반환합니다.
+    """
+    global _store, _store_mtime
+    directory = directory or get_embedding_dir()
+    mtime = EmbeddingStore.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _store_lock:
+        if _store is None or _store.directory != directory or _store_mtime != mtime:
+            try:
+                _store = EmbeddingStore(directory)
+                _store_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                # 교체 중이라 읽지 못하면 기존 저장소를 계속 사용 (다음 요청에서 다시 시도)
+                if _store is None or _store.directory != directory:
+                    return None
+        return _store
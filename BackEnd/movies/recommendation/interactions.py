@@ -0,0 +1,75 @@
+# movies/recommendation/interactions.py
+import numpy as np
+from scipy import sparse
+
+from accounts.models import CustomUser
+from community.models import Review
+
+# 사용자-영화 상호작용 강도 (같은 쌍에 여러 신호가 있으면 가장 강한 값 사용)
+LIKED_WEIGHT = 1.0
+WATCHED_WEIGHT = 0.5
+# 리뷰 별점 -> 강도 (2점 이하는 선호 신호로 보지 않음)
+RATING_WEIGHTS = {1: 0.0, 2: 0.0, 3: 0.4, 4: 0.7, 5: 1.0}
+
+
+class Interactions:
+    """
+    사용자 x 영화 암묵적 피드백 행렬
+
+    - user_ids / movie_ids: 행/열 순서의 ID 배열
+    - matrix: (사용자 수, 영화 수) CSR 행렬, 값은 상호작용 강도 (0 < 값 <= 1)
+    """
+
+    def __init__(self, user_ids, movie_ids, matrix):
+        self.user_ids = user_ids
+        self.movie_ids = movie_ids
+        self.matrix = matrix
+        self.user_row_of = {user_id: row for row, user_id in enumerate(user_ids.tolist())}
+        self.movie_col_of = {movie_id: col for col, movie_id in enumerate(movie_ids.tolist())}
+
+    @classmethod
+    def from_triples(cls, triples):
+        """
+        (사용자 ID, 영화 ID, 강도) 목록으로 행렬을 만듭니다. 같은 쌍은 최댓값으로 합칩니다.
+        """
+        triples = [(user_id, movie_id, weight) for user_id, movie_id, weight in triples if weight > 0]
+        users = np.array([user_id for user_id, _, _ in triples], dtype=np.int64)
+        movies = np.array([movie_id for _, movie_id, _ in triples], dtype=np.int64)
+        weights = np.array([weight for _, _, weight in triples], dtype=np.float32)
+
+        user_ids, rows = np.unique(users, return_inverse=True)
+        movie_ids, cols = np.unique(movies, return_inverse=True)
+        # (행, 열) 순, 같은 쌍 안에서는 강도 오름차순으로 정렬한 뒤 쌍마다 마지막(최댓값)만 남김
+        keys = rows * max(len(movie_ids), 1) + cols
+        order = np.lexsort((weights, keys))
+        sorted_keys = keys[order]
+        picked = order[np.append(sorted_keys[1:] != sorted_keys[:-1], True)] if len(order) else order
+        matrix = sparse.csr_matrix(
+            (weights[picked], (rows[picked], cols[picked])),
+            shape=(len(user_ids), len(movie_ids)), dtype=np.float32,
+        )
+        return cls(user_ids, movie_ids, matrix)
+
+    @classmethod
+    def load(cls):
+        """
+        좋아요, 시청 기록, 리뷰 별점 테이블을 한 번씩 읽어 행렬을 만듭니다.
+        """
+        triples = []
+        triples.extend(
+            (user_id, movie_id, LIKED_WEIGHT)
+            for user_id, movie_id in CustomUser.liked_movies.through.objects.values_list('customuser_id', 'movie_id')
+        )
+        triples.extend(
+            (user_id, movie_id, WATCHED_WEIGHT)
+            for user_id, movie_id in CustomUser.watched_movies.through.objects.values_list('customuser_id', 'movie_id')
+        )
+        triples.extend(
+            (user_id, movie_id, RATING_WEIGHTS.get(rating, 0.0))
+            for user_id, movie_id, rating in Review.objects.exclude(movie=None).values_list('user_id', 'movie_id', 'rating')
+        )
+        return cls.from_triples(triples)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
@@ -0,0 +1,233 @@
+# movies/recommendation/item_cf.py
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from movies.recommendation.embeddings import get_embedding_dir
+
+# 저장 파일 이름
+MOVIE_IDS_FILE = 'cf_movie_ids.npy'
+NEIGHBOR_IDS_FILE = 'cf_neighbor_ids.npy'
+NEIGHBOR_SCORES_FILE = 'cf_neighbor_scores.npy'
+META_FILE = 'cf_meta.json'
+
+
+def _save_npy(path, array):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def compute_item_neighbors(matrix, top_k=20, chunk_size=1024, min_common=1):
+    """
+    사용자 x 영화 상호작용 행렬로 영화마다 코사인 유사도 상위 top_k 이웃 영화를 계산합니다.
+
+    - 영화 열 벡터를 L2 정규화한 뒤 (영화 x 사용자) @ (사용자 x 영화) 희소 곱으로 동시 출현 유사도를 구합니다.
+    - 전체 (영화 x 영화) 행렬을 한 번에 만들지 않고 chunk_size 개 영화씩 나눠 계산합니다.
+    - 함께 상호작용한 사용자가 min_common 명 미만인 쌍은 제외합니다.
+
+    Returns:
+        (neighbor_cols, neighbor_scores): (영화 수, top_k) 배열, 이웃이 모자라면 열 번호 -1 / 점수 0
+    """
+    matrix = sparse.csc_matrix(matrix, dtype=np.float32)
+    num_movies = matrix.shape[1]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    normalized = sparse.csr_matrix(matrix @ sparse.diags(np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)))
+    item_user = normalized.T.tocsr()
+    binary = normalized.copy()
+    binary.data[:] = 1
+    binary_item_user = binary.T.tocsr()
+
+    neighbor_cols = np.full((num_movies, top_k), -1, dtype=np.int64)
+    neighbor_scores = np.zeros((num_movies, top_k), dtype=np.float32)
+    for start in range(0, num_movies, chunk_size):
+        stop = min(start + chunk_size, num_movies)
+        similarity = (item_user[start:stop] @ normalized).tocsr()
+        if min_common > 1:
+            common = (binary_item_user[start:stop] @ binary).tocsr()
+            similarity = similarity.multiply(common >= min_common).tocsr()
+        # 자기 자신과 유사도 0 인 쌍 제외
+        similarity = similarity.tocoo()
+        keep = (similarity.row + start != similarity.col) & (similarity.data > 0)
+        similarity = sparse.csr_matrix(
+            (similarity.data[keep], (similarity.row[keep], similarity.col[keep])), shape=similarity.shape,
+        )
+
+        for offset in range(stop - start):
+            begin, end = similarity.indptr[offset], similarity.indptr[offset + 1]
+            if begin == end:
+                continue
+            cols = similarity.indices[begin:end]
+            scores = similarity.data[begin:end]
+            count = min(top_k, len(scores))
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.lexsort((cols[top], -scores[top]))]
+            neighbor_cols[start + offset, :count] = cols[top]
+            neighbor_scores[start + offset, :count] = scores[top]
+    return neighbor_cols, neighbor_scores
+
+
+class ItemNeighbors:
+    """
+    영화별 "이 영화를 좋아한 사용자가 좋아한 영화" 이웃 목록
+
+    - neighbor_ids[i] / neighbor_scores[i]: movie_ids[i] 영화의 이웃 영화 ID / 유사도 (ID -1 은 빈 칸)
+    - 영화 ID -> 행 번호 사전으로 찾으므로 조회 비용은 영화 한 편당 상수 시간입니다.
+    """
+
+    # 저장 파일 이름 (같은 형식의 다른 이웃 목록은 하위 클래스에서 바꿔 씀)
+    MOVIE_IDS_FILE = MOVIE_IDS_FILE
+    NEIGHBOR_IDS_FILE = NEIGHBOR_IDS_FILE
+    NEIGHBOR_SCORES_FILE = NEIGHBOR_SCORES_FILE
+    META_FILE = META_FILE
+
+    def __init__(self, movie_ids, neighbor_ids, neighbor_scores, meta=None):
+        self.movie_ids = movie_ids
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+        self.meta = meta or {}
+        self.row_of = {movie_id: row for row, movie_id in enumerate(np.asarray(movie_ids).tolist())}
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    @classmethod
+    def build(cls, interactions, top_k=20, chunk_size=1024, min_common=1):
+        neighbor_cols, neighbor_scores = compute_item_neighbors(
+            interactions.matrix, top_k=top_k, chunk_size=chunk_size, min_common=min_common,
+        )
+        movie_ids = interactions.movie_ids
+        neighbor_ids = np.where(neighbor_cols >= 0, movie_ids[np.maximum(neighbor_cols, 0)], -1)
+        meta = {
+            'top_k': top_k,
+            'min_common': min_common,
+            'users': int(interactions.shape[0]),
+            'interactions': int(interactions.matrix.nnz),
+            'built_at': time.time(),
+        }
+        return cls(movie_ids, neighbor_ids, neighbor_scores, meta)
+
+    def neighbors(self, movie_id, k=10):
+        """
+        영화의 이웃 상위 k개 (상호작용 기록이 없는 영화는 빈 목록)
+
+        Returns:
+            list[dict]: [{"movie_id": 영화 ID, "score": 유사도}, ...]
+        """
+        row = self.row_of.get(movie_id)
+        if row is None:
+            return []
+        ids = self.neighbor_ids[row, :k]
+        scores = self.neighbor_scores[row, :k]
+        return [
+            {"movie_id": int(neighbor_id), "score": float(score)}
+            for neighbor_id, score in zip(ids, scores) if neighbor_id >= 0
+        ]
+
+    def scores_for(self, movie_ids, weights=None):
+        """
+        여러 영화(예: 사용자가 좋아요한 영화)의 이웃 유사도를 (가중) 합산한 {영화 ID: 점수} 사전
+        """
+        weights = weights if weights is not None else [1.0] * len(movie_ids)
+        totals = {}
+        for movie_id, weight in zip(movie_ids, weights):
+            row = self.row_of.get(movie_id)
+            if row is None:
+                continue
+            for neighbor_id, score in zip(self.neighbor_ids[row].tolist(), self.neighbor_scores[row].tolist()):
+                if neighbor_id >= 0:
+                    totals[neighbor_id] = totals.get(neighbor_id, 0.0) + weight * score
+        return totals
+
+    # 저장 / 로드
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        _save_npy(os.path.join(directory, self.MOVIE_IDS_FILE), np.asarray(self.movie_ids, dtype=np.int64))
+        _save_npy(os.path.join(directory, self.NEIGHBOR_IDS_FILE), np.asarray(self.neighbor_ids, dtype=np.int64))
+        _save_npy(os.path.join(directory, self.NEIGHBOR_SCORES_FILE), np.asarray(self.neighbor_scores, dtype=np.float32))
+        meta = dict(self.meta, count=len(self))
+        meta_path = os.path.join(directory, self.META_FILE)
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, cls.META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        neighbors = cls(
+            np.load(os.path.join(directory, cls.MOVIE_IDS_FILE)),
+            np.load(os.path.join(directory, cls.NEIGHBOR_IDS_FILE)),
+            np.load(os.path.join(directory, cls.NEIGHBOR_SCORES_FILE)),
+            meta,
+        )
+        if not len(neighbors.movie_ids) == len(neighbors.neighbor_ids) == len(neighbors.neighbor_scores) == meta['count']:
+            raise ValueError("이웃 영화 파일이 서로 일치하지 않습니다.")
+        return neighbors
+
+    @classmethod
+    def meta_mtime(cls, directory):
+        try:
+            return os.stat(os.path.join(directory, cls.META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+_neighbors = None
+_neighbors_mtime = None
+_neighbors_lock = threading.Lock()
+
+
+def get_item_neighbors(directory=None):
+    """
+    프로세스 단위로 이웃 영화 테이블을 메모리에 올려 재사용합니다. (build_item_neighbors 로 다시 만들면 자동으로 다시 읽음)
+    """
+    global _neighbors, _neighbors_mtime
+    directory = directory or get_embedding_dir()
+    mtime = ItemNeighbors.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _neighbors_lock:
+        if _neighbors is None or _neighbors_mtime != mtime:
+            try:
+                _neighbors = ItemNeighbors.load(directory)
+                _neighbors_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                if _neighbors is None:
+                    return None
+        return _neighbors
+
+
+def also_liked_recommendations(movie_id, k=10):
+    """
+    "이 영화를 좋아한 사용자들이 좋아한 영화" 상위 k개 (이웃 테이블이 없으면 빈 목록)
+    """
+    neighbors = get_item_neighbors()
+    if neighbors is None:
+        return []
+    return neighbors.neighbors(movie_id, k)
+
+
+def item_cf_recommendations(user, k=10):
+    """
+    사용자가 좋아요한 영화들의 이웃 유사도를 합산한 협업 필터링 추천 (이미 좋아요한 영화 제외)
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...] (이웃 테이블이 없으면 빈 목록)
+    """
+    neighbors = get_item_neighbors()
+    if neighbors is None:
+        return []
+    liked_ids = list(user.liked_movies.values_list('id', flat=True))
+    totals = neighbors.scores_for(liked_ids)
+    for movie_id in liked_ids:
+        totals.pop(movie_id, None)
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:k]
+    return [{"movie_id": movie_id, "score": score} for movie_id, score in ranked]
@@ -0,0 +1,324 @@
+# movies/recommendation/keyword.py
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+
+from movies.recommendation.ann import IVFIndex, get_ann_index
+from movies.recommendation.batcher import KEYWORD_ENCODE_BATCHING, keyword_encoder
+from movies.recommendation.embeddings import (
+    EmbeddingStore, get_embedding_dir, get_embedding_store, normalize_rows,
+    stale_movie_ids, upsert_embedding_store,
+)
+from movies.recommendation.model import get_sentence_model
+from movies.recommendation.personalized import top_k
+from movies.recommendation.quantized import QuantizedVectors, get_quantized_vectors, quantize_rows
+from movies.recommendation.query_cache import keyword_result_cache, keyword_vector_cache, normalize_keyword
+
+logger = logging.getLogger(__name__)
+
+# 제목/설명 유사도 가중치
+TITLE_WEIGHT = 0.6
+OVERVIEW_WEIGHT = 0.4
+
+# 근사 검색 설정 (영화 수가 ANN_MIN_SIZE 미만이면 전수 검색이 더 빠르므로 인덱스를 쓰지 않음)
+ANN_MIN_SIZE = getattr(settings, 'MOVIE_ANN_MIN_SIZE', 10000)
+ANN_NPROBE = getattr(settings, 'MOVIE_ANN_NPROBE', 8)
+
+# int8 양자화 검색 설정 (근사 점수 상위 QUANTIZED_RERANK 개만 float32 로 다시 점수 계산)
+QUANTIZED = getattr(settings, 'MOVIE_EMBEDDING_QUANTIZED', False)
+QUANTIZED_RERANK = getattr(settings, 'MOVIE_QUANTIZED_RERANK', 200)
+
+
+def combined_vectors(titles, overviews):
+    """
+    제목/설명 벡터를 가중합한 벡터 (키워드 벡터와의 내적이 곧 가중 코사인 유사도)
+    """
+    return TITLE_WEIGHT * np.asarray(titles, dtype=np.float32) + OVERVIEW_WEIGHT * np.asarray(overviews, dtype=np.float32)
+
+
+def keyword_scores(keyword_vector, store):
+    """
+    정규화된 키워드 벡터와 저장소 전체 영화의 가중 코사인 유사도를 한 번의 행렬-벡터 곱으로 계산합니다.
+    """
+    keyword_vector = normalize_rows(keyword_vector)
+    return TITLE_WEIGHT * (store.titles @ keyword_vector) + OVERVIEW_WEIGHT * (store.overviews @ keyword_vector)
+
+
+def build_keyword_index(store=None, nlist=None, nprobe=ANN_NPROBE, iterations=10):
+    """
+    임베딩 저장소 전체로 IVF 인덱스를 학습해 저장소와 같은 위치에 저장합니다.
+    """
+    store = store or get_embedding_store()
+    if store is None:
+        return None
+    index = IVFIndex.train(
+        store.movie_ids, combined_vectors(store.titles, store.overviews),
+        nlist=nlist, nprobe=nprobe, iterations=iterations,
+    )
+    index.meta['store_built_at'] = store.meta['built_at']
+    index.save(store.directory)
+    return index
+
+
+def build_quantized_keyword_vectors(store=None, chunk_size=8192):
+    """
+    저장소의 제목/설명 가중합 벡터를 int8 로 양자화해 저장소와 같은 위치에 저장합니다.
+    (행 순서는 저장소와 같으며, float32 전체를 한 번에 펼치지 않도록 묶음 단위로 변환)
+    """
+    store = store or get_embedding_store()
+    if store is None:
+        return None
+    codes = np.zeros((len(store), store.titles.shape[1] if len(store) else 0), dtype=np.int8)
+    scales = np.zeros(len(store), dtype=np.float32)
+    for start in range(0, len(store), chunk_size):
+        stop = start + chunk_size
+        codes[start:stop], scales[start:stop] = quantize_rows(
+            combined_vectors(store.titles[start:stop], store.overviews[start:stop])
+        )
+    vectors = QuantizedVectors(np.asarray(store.movie_ids), codes, scales, {'store_built_at': store.meta['built_at']})
+    vectors.save(store.directory)
+    return vectors
+
+
+def _sync_search_indexes(directory, meta, new_ids, titles, overviews, removed_ids=()):
+    """
+    저장소가 바뀐 뒤 IVF 인덱스와 int8 벡터를 맞춥니다.
+    IVF 인덱스는 바뀐 영화만 넣고 빼며(중심점은 다시 학습하지 않음), int8 벡터는 새 저장소 기준으로 다시 양자화합니다.
+    """
+    if QuantizedVectors.meta_mtime(directory) is not None:
+        build_quantized_keyword_vectors(get_embedding_store(directory))
+    if IVFIndex.meta_mtime(directory) is None:
+        return
+    index = IVFIndex.load(directory, mmap_mode=None)
+    if len(removed_ids):
+        index.remove(removed_ids)
+    if len(new_ids):
+        index.add(new_ids, combined_vectors(titles, overviews))
+    index.meta['store_built_at'] = meta['built_at']
+    index.save(directory)
+
+
+def refresh_keyword_index(model=None, batch_size=64, dry_run=False):
+    """
+    제목/설명 해시가 바뀌었거나 새로 생긴 영화만 배치로 다시 임베딩하고, 삭제된 영화는 저장소/IVF 인덱스에서 뺍니다.
+    바뀐 영화가 없으면 문장 임베딩 모델도 불러오지 않습니다. (저장소가 없으면 아무것도 하지 않음)
+
+    Returns:
+        dict: {"stale": 다시 임베딩한(dry_run 이면 할) 영화 수, "removed": 뺀 영화 수}
+    """
+    directory = get_embedding_dir()
+    if EmbeddingStore.meta_mtime(directory) is None:
+        return {"stale": 0, "removed": 0}
+    stale_ids, removed_ids = stale_movie_ids(EmbeddingStore(directory))
+    summary = {"stale": len(stale_ids), "removed": len(removed_ids)}
+    if dry_run or not (len(stale_ids) or len(removed_ids)):
+        return summary
+
+    meta, new_ids, titles, overviews = upsert_embedding_store(
+        model or get_sentence_model(), settings.SENTENCE_TRANSFORMER_MODEL, stale_ids, directory, batch_size,
+        removed_ids=removed_ids,
+    )
+    _sync_search_indexes(directory, meta, new_ids, titles, overviews, removed_ids)
+    summary["stale"] = len(new_ids)
+    return summary
+
+
+def _search_backend(store):
+    """
+    저장소에 맞는 검색 방식: ('ann', IVF 인덱스) / ('int8', 양자화 벡터) / ('exact', None)
+    저장소와 만든 시점이 다른 인덱스/양자화 벡터는 쓰지 않습니다.
+    """
+    if len(store) >= ANN_MIN_SIZE:
+        index = get_ann_index(store.directory)
+        if index is not None and index.meta.get('store_built_at') == store.meta['built_at']:
+            return 'ann', index
+    if QUANTIZED:
+        vectors = get_quantized_vectors(store.directory)
+        if vectors is not None and vectors.meta.get('store_built_at') == store.meta['built_at']:
+            return 'int8', vectors
+    return 'exact', None
+
+
+def quantized_search(query, store, vectors, k=10, rerank=QUANTIZED_RERANK):
+    """
+    int8 근사 점수로 상위 rerank 개 후보를 고른 뒤, 후보만 float32 원본 벡터로 다시 점수 매겨 상위 k개를 반환합니다.
+    """
+    query = normalize_rows(query)
+    rows = np.sort(vectors.candidates(query, max(rerank, k)))
+    exact = TITLE_WEIGHT * (store.titles[rows] @ query) + OVERVIEW_WEIGHT * (store.overviews[rows] @ query)
+    return top_k(np.asarray(store.movie_ids)[rows], exact, k)
+
+
+def search_store(query, store, k=10, nprobe=None):
+    """
+    질의 벡터와 가장 가까운 영화 k개 (IVF 근사 검색 / int8 + float32 재정렬 / 전수 검색 중 저장소에 맞는 방식)
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...]
+    """
+    backend, searcher = _search_backend(store)
+    if backend == 'ann':
+        movie_ids, scores = searcher.search(query, k, nprobe=nprobe or ANN_NPROBE)
+        return [{"movie_id": int(movie_id), "score": float(score)} for movie_id, score in zip(movie_ids, scores)]
+    if backend == 'int8':
+        return quantized_search(query, store, searcher, k)
+    return top_k(np.asarray(store.movie_ids), keyword_scores(query, store), k)
+
+
+def keyword_query_vectors(keywords, model=None):
+    """
+    재현율 측정용 실제 키워드 질의 임베딩 (keywords 순서의 정규화된 (질의 수, 차원) 행렬)
+    """
+    model = model or get_sentence_model()
+    return normalize_rows(np.asarray(model.encode([normalize_keyword(keyword) for keyword in keywords]), dtype=np.float32))
+
+
+def _holdout_queries(store, queries, seed):
+    """
+    저장소에서 질의로 쓸 영화 행을 뽑아 (행 배열, 정규화된 질의 행렬)을 반환합니다.
+    """
+    rows = np.sort(np.random.default_rng(seed).choice(len(store), min(queries, len(store)), replace=False))
+    return rows, normalize_rows(combined_vectors(store.titles[rows], store.overviews[rows]))
+
+
+def quantized_recall(store, vectors, queries=100, k=10, rerank=QUANTIZED_RERANK, seed=0, query_vectors=None):
+    """
+    float32 전수 검색 top-k 대비 int8 검색의 재현율을 잽니다.
+
+    query_vectors(실제 키워드 임베딩)를 주면 그 질의로 잽니다. 주지 않으면 저장된 영화 벡터를 질의로 쓰되,
+    질의로 쓴 영화는 두 검색 결과에서 모두 빼고 잽니다. (자기 자신이 항상 1위로 맞아 재현율이 부풀려지지 않도록)
+
+    질의마다 float32 전수 검색(keyword_scores)과 int8 검색 + 재정렬(quantized_search)의 시간도 함께 잽니다.
+
+    Returns:
+        dict: {"int8_only": 재정렬 없이, "reranked": float32 재정렬 후, "queries": 질의 수,
+               "exact_ms": 전수 검색 평균 시간, "int8_ms": int8 검색 + 재정렬 평균 시간}
+    """
+    movie_ids = np.asarray(store.movie_ids)
+    if query_vectors is None:
+        rows, query_vectors = _holdout_queries(store, queries, seed)
+        k = min(k, len(store) - 1)
+    else:
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).reshape(-1, store.titles.shape[1])
+        rows = [None] * len(query_vectors)
+        k = min(k, len(store))
+    if not len(query_vectors) or k <= 0:
+        return {"int8_only": None, "reranked": None, "queries": 0, "exact_ms": None, "int8_ms": None}
+
+    approx_hits = reranked_hits = 0
+    exact_seconds = int8_seconds = 0.0
+    for row, query in zip(rows, query_vectors):
+        own_id = None if row is None else int(movie_ids[row])
+        exclude_ids = () if own_id is None else (own_id,)
+        started = time.perf_counter()
+        exact_scores = keyword_scores(query, store)
+        exact_seconds += time.perf_counter() - started
+        exact = {rec["movie_id"] for rec in top_k(movie_ids, exact_scores, k, exclude_ids)}
+        approx_scores = vectors.scores(query)
+        if row is not None:
+            approx_scores[row] = -np.inf
+        approx_rows = np.argpartition(-approx_scores, k - 1)[:k]
+        approx_hits += len(exact & set(movie_ids[approx_rows].tolist()))
+        started = time.perf_counter()
+        reranked = quantized_search(query, store, vectors, k + 1, rerank)
+        int8_seconds += time.perf_counter() - started
+        reranked = [rec for rec in reranked if rec["movie_id"] != own_id][:k]
+        reranked_hits += len(exact & {rec["movie_id"] for rec in reranked})
+    total = len(query_vectors) * k
+    return {
+        "int8_only": approx_hits / total, "reranked": reranked_hits / total, "queries": len(query_vectors),
+        "exact_ms": round(exact_seconds / len(query_vectors) * 1000, 3),
+        "int8_ms": round(int8_seconds / len(query_vectors) * 1000, 3),
+    }
+
+
+def ann_recall(store, index, queries=100, k=10, nprobe=None, seed=0, query_vectors=None):
+    """
+    전수 검색 top-k 대비 IVF 근사 검색의 재현율을 잽니다.
+
+    query_vectors(실제 키워드 임베딩)를 주면 index 로 그대로 잽니다. 주지 않으면 저장소에서 질의로 쓸 영화를 떼어 내고,
+    나머지 영화만으로 index 와 같은 설정(클러스터 수, 반복 횟수)의 인덱스를 따로 학습해 잽니다.
+    (인덱스에 들어 있는 벡터를 질의로 쓰면 자기 자신과 자기 클러스터가 항상 맞아 재현율이 부풀려지므로)
+
+    Returns:
+        dict: {"recall": 재현율, "queries": 질의 수}
+    """
+    nprobe = nprobe or index.nprobe
+    movie_ids = np.asarray(store.movie_ids)
+    if query_vectors is None:
+        rows, query_vectors = _holdout_queries(store, queries, seed)
+        keep = np.ones(len(store), dtype=bool)
+        keep[rows] = False
+        search_ids = movie_ids[keep]
+        search_vectors = combined_vectors(store.titles[keep], store.overviews[keep])
+        index = IVFIndex.train(
+            search_ids, search_vectors, nlist=index.nlist, nprobe=nprobe,
+            iterations=index.meta.get('iterations', 10), seed=seed,
+        )
+    else:
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).reshape(-1, store.titles.shape[1])
+        search_ids = movie_ids
+        search_vectors = combined_vectors(store.titles, store.overviews)
+    k = min(k, len(search_ids))
+    if not len(query_vectors) or k <= 0:
+        return {"recall": None, "queries": 0}
+
+    hits = 0
+    for query in query_vectors:
+        exact = {rec["movie_id"] for rec in top_k(search_ids, search_vectors @ query, k)}
+        approx_ids, _ = index.search(query, k, nprobe=nprobe)
+        hits += len(exact & set(approx_ids.tolist()))
+    return {"recall": hits / (len(query_vectors) * k), "queries": len(query_vectors)}
+
+
+def keyword_vector(keyword, model=None):
+    """
+    키워드의 정규화된 임베딩 벡터 (같은 키워드는 캐시에서 바로 반환해 모델 추론을 생략)
+    model 을 주지 않으면 공용 묶음 처리 워커를 거쳐, 동시에 들어온 키워드들과 한 번에 임베딩합니다.
+    """
+    key = (settings.SENTENCE_TRANSFORMER_MODEL, normalize_keyword(keyword))
+
+    def encode():
+        if model is None and KEYWORD_ENCODE_BATCHING:
+            return keyword_encoder.encode(key[1])
+        return normalize_rows((model or get_sentence_model()).encode(key[1]))
+
+    return keyword_vector_cache.get_or_set(key, encode)
+
+
+def keyword_recommendations(keyword, model=None, k=10, nprobe=None):
+    """
+    키워드 기반 영화 추천
+
+    - 영화 임베딩은 build_movie_embeddings 로 미리 만든 메모리 맵 저장소에서 읽습니다.
+    - 저장소가 아직 없으면 요청 안에서 카탈로그 전체를 임베딩하지 않고 빈 목록을 반환합니다.
+      (build_movie_embeddings 로 미리 만들어 두면 모든 워커가 같은 파일을 공유)
+    - 영화 수가 많고 저장소와 같은 시점의 IVF 인덱스가 있으면 근사 검색(nprobe 개 클러스터만 탐색)을 사용합니다.
+    - MOVIE_EMBEDDING_QUANTIZED 가 켜져 있으면 전수 검색 대신 int8 근사 점수 + float32 재정렬을 사용합니다.
+    - 정규화한 키워드별로 질의 벡터와 최종 결과를 TTL LRU 캐시에 두어, 반복 질의는 모델을 호출하지 않습니다.
+      결과 캐시 키에 저장소/인덱스 생성 시각이 들어가므로 다시 만들면 이전 결과는 조회되지 않습니다.
+    - model 을 주지 않으면 지연 로딩되는 공용 모델을 사용합니다.
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...]
+    """
+    store = get_embedding_store()
+    if store is None or not len(store):
+        logger.warning("임베딩 저장소가 없어 키워드 추천을 건너뜁니다. build_movie_embeddings 를 먼저 실행하세요.")
+        return []
+
+    nprobe = nprobe or ANN_NPROBE
+    backend, searcher = _search_backend(store)
+    cache_key = (
+        normalize_keyword(keyword), k, nprobe,
+        store.meta['built_at'], backend, searcher.meta.get('saved_at') if searcher is not None else None,
+    )
+    cached = keyword_result_cache.get(cache_key)
+    if cached is not None:
+        return [dict(rec) for rec in cached]
+
+    results = search_store(keyword_vector(keyword, model), store, k, nprobe=nprobe)
+    keyword_result_cache.set(cache_key, results)
+    return [dict(rec) for rec in results]
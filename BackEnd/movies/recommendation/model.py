@@ -0,0 +1,68 @@
+# movies/recommendation/model.py
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_model = None
+_model_lock = threading.Lock()
+_loaded_seconds = None
+
+
+def get_sentence_model():
+    """
+    문장 임베딩 모델(SentenceTransformer)을 처음 필요할 때 한 번만 로드해 반환합니다.
+
+    - 모듈 import 시점에 모델을 만들지 않으므로 manage.py 명령, 테스트, 워커 부팅이 모델 로딩을 기다리지 않습니다.
+    - 여러 스레드가 동시에 처음 호출해도 모델은 한 번만 로드됩니다.
+    """
+    global _model, _loaded_seconds
+    if _model is not None:
+        return _model
+    with _model_lock:
+        if _model is None:
+            # sentence_transformers(및 torch) import 자체도 수 초가 걸리므로 실제로 필요할 때만 import
+            from sentence_transformers import SentenceTransformer
+
+            started = time.perf_counter()
+            model = SentenceTransformer(settings.SENTENCE_TRANSFORMER_MODEL)
+            _loaded_seconds = time.perf_counter() - started
+            _model = model
+            logger.info("문장 임베딩 모델 로드 완료: %s (%.1f초)", settings.SENTENCE_TRANSFORMER_MODEL, _loaded_seconds)
+    return _model
+
+
+def is_model_ready():
+    """
+    모델이 이미 로드되어 바로 사용할 수 있는지 여부 (로드를 유발하지 않음)
+    """
+    return _model is not None
+
+
+def model_status():
+    """
+    모델 준비 상태 정보 (상태 확인 API, 로그 등에 사용)
+    """
+    return {
+        'model': settings.SENTENCE_TRANSFORMER_MODEL,
+        'ready': is_model_ready(),
+        'load_seconds': round(_loaded_seconds, 3) if _loaded_seconds is not None else None,
+    }
+
+
+def warmup_sentence_model():
+    """
+    모델을 로드하고 짧은 문장을 한 번 임베딩해 첫 요청의 지연을 없앱니다.
+    gunicorn 의 post_worker_init 훅(워커가 fork 되고 앱을 로드한 직후)이나 warmup_recommender 명령에서 호출합니다.
+
+        # gunicorn.conf.py
+        def post_worker_init(worker):
+            from movies.recommendation import warmup_sentence_model
+            warmup_sentence_model()
+    """
+    model = get_sentence_model()
+    model.encode("warmup")
+    return model
@@ -0,0 +1,125 @@
+# movies/recommendation/personalized.py
+import numpy as np
+
+from movies.models import Movie
+from movies.recommendation.catalog import Catalog, get_catalog
+from movies.recommendation.taste import get_taste_profile, taste_vector
+
+# 항목별 가중치 (합계 1)
+PERSONALIZED_WEIGHTS = {
+    'genre': 0.3,  # 선호 장르 일치 비율
+    'liked_movies': 0.2,  # 좋아요한 영화 중 장르가 겹치는 영화 비율
+    'actor': 0.2,  # 즐겨찾기 배우 출연 비율
+    'director': 0.2,  # 즐겨찾기 감독 연출 비율
+    'friend': 0.1,  # 팔로우한 사용자가 좋아요한 영화 여부
+}
+
+
+class UserPreferences:
+    """
+    추천 계산에 쓰는 사용자 선호 정보
+
+    - 선호 장르/배우/감독, 좋아요 목록, 좋아요 임베딩 평균(taste_vector)은 증분 갱신되는 취향 프로필 한 행에서 읽습니다.
+    - 팔로우한 사용자들의 좋아요는 팔로워 모두에게 쓰기를 퍼뜨리지 않도록 요청 시 한 번의 쿼리로 조회합니다.
+    """
+
+    def __init__(self, user):
+        profile = get_taste_profile(user)
+        self.favorite_genre_ids = set(profile.favorite_genre_ids)
+        self.liked_movie_ids = list(profile.liked_movie_ids)
+        self.favorite_actor_ids = set(profile.favorite_actor_ids)
+        self.favorite_director_ids = set(profile.favorite_director_ids)
+        self.liked_genre_counts = {int(genre_id): count for genre_id, count in profile.liked_genre_counts.items()}
+        self.taste_vector = taste_vector(profile)
+        self.friend_movie_ids = set(
+            Movie.objects.filter(liked_movies_by_users__in=user.following.all()).values_list('id', flat=True)
+        )
+
+
+def _overlap_ratio(matrix, column_ids, selected_ids):
+    """
+    영화마다 selected_ids 중 몇 개를 포함하는지의 비율 (selected_ids 가 비어 있으면 0)
+    카탈로그에 열이 없는 ID 도 분모에 넣어, 선택한 항목 중 카탈로그에 없는 것이 있으면 비율이 그만큼 낮아집니다.
+    """
+    columns = Catalog.columns(column_ids, selected_ids)
+    if not len(columns):
+        return np.zeros(matrix.shape[0], dtype=np.float64)
+    return np.asarray(matrix[:, columns].sum(axis=1), dtype=np.float64).ravel() / len(selected_ids)
+
+
+def personalized_scores(user, catalog=None, rows=None, preferences=None):
+    """
+    개인화 점수 벡터를 행렬 연산으로 계산합니다.
+
+    Args:
+        rows: 점수를 낼 카탈로그 행 번호 배열 (None 이면 전체 카탈로그). 후보 영화만 다시 점수 매길 때 사용합니다.
+        preferences: 이미 조회한 UserPreferences (없으면 조회)
+
+    Returns:
+        (catalog, scores): scores[i] 는 rows[i] (rows 가 None 이면 catalog.movie_ids[i]) 영화의 점수
+    """
+    catalog = catalog or get_catalog()
+    rows = np.arange(len(catalog)) if rows is None else np.asarray(rows, dtype=np.int64)
+    scores = np.zeros(len(rows), dtype=np.float64)
+    if not len(rows):
+        return catalog, scores
+    preferences = preferences or UserPreferences(user)
+
+    genres = catalog.genres[rows]
+    scores += PERSONALIZED_WEIGHTS['genre'] * _overlap_ratio(genres, catalog.genre_ids, preferences.favorite_genre_ids)
+    scores += PERSONALIZED_WEIGHTS['actor'] * _overlap_ratio(
+        catalog.actors[rows], catalog.actor_ids, preferences.favorite_actor_ids
+    )
+    scores += PERSONALIZED_WEIGHTS['director'] * _overlap_ratio(
+        catalog.directors[rows], catalog.director_ids, preferences.favorite_director_ids
+    )
+
+    # 좋아요한 영화 중 장르가 하나라도 겹치는 영화 수: (영화 x 장르) @ (장르 x 좋아요 영화) 의 행별 0이 아닌 개수
+    if preferences.liked_movie_ids:
+        liked_rows = catalog.rows(preferences.liked_movie_ids)
+        shared = genres @ catalog.genres[liked_rows].T
+        scores += PERSONALIZED_WEIGHTS['liked_movies'] * (
+            shared.getnnz(axis=1) / len(preferences.liked_movie_ids)
+        )
+
+    if preferences.friend_movie_ids:
+        scores[np.isin(rows, catalog.rows(preferences.friend_movie_ids))] += PERSONALIZED_WEIGHTS['friend']
+
+    # 같은 값이 항목 합산 순서에 따라 마지막 자리만 달라지지 않도록 반올림 (동점은 영화 ID 순으로 정렬됨)
+    np.round(scores, 12, out=scores)
+    return catalog, scores
+
+
+def top_k(movie_ids, scores, k, exclude_ids=()):
+    """
+    argpartition 으로 점수 상위 k개를 고른 뒤 (점수 내림차순, 영화 ID 오름차순) 으로 정렬합니다.
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...]
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if exclude_ids:
+        scores = scores.copy()
+        scores[np.isin(movie_ids, list(exclude_ids))] = -np.inf
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k <= 0:
+        return []
+    # k번째 점수와 동점인 영화까지 후보로 포함해 정렬 결과가 항상 같도록 함
+    threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((movie_ids[candidates], -scores[candidates]))[:k]
+    return [
+        {"movie_id": int(movie_ids[index]), "score": float(scores[index])}
+        for index in candidates[order]
+    ]
+
+
+def personalized_recommendations(user, k=10):
+    """
+    사용자 개인화 추천 리스트 생성
+
+    - 영화 x 장르/배우/감독 희소 행렬과 사용자 선호 벡터로 전체 카탈로그 점수를 한 번에 계산합니다.
+    - 점수가 같으면 영화 ID 가 작은 순서로 정렬합니다.
+    """
+    catalog, scores = personalized_scores(user)
+    return top_k(catalog.movie_ids, scores, k)
@@ -0,0 +1,146 @@
+# movies/recommendation/pipeline.py
+import time
+
+import numpy as np
+
+from movies.recommendation.catalog import get_catalog
+from movies.recommendation.embeddings import get_embedding_store
+from movies.recommendation.keyword import search_store
+from movies.recommendation.personalized import UserPreferences, personalized_scores
+
+# 생성기마다 돌려줄 최대 후보 수
+CANDIDATE_LIMIT = 300
+
+
+class RecommendationContext:
+    """
+    한 번의 추천 요청에서 생성기와 재정렬 단계가 함께 쓰는 사용자 정보
+
+    - preferences: UserPreferences (선호 장르/배우/감독, 좋아요, 좋아요 임베딩 평균, 친구 좋아요)
+    - excluded_ids: 이미 좋아요/시청한 영화 ID 집합 (후보에서 제외)
+    """
+
+    def __init__(self, user, catalog=None):
+        self.user = user
+        self.catalog = catalog or get_catalog()
+        self.preferences = UserPreferences(user)
+        self.excluded_ids = set(self.preferences.liked_movie_ids)
+        self.excluded_ids.update(user.watched_movies.values_list('id', flat=True))
+
+
+# 후보 생성기: context, limit -> 카탈로그 행 번호 배열
+
+def genre_candidates(context, limit):
+    """
+    선호 장르 영화 중 인기순 상위
+    """
+    return context.catalog.top_rows_for('genres', context.preferences.favorite_genre_ids, limit)
+
+
+def cast_candidates(context, limit):
+    """
+    즐겨찾기 배우/감독이 참여한 영화 중 인기순 상위
+    """
+    actor_rows = context.catalog.top_rows_for('actors', context.preferences.favorite_actor_ids, limit)
+    director_rows = context.catalog.top_rows_for('directors', context.preferences.favorite_director_ids, limit)
+    return np.union1d(actor_rows, director_rows)
+
+
+def friend_candidates(context, limit):
+    """
+    팔로우한 사용자들이 좋아요한 영화 중 인기순 상위
+    """
+    rows = context.catalog.rows(context.preferences.friend_movie_ids)
+    return rows[np.argsort(context.catalog.popularity_rank[rows])[:limit]]
+
+
+def embedding_candidates(context, limit):
+    """
+    취향 프로필의 좋아요 임베딩 평균과 가까운 영화 (키워드 추천과 같은 검색 방식 사용)
+    """
+    store = get_embedding_store()
+    query = context.preferences.taste_vector
+    if store is None or not len(store) or query is None:
+        return np.zeros(0, dtype=np.int64)
+
+    movie_ids = [rec["movie_id"] for rec in search_store(query, store, limit)]
+    return context.catalog.rows(movie_ids)
+
+
+def popularity_candidates(context, limit):
+    """
+    전체 인기순 상위 (다른 생성기 후보가 부족한 신규 사용자 대비)
+    """
+    return context.catalog.popular_rows(limit)
+
+
+CANDIDATE_GENERATORS = {
+    'genre': genre_candidates,
+    'cast': cast_candidates,
+    'friends': friend_candidates,
+    'embedding': embedding_candidates,
+    'popularity': popularity_candidates,
+}
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def two_stage_recommendations(user, k=10, generators=None, limit=CANDIDATE_LIMIT, catalog=None):
+    """
+    2단계 추천: 후보 생성 -> 재정렬
+
+    1. 생성기마다 카탈로그 행 번호 limit 개 이하를 저렴하게 뽑습니다. (역색인 / 인기순 / 근사 검색)
+    2. 후보의 합집합에서 이미 좋아요/시청한 영화를 집합 조회로 제외합니다.
+    3. 남은 후보만 개인화 점수(personalized_scores 와 같은 식)로 다시 점수 매겨 상위 k개를 고릅니다.
+
+    요청당 비용은 카탈로그 크기가 아니라 후보 수에 비례합니다.
+
+    Args:
+        generators: 사용할 생성기 이름 목록 (기본값: 전부)
+
+    Returns:
+        dict: {
+            "items": [{"movie_id", "score", "sources": [생성기 이름, ...]}, ...],
+            "candidate_count": 재정렬한 후보 수,
+            "timings": {"context_ms", "candidates": {이름: {"ms", "count"}}, "exclude_ms", "rerank_ms", "total_ms"},
+        }
+    """
+    total_started = time.perf_counter()
+    timings = {'candidates': {}}
+
+    started = time.perf_counter()
+    context = RecommendationContext(user, catalog)
+    timings['context_ms'] = _elapsed_ms(started)
+
+    sources = {}
+    for name in generators or CANDIDATE_GENERATORS:
+        started = time.perf_counter()
+        rows = CANDIDATE_GENERATORS[name](context, limit)
+        for row in rows.tolist():
+            sources.setdefault(row, []).append(name)
+        timings['candidates'][name] = {'ms': _elapsed_ms(started), 'count': int(len(rows))}
+
+    started = time.perf_counter()
+    movie_ids = context.catalog.movie_ids
+    rows = np.array(
+        [row for row in sources if int(movie_ids[row]) not in context.excluded_ids], dtype=np.int64,
+    )
+    timings['exclude_ms'] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    _, scores = personalized_scores(user, context.catalog, rows=rows, preferences=context.preferences)
+    items = []
+    if len(rows):
+        count = min(k, len(rows))
+        # 점수 내림차순, 동점은 영화 ID 오름차순
+        top = np.lexsort((movie_ids[rows], -scores))[:count]
+        items = [
+            {"movie_id": int(movie_ids[rows[index]]), "score": float(scores[index]), "sources": sources[int(rows[index])]}
+            for index in top
+        ]
+    timings['rerank_ms'] = _elapsed_ms(started)
+    timings['total_ms'] = _elapsed_ms(total_started)
+
+    return {"items": items, "candidate_count": int(len(rows)), "timings": timings}
@@ -0,0 +1,320 @@
+# movies/recommendation/precompute.py
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import F, Q
+from django.utils import timezone
+from scipy import sparse
+
+from movies.models import PrecomputedRecommendations
+from movies.recommendation.catalog import get_catalog
+from movies.recommendation.personalized import PERSONALIZED_WEIGHTS, top_k
+
+# 사용자마다 저장할 추천 수
+PRECOMPUTE_TOP_K = getattr(settings, 'RECOMMENDATION_PRECOMPUTE_TOP_K', 50)
+# 한 번의 행렬 곱으로 점수를 낼 사용자 수 (사용자 수 x 영화 수 float64 배열 하나를 만듦)
+USER_CHUNK_SIZE = 64
+
+
+def _add_sparse(dense, matrix):
+    """
+    희소 행렬의 0이 아닌 값만 같은 모양의 밀집 배열에 더합니다.
+    """
+    matrix = matrix.tocoo()
+    matrix.sum_duplicates()
+    dense[matrix.row, matrix.col] += matrix.data
+
+
+class BatchScorer:
+    """
+    여러 사용자의 카탈로그 전체 개인화 점수를 묶음 단위 행렬 곱으로 계산합니다. (personalized_scores 와 같은 식)
+
+    - 장르/배우/감독: (사용자 x 열) 선호 행렬을 선호 개수로 나눈 뒤 (열 x 영화) 행렬과 곱합니다.
+    - 좋아요: "장르가 하나라도 겹치는 좋아요 영화 수"를 영화 x 영화 행렬 대신 장르 조합(패턴) 단위로 셉니다.
+      (패턴끼리 장르가 겹치는지를 나타낸 패턴 x 패턴 행렬) x (사용자별 패턴별 좋아요 수) 를 영화의 패턴으로 펼칩니다.
+    - 친구 좋아요, 제외(좋아요/시청) 영화는 희소 행렬로 받아 더하거나 -inf 로 가립니다.
+
+    DB 를 쓰지 않으므로 프로세스 풀 워커에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, catalog):
+        self.movie_ids = catalog.movie_ids
+        self.row_of = catalog.row_of
+        self.genre_col = {genre_id: col for col, genre_id in enumerate(catalog.genre_ids.tolist())}
+        self.actor_col = {actor_id: col for col, actor_id in enumerate(catalog.actor_ids.tolist())}
+        self.director_col = {director_id: col for col, director_id in enumerate(catalog.director_ids.tolist())}
+        self.genres_t = catalog.genres.T.tocsr()
+        self.actors_t = catalog.actors.T.tocsr()
+        self.directors_t = catalog.directors.T.tocsr()
+
+        genres = catalog.genres.tocsr()
+        genres.sort_indices()
+        pattern_index, pattern_rows, pattern_cols = {}, [], []
+        self.pattern_of = np.empty(len(self.movie_ids), dtype=np.int64)
+        for row in range(len(self.movie_ids)):
+            key = tuple(genres.indices[genres.indptr[row]:genres.indptr[row + 1]].tolist())
+            if key not in pattern_index:
+                pattern_rows += [len(pattern_index)] * len(key)
+                pattern_cols += key
+                pattern_index[key] = len(pattern_index)
+            self.pattern_of[row] = pattern_index[key]
+        patterns = sparse.csr_matrix(
+            (np.ones(len(pattern_rows)), (pattern_rows, pattern_cols)), shape=(len(pattern_index), genres.shape[1]),
+        )
+        self.pattern_shares = ((patterns @ patterns.T).toarray() > 0).astype(np.float64)
+        self.movie_patterns = sparse.csr_matrix(
+            (np.ones(len(self.movie_ids)), (np.arange(len(self.movie_ids)), self.pattern_of)),
+            shape=(len(self.movie_ids), len(pattern_index)),
+        )
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def scores(self, chunk):
+        """
+        (사용자 수, 영화 수) 점수 배열 (제외 영화는 -inf)
+        """
+        scores = np.zeros((len(chunk.user_ids), len(self)), dtype=np.float64)
+        for name, preferences, transposed in (
+            ('genre', chunk.genres, self.genres_t),
+            ('actor', chunk.actors, self.actors_t),
+            ('director', chunk.directors, self.directors_t),
+        ):
+            counts = np.diff(preferences.indptr)
+            weights = np.divide(
+                PERSONALIZED_WEIGHTS[name], counts, out=np.zeros(len(counts), dtype=np.float64), where=counts > 0,
+            )
+            _add_sparse(scores, sparse.diags(weights) @ preferences @ transposed)
+
+        liked_counts = np.asarray(chunk.liked_counts, dtype=np.float64)
+        if liked_counts.any():
+            shared = (chunk.liked @ self.movie_patterns) @ self.pattern_shares
+            weights = np.divide(
+                PERSONALIZED_WEIGHTS['liked_movies'], liked_counts,
+                out=np.zeros(len(liked_counts), dtype=np.float64), where=liked_counts > 0,
+            )
+            scores += np.asarray(shared)[:, self.pattern_of] * weights[:, None]
+
+        _add_sparse(scores, chunk.friends * PERSONALIZED_WEIGHTS['friend'])
+        # personalized_scores 와 같이 반올림해 합산 순서 차이로 동점 순서가 달라지지 않도록 함
+        np.round(scores, 12, out=scores)
+        excluded = chunk.excluded.tocoo()
+        scores[excluded.row, excluded.col] = -np.inf
+        return scores
+
+    def top_k(self, chunk, k):
+        """
+        사용자별 상위 k개: [(사용자 ID, [{"movie_id", "score"}, ...]), ...]
+        """
+        scores = self.scores(chunk)
+        return [(user_id, top_k(self.movie_ids, scores[index], k)) for index, user_id in enumerate(chunk.user_ids)]
+
+
+class UserChunk:
+    """
+    점수 계산에 필요한 사용자 묶음의 선호 정보 (모두 사용자 순서 행의 0/1 희소 행렬)
+
+    - genres / actors / directors: (사용자 수, 카탈로그 열 수) 선호 장르/배우/감독
+    - liked / friends / excluded: (사용자 수, 영화 수) 좋아요 / 팔로우한 사용자의 좋아요 / 좋아요·시청 영화
+    - liked_counts: 사용자별 좋아요 수
+    """
+
+    def __init__(self, user_ids, scorer):
+        User = get_user_model()
+        self.user_ids = list(user_ids)
+        user_index = {user_id: index for index, user_id in enumerate(self.user_ids)}
+        movies = len(scorer)
+
+        def incidence(pairs, col_of, width):
+            pairs = [(user_index[user_id], col_of[target_id]) for user_id, target_id in pairs if target_id in col_of]
+            matrix = sparse.csr_matrix(
+                (np.ones(len(pairs)), ([row for row, _ in pairs], [col for _, col in pairs])),
+                shape=(len(self.user_ids), width),
+            )
+            matrix.data[:] = 1  # 중복 쌍이 합쳐져 1보다 커지는 것을 방지
+            return matrix
+
+        def user_pairs(field, target):
+            return getattr(User, field).through.objects.filter(
+                customuser_id__in=self.user_ids,
+            ).values_list('customuser_id', target)
+
+        self.genres = incidence(user_pairs('favorite_genres', 'genre_id'), scorer.genre_col, len(scorer.genre_col))
+        self.actors = incidence(user_pairs('favorite_actors', 'actor_id'), scorer.actor_col, len(scorer.actor_col))
+        self.directors = incidence(
+            user_pairs('favorite_directors', 'director_id'), scorer.director_col, len(scorer.director_col),
+        )
+        liked_pairs = list(user_pairs('liked_movies', 'movie_id'))
+        self.liked = incidence(liked_pairs, scorer.row_of, movies)
+        self.liked_counts = np.bincount([user_index[user_id] for user_id, _ in liked_pairs], minlength=len(self.user_ids))
+        self.excluded = (self.liked + incidence(user_pairs('watched_movies', 'movie_id'), scorer.row_of, movies)).tocsr()
+
+        # 팔로우한 사용자가 좋아요한 영화: (사용자 x 팔로우 대상) @ (팔로우 대상 x 영화)
+        follows = list(User.following.through.objects.filter(
+            from_customuser_id__in=self.user_ids,
+        ).values_list('from_customuser_id', 'to_customuser_id'))
+        followee_ids = sorted({followee_id for _, followee_id in follows})
+        followee_index = {followee_id: index for index, followee_id in enumerate(followee_ids)}
+        followee_likes = User.liked_movies.through.objects.filter(
+            customuser_id__in=followee_ids,
+        ).values_list('customuser_id', 'movie_id')
+        followee_likes = [
+            (followee_index[followee_id], scorer.row_of[movie_id])
+            for followee_id, movie_id in followee_likes if movie_id in scorer.row_of
+        ]
+        following = incidence(follows, followee_index, len(followee_ids))
+        likes = sparse.csr_matrix(
+            (np.ones(len(followee_likes)), ([row for row, _ in followee_likes], [col for _, col in followee_likes])),
+            shape=(len(followee_ids), movies),
+        )
+        self.friends = following @ likes
+        self.friends.data[:] = 1
+
+
+# 프로세스 풀 워커에서 쓰는 점수 계산기 (initializer 로 한 번만 전달)
+_worker_scorer = None
+
+
+def _init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _score_chunk(chunk, k):
+    return _worker_scorer.top_k(chunk, k)
+
+
+def _save(results, computed_at):
+    PrecomputedRecommendations.objects.bulk_create(
+        [
+            PrecomputedRecommendations(
+                user_id=user_id,
+                movie_ids=[rec["movie_id"] for rec in recommendations],
+                scores=[round(rec["score"], 6) for rec in recommendations],
+                computed_at=computed_at,
+            )
+            for user_id, recommendations in results
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['movie_ids', 'scores', 'computed_at'],
+    )
+
+
+def _active_users():
+    # 탈퇴(소프트 삭제)하지 않은 사용자
+    return get_user_model().objects.filter(deleted_at__isnull=True)
+
+
+def mark_recommendations_stale(user_ids, include_followers=False):
+    """
+    사용자들의 미리 계산한 목록을 만료시킵니다. (좋아요/시청/선호/팔로우가 바뀔 때 시그널에서 호출)
+    include_followers 면 그 사용자들을 팔로우하는 사용자의 목록도 만료시킵니다. (친구 좋아요 점수가 바뀜)
+
+    목록이 없는 사용자는 어차피 즉석 추천을 받으므로 행을 만들지 않습니다.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    targets = Q(user_id__in=user_ids)
+    if include_followers:
+        targets |= Q(user_id__in=get_user_model().following.through.objects.filter(
+            to_customuser_id__in=user_ids,
+        ).values('from_customuser_id'))
+    PrecomputedRecommendations.objects.filter(targets).update(preferences_changed_at=timezone.now())
+
+
+def _is_stale():
+    return Q(preferences_changed_at__gt=F('computed_at'))
+
+
+def stale_user_ids():
+    """
+    미리 계산한 목록이 없거나, 계산한 뒤 좋아요/시청/선호/팔로우가 바뀐 활성 사용자 ID
+    """
+    users = _active_users()
+    missing = users.filter(precomputed_recommendations__isnull=True).values_list('id', flat=True)
+    changed = PrecomputedRecommendations.objects.filter(
+        _is_stale(), user__in=users,
+    ).values_list('user_id', flat=True)
+    return sorted({*missing, *changed})
+
+
+def precompute_recommendations(user_ids=None, k=PRECOMPUTE_TOP_K, chunk_size=USER_CHUNK_SIZE, workers=1,
+                               stale_only=False, catalog=None, callback=None):
+    """
+    사용자별 개인화 추천 상위 k개(좋아요/시청한 영화 제외)를 카탈로그 전체 점수로 계산해 PrecomputedRecommendations 에 저장합니다.
+
+    - 사용자를 chunk_size 명씩 묶어 DB 에서 선호 정보를 읽고, 점수 계산은 workers 개 프로세스에 나눠 맡깁니다.
+    - computed_at 은 데이터를 읽기 전 시각이므로, 계산 중에 바뀐 좋아요도 다음 stale_only 실행에서 다시 계산됩니다.
+
+    Args:
+        user_ids: 계산할 사용자 ID 목록 (기본값: 활성 사용자 전체, stale_only 이면 만료된 사용자만)
+        callback: 묶음 하나를 저장할 때마다 callback(저장한 사용자 수, 전체 사용자 수) 호출
+
+    Returns:
+        int: 저장한 사용자 수
+    """
+    computed_at = timezone.now()
+    catalog = catalog or get_catalog(refresh=True)
+    scorer = BatchScorer(catalog)
+    if user_ids is None:
+        user_ids = (
+            stale_user_ids() if stale_only
+            else list(_active_users().order_by('id').values_list('id', flat=True))
+        )
+    user_ids = list(user_ids)
+    batches = [user_ids[start:start + chunk_size] for start in range(0, len(user_ids), chunk_size)]
+
+    saved = 0
+
+    def save(results):
+        nonlocal saved
+        _save(results, computed_at)
+        saved += len(results)
+        if callback:
+            callback(saved, len(user_ids))
+
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            save(scorer.top_k(UserChunk(batch, scorer), k))
+        return saved
+
+    # fork 된 워커가 부모의 DB 연결을 물려받지 않도록 미리 닫아 둠 (부모는 다음 쿼리에서 다시 연결)
+    # 트랜잭션 안에서는 닫을 수 없으며, 워커는 DB 를 쓰지 않고 os._exit 로 끝나므로 물려받은 연결을 건드리지 않음
+    if not any(connection.in_atomic_block for connection in connections.all()):
+        connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(scorer,)) as executor:
+        pending = deque()
+        for batch in batches:
+            # DB 읽기(부모)와 점수 계산(워커)을 겹치되, 메모리를 위해 진행 중인 묶음 수를 제한
+            pending.append(executor.submit(_score_chunk, UserChunk(batch, scorer), k))
+            if len(pending) > workers * 2:
+                save(pending.popleft().result())
+        while pending:
+            save(pending.popleft().result())
+    return saved
+
+
+def get_precomputed_recommendations(user, k=10):
+    """
+    미리 계산한 추천 목록 상위 k개 (한 번의 인덱스 조회)
+    목록이 없거나 계산한 뒤 좋아요/시청/선호/팔로우가 바뀌었으면 None 을 반환하므로 호출 측에서 즉석 추천으로 대신합니다.
+
+    Returns:
+        list[dict] | None: [{"movie_id": 영화 ID, "score": 점수}, ...]
+    """
+    row = PrecomputedRecommendations.objects.filter(user_id=user.pk).exclude(
+        _is_stale(),
+    ).values_list('movie_ids', 'scores').first()
+    if row is None:
+        return None
+    movie_ids, scores = row
+    return [{"movie_id": movie_id, "score": score} for movie_id, score in zip(movie_ids[:k], scores[:k])]
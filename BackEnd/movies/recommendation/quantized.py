@@ -0,0 +1,151 @@
+# movies/recommendation/quantized.py
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from movies.recommendation.embeddings import get_embedding_dir
+
+# 저장 파일 이름
+CODES_FILE = 'q8_codes.npy'
+SCALES_FILE = 'q8_scales.npy'
+IDS_FILE = 'q8_ids.npy'
+META_FILE = 'q8_meta.json'
+
+# 한 번에 float32 로 펼쳐 계산할 행 수 (CPU 캐시에 들어갈 정도)
+SCORE_CHUNK_ROWS = 4096
+
+
+def quantize_rows(vectors):
+    """
+    행마다 스케일을 따로 두는 대칭 int8 스칼라 양자화: vector ≈ codes * scale (scale = max|v| / 127)
+
+    Returns:
+        (codes, scales): (N, D) int8 배열, (N,) float32 배열
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127 if len(vectors) else np.zeros(0, dtype=np.float32)
+    scales = scales.astype(np.float32)
+    safe = np.where(scales > 0, scales, 1)[:, None]
+    codes = np.clip(np.rint(vectors / safe), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+class QuantizedVectors:
+    """
+    int8 으로 양자화한 벡터 묶음 (float32 대비 약 1/4 메모리, 행마다 float32 스케일 1개)
+
+    - 점수: 질의는 양자화하지 않고, 묶음 단위로 int8 코드를 float32 로 펼쳐 BLAS 행렬-벡터 곱을 한 뒤 행 스케일을 곱합니다.
+      (정수 내적이 아니라 int8 코드 x float32 질의의 근사 점수)
+      NumPy 에는 int8 행렬 곱 커널이 없어 int32 누적(np.matmul(..., dtype=np.int32))은 BLAS 를 쓰지 못하고 더 느립니다.
+      100,000 x 384 기준 측정(1 CPU): float32 행렬-벡터 곱 19.5ms, 이 방식 24.4ms, int32 누적 68~95ms.
+    - 이득은 속도가 아니라 메모리입니다. 제목/설명 float32 두 행렬(약 307MB) 대신 int8 가중합 한 행렬(약 38MB)만 훑으며,
+      제목/설명 두 번의 float32 전수 검색(35.3ms) 대신 int8 점수 + 상위 200개 재정렬로 22.9ms 였습니다.
+      (build_quantized_embeddings 가 실제 저장소로 잰 시간을 출력)
+    - 대략적인 점수로 상위 후보를 고른 뒤, 호출 측에서 원래 float32 벡터로 다시 점수를 매깁니다.
+    """
+
+    def __init__(self, ids, codes, scales, meta=None):
+        self.ids = ids
+        self.codes = codes
+        self.scales = scales
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_vectors(cls, ids, vectors, meta=None):
+        codes, scales = quantize_rows(vectors)
+        return cls(np.asarray(ids, dtype=np.int64), codes, scales, meta)
+
+    def scores(self, query):
+        """
+        질의 벡터와 모든 행의 근사 내적 (int8 코드를 묶음마다 float32 로 펼쳐 계산)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        result = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), SCORE_CHUNK_ROWS):
+            stop = start + SCORE_CHUNK_ROWS
+            result[start:stop] = self.codes[start:stop].astype(np.float32) @ query
+        result *= self.scales
+        return result
+
+    def candidates(self, query, count):
+        """
+        근사 점수 상위 count 개 행 번호 (정렬하지 않음)
+        """
+        scores = self.scores(query)
+        count = min(count, len(scores))
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.argpartition(-scores, count - 1)[:count]
+
+    # 저장 / 로드
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (
+            (IDS_FILE, np.asarray(self.ids, dtype=np.int64)),
+            (CODES_FILE, np.asarray(self.codes, dtype=np.int8)),
+            (SCALES_FILE, np.asarray(self.scales, dtype=np.float32)),
+        ):
+            path = os.path.join(directory, name)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        meta = dict(self.meta, count=len(self), saved_at=time.time())
+        meta_path = os.path.join(directory, META_FILE)
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        vectors = cls(
+            np.load(os.path.join(directory, IDS_FILE), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, CODES_FILE), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, SCALES_FILE), mmap_mode=mmap_mode),
+            meta,
+        )
+        if not len(vectors.ids) == len(vectors.codes) == len(vectors.scales) == meta['count']:
+            raise ValueError("int8 벡터 파일이 서로 일치하지 않습니다.")
+        return vectors
+
+    @staticmethod
+    def meta_mtime(directory):
+        try:
+            return os.stat(os.path.join(directory, META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+_vectors = None
+_vectors_mtime = None
+_vectors_lock = threading.Lock()
+
+
+def get_quantized_vectors(directory=None):
+    """
+    프로세스 단위로 int8 벡터를 메모리 맵으로 열어 재사용합니다. (파일이 없으면 None)
+    """
+    global _vectors, _vectors_mtime
+    directory = directory or get_embedding_dir()
+    mtime = QuantizedVectors.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _vectors_lock:
+        if _vectors is None or _vectors_mtime != mtime:
+            try:
+                _vectors = QuantizedVectors.load(directory)
+                _vectors_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                if _vectors is None:
+                    return None
+        return _vectors
@@ -0,0 +1,114 @@
+# movies/recommendation/query_cache.py
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+
+# 키워드 캐시 설정 (항목 수 / 유지 시간(초))
+KEYWORD_CACHE_SIZE = getattr(settings, 'KEYWORD_CACHE_SIZE', 1024)
+KEYWORD_CACHE_TTL = getattr(settings, 'KEYWORD_CACHE_TTL', 60 * 60)
+
+_MISSING = object()
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_keyword(keyword):
+    """
+    캐시 키로 쓸 키워드 정규화: 유니코드 NFKC, 앞뒤 공백 제거, 연속 공백 하나로, 대소문자 무시
+    ("Time  Travel " 와 "time travel" 은 같은 키)
+    """
+    keyword = unicodedata.normalize('NFKC', str(keyword))
+    return _WHITESPACE.sub(' ', keyword).strip().casefold()
+
+
+class TTLLRUCache:
+    """
+    프로세스 메모리에 두는 크기 제한 LRU 캐시 (항목별 만료 시간 포함, 스레드 안전)
+
+    - maxsize 를 넘으면 가장 오래 사용하지 않은 항목부터 버립니다.
+    - ttl 초가 지난 항목은 조회 시 미스로 처리하고 지웁니다.
+    - 적중/미스/제거 횟수를 세어 stats() 로 노출합니다.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, name=''):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, build):
+        """
+        캐시에 있으면 그 값을, 없으면 build() 결과를 저장하고 반환합니다.
+        (build 는 잠금 밖에서 실행하므로 같은 키가 동시에 처음 요청되면 중복 계산될 수 있음)
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / requests, 4) if requests else None,
+            }
+
+
+# 키워드 -> 정규화된 질의 벡터 (모델 추론 생략)
+keyword_vector_cache = TTLLRUCache(KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL, name='keyword_vectors')
+# (키워드, k, 저장소/인덱스 버전) -> 최종 추천 목록
+keyword_result_cache = TTLLRUCache(KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL, name='keyword_results')
+
+
+def keyword_cache_stats():
+    """
+    키워드 캐시 적중/미스 통계 (추천 지표 API 에서 노출)
+    """
+    return {
+        'vectors': keyword_vector_cache.stats(),
+        'results': keyword_result_cache.stats(),
+    }
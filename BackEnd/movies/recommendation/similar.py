@@ -0,0 +1,166 @@
+# movies/recommendation/similar.py
+import threading
+import time
+
+import numpy as np
+from django.db.models import Count
+
+from movies.models import Movie
+from movies.recommendation.catalog import get_catalog
+from movies.recommendation.embeddings import get_embedding_dir, get_embedding_store, normalize_rows
+from movies.recommendation.item_cf import ItemNeighbors
+from movies.recommendation.keyword import combined_vectors, search_store
+from movies.recommendation.personalized import top_k
+
+
+class SimilarMovies(ItemNeighbors):
+    """
+    영화별 제목/설명 임베딩 이웃 목록 ("이 영화와 비슷한 영화")
+
+    키워드 추천과 같은 임베딩 저장소의 벡터로 많이 본 영화들만 미리 계산해 두며,
+    meta['store_built_at'] 이 현재 저장소와 다르면 쓰지 않습니다.
+    """
+
+    MOVIE_IDS_FILE = 'similar_movie_ids.npy'
+    NEIGHBOR_IDS_FILE = 'similar_neighbor_ids.npy'
+    NEIGHBOR_SCORES_FILE = 'similar_neighbor_scores.npy'
+    META_FILE = 'similar_meta.json'
+
+    @classmethod
+    def build(cls, store, movie_ids, top_k=50, chunk_size=256):
+        """
+        movie_ids 영화마다 저장소 전체에서 가중 코사인 유사도 상위 top_k 영화를 계산합니다.
+        (chunk_size 개 영화씩 (묶음 x 차원) @ (차원 x 영화 수) 행렬 곱 한 번으로 점수 계산)
+        """
+        movie_ids = np.array([movie_id for movie_id in movie_ids if movie_id in store.row_of], dtype=np.int64)
+        all_ids = np.asarray(store.movie_ids)
+        vectors = combined_vectors(store.titles, store.overviews)
+        count = min(top_k, max(len(store) - 1, 0))
+
+        neighbor_ids = np.full((len(movie_ids), top_k), -1, dtype=np.int64)
+        neighbor_scores = np.zeros((len(movie_ids), top_k), dtype=np.float32)
+        for start in range(0, len(movie_ids), chunk_size):
+            rows = np.array([store.row_of[movie_id] for movie_id in movie_ids[start:start + chunk_size].tolist()])
+            scores = normalize_rows(vectors[rows]) @ vectors.T
+            # 자기 자신 제외
+            scores[np.arange(len(rows)), rows] = -np.inf
+            if not count:
+                continue
+            for offset, row_scores in enumerate(scores):
+                top = np.argpartition(-row_scores, count - 1)[:count]
+                top = top[np.lexsort((all_ids[top], -row_scores[top]))]
+                neighbor_ids[start + offset, :count] = all_ids[top]
+                neighbor_scores[start + offset, :count] = row_scores[top]
+
+        meta = {'top_k': top_k, 'store_built_at': store.meta['built_at'], 'built_at': time.time()}
+        return cls(movie_ids, neighbor_ids, neighbor_scores, meta)
+
+
+def most_viewed_movie_ids(limit):
+    """
+    시청 기록이 많은 영화 ID (동점은 인기순, 영화 ID 순)
+    """
+    return list(
+        Movie.objects.annotate(view_count=Count('watched_by_users'))
+        .order_by('-view_count', '-normalized_popularity', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+
+
+def build_similar_movies(limit=1000, top_k=50, chunk_size=256, store=None):
+    """
+    많이 본 영화 limit 편의 임베딩 이웃을 계산해 임베딩 저장소와 같은 위치에 저장합니다. (저장소가 없으면 None)
+    """
+    store = store or get_embedding_store()
+    if store is None or not len(store):
+        return None
+    similar = SimilarMovies.build(store, most_viewed_movie_ids(limit), top_k=top_k, chunk_size=chunk_size)
+    similar.save(store.directory)
+    return similar
+
+
+_similar = None
+_similar_mtime = None
+_similar_lock = threading.Lock()
+
+
+def get_similar_movies(directory=None):
+    """
+    프로세스 단위로 미리 계산한 임베딩 이웃 목록을 메모리에 올려 재사용합니다. (build_similar_movies 로 다시 만들면 자동으로 다시 읽음)
+    """
+    global _similar, _similar_mtime
+    directory = directory or get_embedding_dir()
+    mtime = SimilarMovies.meta_mtime(directory)
+    if mtime is None:
+        return None
+    with _similar_lock:
+        if _similar is None or _similar_mtime != mtime:
+            try:
+                _similar = SimilarMovies.load(directory)
+                _similar_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                if _similar is None:
+                    return None
+        return _similar
+
+
+def filter_mask(store_movie_ids, genre_ids=(), year_min=None, year_max=None, catalog=None):
+    """
+    저장소 행 순서의 필터 통과 여부 (선택한 장르 중 하나라도 포함 / 개봉 연도 범위)
+    카탈로그에 없는 영화와 개봉일이 없는 영화는 연도 조건이 있으면 통과하지 못합니다.
+    """
+    catalog = catalog or get_catalog()
+    store_movie_ids = np.asarray(store_movie_ids)
+    positions = np.searchsorted(catalog.movie_ids, store_movie_ids)
+    found = positions < len(catalog.movie_ids)
+    found[found] = catalog.movie_ids[positions[found]] == store_movie_ids[found]
+    rows = positions[found]
+
+    passed = np.ones(len(rows), dtype=bool)
+    if genre_ids:
+        passed &= catalog.genres[rows] @ catalog.indicator(catalog.genre_ids, genre_ids) > 0
+    if year_min is not None:
+        passed &= catalog.release_years[rows] >= year_min
+    if year_max is not None:
+        passed &= (catalog.release_years[rows] <= year_max) & (catalog.release_years[rows] > 0)
+    mask = np.zeros(len(store_movie_ids), dtype=bool)
+    mask[np.flatnonzero(found)[passed]] = True
+    return mask
+
+
+def similar_movies(movie_id, k=10, genre_ids=(), year_min=None, year_max=None):
+    """
+    영화의 제목/설명 임베딩과 가까운 영화 상위 k개 (요청 시 문장 임베딩 모델을 호출하지 않음)
+
+    - 미리 계산한 이웃 목록에 있는 영화면 그 목록을 필터로 걸러 씁니다.
+    - 목록에 없거나 필터 뒤 k개가 모자라면, 저장된 벡터를 질의로 써서
+      필터가 없으면 키워드 추천과 같은 방식(search_store)으로, 있으면 필터를 통과한 영화만 전수 계산합니다.
+
+    Returns:
+        list[dict]: [{"movie_id": 영화 ID, "score": 점수}, ...] (저장소에 없는 영화는 빈 목록)
+    """
+    store = get_embedding_store()
+    if store is None or movie_id not in store.row_of:
+        return []
+    filtered = bool(genre_ids) or year_min is not None or year_max is not None
+
+    similar = get_similar_movies(store.directory)
+    if similar is not None and similar.meta.get('store_built_at') == store.meta['built_at']:
+        neighbors = similar.neighbors(movie_id, similar.meta['top_k'])
+        if neighbors and filtered:
+            neighbor_ids = np.array([rec["movie_id"] for rec in neighbors], dtype=np.int64)
+            mask = filter_mask(neighbor_ids, genre_ids, year_min, year_max)
+            neighbors = [rec for rec, passed in zip(neighbors, mask.tolist()) if passed]
+        if len(neighbors) >= k:
+            return neighbors[:k]
+
+    row = store.row_of[movie_id]
+    query = normalize_rows(combined_vectors(store.titles[row], store.overviews[row]))
+    if not filtered:
+        return [rec for rec in search_store(query, store, k + 1) if rec["movie_id"] != movie_id][:k]
+
+    mask = filter_mask(store.movie_ids, genre_ids, year_min, year_max)
+    mask[row] = False
+    rows = np.flatnonzero(mask)
+    scores = combined_vectors(store.titles[rows], store.overviews[rows]) @ query
+    return top_k(np.asarray(store.movie_ids)[rows], scores, k)
@@ -0,0 +1,194 @@
+# movies/recommendation/taste.py
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from movies.models import Movie, UserTasteProfile
+from movies.recommendation.embeddings import get_embedding_store, normalize_rows
+
+# 사용자 M2M 필드 -> 프로필의 ID 목록 필드
+PROFILE_FIELDS = {
+    'liked_movies': 'liked_movie_ids',
+    'favorite_genres': 'favorite_genre_ids',
+    'favorite_actors': 'favorite_actor_ids',
+    'favorite_directors': 'favorite_director_ids',
+}
+
+
+def _movie_vector_sum(movie_ids, store):
+    """
+    영화들의 제목/설명 가중합 벡터의 합(float64)과 저장소에 있어 합에 들어간 영화 수
+    """
+    from movies.recommendation.keyword import combined_vectors
+
+    rows = sorted(store.row_of[movie_id] for movie_id in movie_ids if movie_id in store.row_of)
+    if not rows:
+        return np.zeros(store.titles.shape[1], dtype=np.float64), 0
+    vectors = combined_vectors(store.titles[rows], store.overviews[rows])
+    return vectors.astype(np.float64).sum(axis=0), len(rows)
+
+
+def _liked_genre_counter(movie_ids):
+    return Counter(
+        Movie.genres.through.objects.filter(movie_id__in=list(movie_ids)).values_list('genre_id', flat=True)
+    )
+
+
+def _genre_counts_json(counts):
+    return {str(genre_id): count for genre_id, count in counts.items() if count > 0}
+
+
+def _set_vector(profile, vector_sum, count, store):
+    profile.liked_vector_sum = vector_sum.tobytes() if count else None
+    profile.liked_vector_count = count
+    profile.embedding_built_at = store.meta['built_at'] if store is not None else None
+
+
+def _refresh_vector(profile, store):
+    """
+    좋아요 목록 전체로 임베딩 합을 다시 계산합니다. (저장소가 다시 만들어졌을 때)
+    """
+    if store is None or not len(store):
+        _set_vector(profile, None, 0, None)
+    else:
+        _set_vector(profile, *_movie_vector_sum(profile.liked_movie_ids, store), store)
+
+
+def build_taste_profile(user, store=None):
+    """
+    사용자의 M2M 테이블을 모두 읽어 취향 프로필을 새로 만들거나 덮어씁니다.
+
+    M2M 테이블을 읽기 전에 프로필 행을 먼저 만들어(get_or_create) 잠그므로, 읽는 도중 들어온 좋아요/선호 변경의
+    증분 갱신(update_taste_profile)은 덮어써져 사라지지 않고 이 트랜잭션이 끝난 뒤 새 프로필 위에 반영됩니다.
+    (먼저 만든 행은 built_at 이 비어 있어 get_taste_profile 이 쓰지 않음)
+    """
+    store = store or get_embedding_store()
+    UserTasteProfile.objects.get_or_create(user_id=user.pk)
+    with transaction.atomic():
+        profile = UserTasteProfile.objects.select_for_update().get(user_id=user.pk)
+        liked_movie_ids = list(user.liked_movies.values_list('id', flat=True))
+        profile.favorite_genre_ids = sorted(user.favorite_genres.values_list('id', flat=True))
+        profile.favorite_actor_ids = sorted(user.favorite_actors.values_list('id', flat=True))
+        profile.favorite_director_ids = sorted(user.favorite_directors.values_list('id', flat=True))
+        profile.liked_movie_ids = liked_movie_ids
+        profile.liked_genre_counts = _genre_counts_json(_liked_genre_counter(liked_movie_ids))
+        _refresh_vector(profile, store)
+        profile.built_at = timezone.now()
+        profile.save()
+    return profile
+
+
+def get_taste_profile(user):
+    """
+    저장된 취향 프로필을 반환합니다. 없으면 만들고, 임베딩 저장소가 다시 만들어졌으면 임베딩 합만 다시 계산합니다.
+    """
+    profile = UserTasteProfile.objects.filter(user=user, built_at__isnull=False).first()
+    store = get_embedding_store()
+    if profile is None:
+        return build_taste_profile(user, store)
+    built_at = store.meta['built_at'] if store is not None and len(store) else None
+    if profile.embedding_built_at != built_at:
+        with transaction.atomic():
+            # 다시 계산하는 동안 들어온 좋아요가 임베딩 합에서 빠지지 않도록 잠근 행으로 계산
+            profile = UserTasteProfile.objects.select_for_update().get(pk=profile.pk)
+            if profile.embedding_built_at != built_at:
+                _refresh_vector(profile, store)
+                profile.save(update_fields=['liked_vector_sum', 'liked_vector_count', 'embedding_built_at', 'updated_at'])
+    return profile
+
+
+def taste_vector(profile):
+    """
+    좋아요한 영화 임베딩의 평균을 정규화한 벡터 (좋아요한 영화가 저장소에 없으면 None)
+    """
+    if not profile.liked_vector_count or profile.liked_vector_sum is None:
+        return None
+    vector_sum = np.frombuffer(bytes(profile.liked_vector_sum), dtype=np.float64)
+    return normalize_rows((vector_sum / profile.liked_vector_count).astype(np.float32))
+
+
+def update_taste_profile(user_id, field, added=(), removed=()):
+    """
+    M2M 변경분만 프로필에 반영합니다. (프로필이 없으면 다음 조회 때 새로 만들어지므로 아무것도 하지 않음)
+
+    - 좋아요 추가/취소: 해당 영화의 임베딩을 합에 더하거나 빼고, 장르별 좋아요 수를 늘리거나 줄입니다.
+    - 선호 장르/즐겨찾기 배우·감독: ID 목록에 넣거나 뺍니다.
+    """
+    with transaction.atomic():
+        profile = UserTasteProfile.objects.select_for_update().filter(user_id=user_id).first()
+        if profile is None:
+            return None
+        current = list(getattr(profile, PROFILE_FIELDS[field]))
+        present = set(current)
+        added = [pk for pk in dict.fromkeys(added) if pk not in present]
+        removed = set(removed) & present
+        if not added and not removed:
+            return profile
+        current = [pk for pk in current if pk not in removed] + added
+        # 좋아요 목록은 좋아요 순서를, 나머지는 ID 순서를 유지
+        setattr(profile, PROFILE_FIELDS[field], current if field == 'liked_movies' else sorted(current))
+        update_fields = [PROFILE_FIELDS[field], 'updated_at']
+
+        if field == 'liked_movies':
+            counts = Counter({int(genre_id): count for genre_id, count in profile.liked_genre_counts.items()})
+            counts.update(_liked_genre_counter(added))
+            counts.subtract(_liked_genre_counter(removed))
+            profile.liked_genre_counts = _genre_counts_json(counts)
+            update_fields.append('liked_genre_counts')
+
+            store = get_embedding_store()
+            built_at = store.meta['built_at'] if store is not None and len(store) else None
+            if built_at is not None and profile.embedding_built_at == built_at:
+                # 같은 저장소 기준이면 바뀐 영화의 벡터만 더하고 뺌
+                vector_sum = (
+                    np.frombuffer(bytes(profile.liked_vector_sum), dtype=np.float64).copy()
+                    if profile.liked_vector_sum is not None else np.zeros(store.titles.shape[1], dtype=np.float64)
+                )
+                added_sum, added_count = _movie_vector_sum(added, store)
+                removed_sum, removed_count = _movie_vector_sum(removed, store)
+                _set_vector(
+                    profile, vector_sum + added_sum - removed_sum,
+                    profile.liked_vector_count + added_count - removed_count, store,
+                )
+            else:
+                _refresh_vector(profile, store)
+            update_fields += ['liked_vector_sum', 'liked_vector_count', 'embedding_built_at']
+
+        profile.save(update_fields=update_fields)
+        return profile
+
+
+def recount_liked_genres(movie_ids):
+    """
+    영화의 장르 구성이 바뀌었을 때, 그 영화를 좋아요한 사용자 프로필의 장르별 좋아요 수를 다시 셉니다.
+    (프로필의 좋아요 목록 전체로 다시 세며, 영향받는 프로필 수와 상관없이 조회 쿼리는 세 번)
+
+    Returns:
+        int: 다시 센 프로필 수
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return 0
+    liked_by = Movie.liked_movies_by_users.through.objects.filter(movie_id__in=movie_ids).values('customuser_id')
+    with transaction.atomic():
+        profiles = list(UserTasteProfile.objects.select_for_update().filter(user_id__in=liked_by))
+        genre_ids_of = defaultdict(list)
+        for movie_id, genre_id in Movie.genres.through.objects.filter(
+            movie_id__in={movie_id for profile in profiles for movie_id in profile.liked_movie_ids}
+        ).values_list('movie_id', 'genre_id'):
+            genre_ids_of[movie_id].append(genre_id)
+        for profile in profiles:
+            profile.liked_genre_counts = _genre_counts_json(
+                Counter(genre_id for movie_id in profile.liked_movie_ids for genre_id in genre_ids_of[movie_id])
+            )
+        UserTasteProfile.objects.bulk_update(profiles, ['liked_genre_counts'])
+    return len(profiles)
+
+
+def invalidate_taste_profiles(user_ids):
+    """
+    증분으로 반영하기 어려운 변경(clear 등) 뒤에는 프로필을 지워 다음 조회 때 새로 만들게 합니다.
+    """
+    UserTasteProfile.objects.filter(user_id__in=list(user_ids)).delete()
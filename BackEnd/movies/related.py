@@ -0,0 +1,149 @@
+# movies/related.py
+from contextlib import contextmanager
+
+import numpy as np
+from django.db.models import F
+from django.utils import timezone
+
+from movies.cache import bump_movie_detail_version
+from movies.models import Movie, RelatedMovies
+
+# 영화마다 저장할 관련 영화 수 (상세 페이지는 이 중 앞쪽 일부만 사용)
+RELATED_MOVIES_TOP_K = 20
+# 한 번에 점수 행렬을 계산할 영화 수 (메모리 사용량 제한)
+CHUNK_SIZE = 512
+
+
+def _load_genre_matrix(movie_model=Movie):
+    """
+    전체 영화의 장르 포함 여부 행렬과 인기도 가중치를 만듭니다.
+    movie_model 은 마이그레이션에서 과거 모델(apps.get_model)을 넘길 때 사용합니다.
+
+    Returns:
+        movie_ids (ndarray): 행 순서의 영화 ID
+        matrix (ndarray): (영화 수, 장르 수) 0/1 행렬
+        weights (ndarray): 영화별 인기도 가중치 (1 + normalized_popularity / 10, 1~2 범위)
+    """
+    movies = list(movie_model.objects.order_by('id').values_list('id', 'normalized_popularity'))
+    movie_ids = np.array([movie_id for movie_id, _ in movies], dtype=np.int64)
+    popularity = np.array([value or 0 for _, value in movies], dtype=np.float32)
+    row_of = {movie_id: row for row, movie_id in enumerate(movie_ids.tolist())}
+
+    through = list(movie_model.genres.through.objects.values_list('movie_id', 'genre_id'))
+    genre_ids = sorted({genre_id for _, genre_id in through})
+    col_of = {genre_id: col for col, genre_id in enumerate(genre_ids)}
+
+    matrix = np.zeros((len(movie_ids), len(genre_ids)), dtype=np.float32)
+    for movie_id, genre_id in through:
+        matrix[row_of[movie_id], col_of[genre_id]] = 1
+
+    weights = 1 + np.clip(popularity, 0, 10) / 10
+    return movie_ids, matrix, weights
+
+
+def score_related_movies(all_ids, matrix, weights, rows, top_k=RELATED_MOVIES_TOP_K, chunk_size=CHUNK_SIZE):
+    """
+    장르 Jaccard 유사도에 상대 영화의 인기도 가중치를 곱한 점수로 rows 의 영화별 상위 top_k 관련 영화를 계산합니다.
+
+    Yields:
+        (movie_id, related_ids, scores): 점수 내림차순, 동점이면 영화 ID 오름차순
+    """
+    genre_counts = matrix.sum(axis=1)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        # |A ∩ B| 와 |A ∪ B| 를 행렬 연산으로 한 번에 계산
+        intersection = matrix[chunk] @ matrix.T
+        union = genre_counts[chunk, None] + genre_counts[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        scores = jaccard * weights[None, :]
+        scores[np.arange(len(chunk)), chunk] = 0  # 자기 자신 제외
+
+        k = min(top_k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for i, row in enumerate(chunk):
+            candidates = top[i][scores[i, top[i]] > 0]
+            order = np.lexsort((all_ids[candidates], -scores[i, candidates]))
+            candidates = candidates[order]
+            yield (
+                int(all_ids[row]),
+                all_ids[candidates].tolist(),
+                [round(float(score), 4) for score in scores[i, candidates]],
+            )
+
+
+def compute_related_movies(movie_ids=None, top_k=RELATED_MOVIES_TOP_K, chunk_size=CHUNK_SIZE):
+    """
+    영화별 상위 top_k 관련 영화를 계산해 저장합니다. (점수 계산은 score_related_movies)
+    movie_ids 가 없으면 전체 영화를 다시 계산하며, 저장한 행 수를 반환합니다.
+    computed_at 은 데이터를 읽기 전 시각이므로, 계산 중에 장르가 바뀐 영화는 다음 --stale 실행에서 다시 계산됩니다.
+    """
+    computed_at = timezone.now()
+    all_ids, matrix, weights = _load_genre_matrix()
+    if not len(all_ids):
+        return 0
+
+    if movie_ids is None:
+        rows = np.arange(len(all_ids))
+    else:
+        rows = np.flatnonzero(np.isin(all_ids, list(movie_ids)))
+
+    entries = [
+        RelatedMovies(movie_id=movie_id, movie_ids=related_ids, scores=scores, computed_at=computed_at)
+        for movie_id, related_ids, scores in score_related_movies(all_ids, matrix, weights, rows, top_k, chunk_size)
+    ]
+    RelatedMovies.objects.bulk_create(
+        entries,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['movie'],
+        update_fields=['movie_ids', 'scores', 'updated_at', 'computed_at'],
+    )
+    # 관련 영화 목록이 바뀐 영화의 상세 응답 캐시 무효화
+    bump_movie_detail_version(*(entry.movie_id for entry in entries))
+    return len(entries)
+
+
+def mark_related_stale(movie_ids):
+    """
+    장르가 바뀐 영화의 관련 영화 목록을 만료 표시만 합니다. (요청 안에서는 다시 계산하지 않음)
+
+    바뀐 영화 자신의 행만 한 번의 UPDATE 로 표시하며, 같은 트랜잭션 안에서 실행되므로 롤백되면 표시도 함께 취소됩니다.
+    표시된 영화는 build_related_movies --stale 로, 장르를 공유하는 다른 영화의 목록은 정기적인 전체 실행으로 다시 계산합니다.
+    """
+    movie_ids = [movie_id for movie_id in movie_ids if movie_id is not None]
+    if movie_ids:
+        RelatedMovies.objects.filter(movie_id__in=movie_ids).update(genres_changed_at=timezone.now())
+
+
+def stale_movie_ids():
+    """
+    관련 영화 목록이 없거나, 계산한 뒤 장르가 바뀐 영화 ID
+    """
+    missing = Movie.objects.filter(related_index__isnull=True).values_list('id', flat=True)
+    changed = RelatedMovies.objects.filter(genres_changed_at__gt=F('computed_at')).values_list('movie_id', flat=True)
+    return sorted({*missing, *changed})
+
+
+@contextmanager
+def defer_related_refresh():
+    """
+    블록이 끝나면 (예외로 끝나도) 목록이 없거나 장르가 바뀐 영화의 관련 영화 목록만 한 번에 다시 계산합니다.
+    대량 수집(ingestion)처럼 많은 영화의 장르와 인기도가 함께 바뀌는 작업에 사용합니다.
+    새로 들어온 영화는 목록이 없고, 장르가 바뀐 영화는 시그널이 mark_related_stale 로 표시하므로 stale_movie_ids 로 모입니다.
+    장르를 공유하는 다른 영화의 목록은 정기적인 build_related_movies 전체 실행으로 갱신합니다.
+    """
+    try:
+        yield
+    finally:
+        movie_ids = stale_movie_ids()
+        if movie_ids:
+            compute_related_movies(movie_ids)
+
+
+def get_related_movie_ids(movie, limit=8):
+    """
+    미리 계산된 관련 영화 ID 목록을 기본 키 조회 한 번으로 가져옵니다.
+    아직 계산되지 않은 영화는 빈 목록을 반환합니다. (조회 요청에서 계산하지 않고 build_related_movies --stale 로 채움)
+    """
+    index = RelatedMovies.objects.filter(pk=movie.pk).values_list('movie_ids', flat=True).first()
+    return index[:limit] if index else []
@@ -5,9 +5,10 @@ from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from django.db.models import Max
-from movies.models import Movie, Genre, Actor, Director, News, ActorCharacter
+from movies.models import Movie, MovieCard, Genre, Actor, Director, News, ActorCharacter
 from community.models import Review, Post
 from accounts.models import CustomUser, Notification
+from utils import get_liked_ids
 
 
 User = get_user_model()
@@ -21,20 +22,35 @@ class CommentSerializer(serializers.ModelSerializer):
     like_count = serializers.IntegerField(read_only=True)
     dislike_count = serializers.IntegerField(read_only=True)
     replies = serializers.SerializerMethodField()
+    reply_count = serializers.SerializerMethodField()
+    replies_next_cursor = serializers.SerializerMethodField()
     parent = serializers.PrimaryKeyRelatedField(queryset=Comment.objects.all(), allow_null=True, required=False)
 
     class Meta:
         model = Comment
         fields = [
             'id', 'user', 'user_id', 'content', 'created_at',
-            'like_count', 'dislike_count', 'movie', 'actor', 'director', 'replies', 'parent'
+            'like_count', 'dislike_count', 'movie', 'actor', 'director', 'replies', 'reply_count', 'replies_next_cursor', 'parent'
         ]
         read_only_fields = ['id', 'user', 'user_id', 'created_at', 'like_count', 'dislike_count']
 
     def get_replies(self, obj):
-        replies = obj.replies.all()
+        # load_comment_tree 로 미리 구성한 트리가 있으면 추가 쿼리 없이 사용
+        replies = getattr(obj, 'tree_replies', None)
+        if replies is None:
+            replies = obj.replies.all()
         return CommentSerializer(replies, many=True, context=self.context).data
 
+    def get_reply_count(self, obj):
+        reply_count = getattr(obj, 'reply_count', None)
+        if reply_count is None:
+            reply_count = obj.replies.count()
+        return reply_count
+
+    def get_replies_next_cursor(self, obj):
+        # 다음 대댓글 페이지를 가져올 replies_after 값 (남은 대댓글이 없으면 None)
+        return getattr(obj, 'replies_next_cursor', None)
+
 
 
 
@@ -51,11 +67,14 @@ class GenreSerializer(serializers.ModelSerializer):
 
 # 재사용 많이
 class MovieCardSerializer(serializers.ModelSerializer):
-
-    genres = GenreSerializer(many=True, read_only=True)  # 영화의 장르들
+    """
+    영화 카드 테이블(MovieCard)을 직렬화합니다. 장르는 카드 행에 저장된 값을 그대로 사용합니다.
+    """
+    id = serializers.IntegerField(source='movie_id', read_only=True)  # 영화 ID
+    genres = serializers.JSONField(read_only=True)  # 영화의 장르들 [{"id", "name"}]
 
     class Meta:
-        model = Movie
+        model = MovieCard
         fields = ['id', 'title', 'poster_path', 'release_date', 'popularity', 'normalized_popularity', 'genres']
 
 # 통합 시리얼라이저
@@ -87,14 +106,6 @@ class UnifiedMovieDetailSerializer(serializers.ModelSerializer):
             model = News
             fields = ['title', 'content', 'url', 'created_at']
 
-    # 댓글 시리얼라이저
-    class CommentSerializer(serializers.ModelSerializer):
-        user = serializers.StringRelatedField()  # 댓글 작성자 이름 표시
-
-        class Meta:
-            model = Comment
-            fields = ['id', 'user', 'content', 'created_at', 'like_count', 'dislike_count']
-
     # 관련 영화 카드 시리얼라이저
     class RelatedMovieCardSerializer(serializers.ModelSerializer):
         genres = serializers.StringRelatedField(many=True)  # 장르 이름 추가
@@ -119,7 +130,7 @@ class UnifiedMovieDetailSerializer(serializers.ModelSerializer):
     cast = MovieActorCardSerializer(source='actor_roles', many=True, read_only=True)  # 출연 배우
     crews = MovieDirectorCardSerializer(source='director_movies', many=True, read_only=True)  # 감독 정보
     news = NewsSerializer(many=True, read_only=True)  # 뉴스
-    comments = CommentSerializer(source='movie_comments', many=True, read_only=True)  # 댓글
+    # 댓글(comments)은 뷰에서 load_comment_tree 로 한 번에 조회해 추가
     related_movies = RelatedMovieCardSerializer(many=True, read_only=True)  # 관련 영화
     reviews = ReviewCardSerializer(many=True, read_only=True)  # 리뷰
     trailer_link = serializers.CharField(read_only=True)  # 예고편 링크
@@ -128,7 +139,7 @@ class UnifiedMovieDetailSerializer(serializers.ModelSerializer):
         model = Movie
         fields = [
             'id', 'title', 'poster_path', 'genres', 'overview', 'release_date',
-            'normalized_popularity', 'is_liked', 'cast', 'crews', 'news', 'comments',
+            'normalized_popularity', 'is_liked', 'cast', 'crews', 'news',
             'related_movies', 'reviews', 'trailer_link'
         ]
 
@@ -136,10 +147,8 @@ class UnifiedMovieDetailSerializer(serializers.ModelSerializer):
         """
         현재 사용자가 이 영화를 좋아요 했는지 여부를 확인.
         """
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return request.user.liked_movies.filter(pk=obj.pk).exists()
-        return False
+        # 요청 단위로 한 번만 조회한 좋아요 영화 ID 집합에서 확인
+        return get_liked_ids(self.context.get('request')).contains('movie', obj)
 
 
 
@@ -340,25 +349,22 @@ class ActorDetailSerializer(serializers.ModelSerializer):
     
     # 필모그래피와 댓글 역참조 필드
     filmography = ProfileMovieCardSerializer(source='movies', many=True, read_only=True)  # 영화 목록
-    comments = ActorCommentSerializer(source='actor_comments', many=True, read_only=True)  # 댓글 목록
+    # 댓글(comments)은 뷰에서 load_comment_tree 로 한 번에 조회해 추가
     is_liked = serializers.SerializerMethodField()  # 좋아요 여부 확인
     notable_roles = CharacterRoleSerializer(source='movie_roles', many=True, read_only=True)  # 맡았던 캐릭터 목록
     class Meta:
         model = Actor
         fields = [
             'id', 'profile_path', 'name', 'gender', 'birthdate', 'birthplace', 
-            'biography', 'filmography', 'comments', 'notable_roles', 'is_liked'
+            'biography', 'filmography', 'notable_roles', 'is_liked'
         ]
 
     def get_is_liked(self, obj):
         """
         좋아요 여부를 역참조를 통해 확인.
         """
-        request = self.context.get('request')  # 요청 객체 가져오기
-        if request and request.user.is_authenticated:
-            # 역참조를 통해 현재 사용자가 이 배우를 좋아요 했는지 확인
-            return request.user.favorite_actors.filter(pk=obj.pk).exists()
-        return False
+        # 요청 단위로 한 번만 조회한 즐겨찾기 배우 ID 집합에서 확인
+        return get_liked_ids(self.context.get('request')).contains('actor', obj)
 
 # 감독 프로필 시리얼라이저
 class DirectorDetailSerializer(serializers.ModelSerializer):
@@ -381,25 +387,22 @@ class DirectorDetailSerializer(serializers.ModelSerializer):
 
     # 필모그래피와 댓글 역참조 필드
     filmography = ProfileMovieCardSerializer(source='movies', many=True, read_only=True)  # 영화 목록
-    comments = DirectorCommentSerializer(source='director_comments', many=True, read_only=True)  # 댓글 목록
+    # 댓글(comments)은 뷰에서 load_comment_tree 로 한 번에 조회해 추가
     is_liked = serializers.SerializerMethodField()  # 좋아요 여부 확인
 
     class Meta:
         model = Director
         fields = [
             'id', 'profile_path', 'name', 'gender', 'birthdate', 'birthplace', 
-            'biography', 'filmography', 'comments', 'is_liked'
+            'biography', 'filmography', 'is_liked'
         ]
 
     def get_is_liked(self, obj):
         """
         좋아요 여부를 확인.
         """
-        request = self.context.get('request')  # 요청 객체 가져오기
-        if request and request.user.is_authenticated:
-            # 역참조를 통해 현재 사용자가 이 감독을 좋아요 했는지 확인
-            return request.user.favorite_directors.filter(pk=obj.pk).exists()
-        return False
+        # 요청 단위로 한 번만 조회한 즐겨찾기 감독 ID 집합에서 확인
+        return get_liked_ids(self.context.get('request')).contains('director', obj)
 
 
 '''
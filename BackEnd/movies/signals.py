@@ -0,0 +1,191 @@
+# movies/signals.py
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import CustomUser
+from community.models import Comment, Review
+from movies.cache import bump_movie_detail_version
+from movies.models import Actor, ActorCharacter, Director, Genre, Movie, MovieCard, News
+from movies.recommendation.precompute import mark_recommendations_stale
+from movies.recommendation.taste import (
+    PROFILE_FIELDS, invalidate_taste_profiles, recount_liked_genres, update_taste_profile,
+)
+from movies.related import mark_related_stale
+
+
+# 영화 저장 시 카드 테이블 갱신
+@receiver(post_save, sender=Movie)
+def refresh_card_on_movie_save(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata 중에는 장르가 아직 연결되지 않았으므로 건너뜀
+        return
+    MovieCard.refresh([instance.pk])
+
+
+# movie.genres.set / add / remove / clear 시 카드 테이블 갱신
+@receiver(m2m_changed, sender=Movie.genres.through)
+def refresh_card_on_genres_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # genre.movies.clear() 는 post_clear 에서 빠진 영화를 알 수 없으므로 미리 기록
+        instance._cleared_movie_ids = list(instance.movies.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        MovieCard.refresh([instance.pk])
+    elif action == 'post_clear':
+        MovieCard.refresh(getattr(instance, '_cleared_movie_ids', []))
+    else:
+        # genre.movies.add(...) 처럼 장르 쪽에서 변경한 경우
+        MovieCard.refresh(pk_set)
+
+
+# 장르 이름 변경 시 해당 장르를 가진 영화 카드 갱신
+@receiver(post_save, sender=Genre)
+def refresh_cards_on_genre_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    MovieCard.refresh(instance.movies.values_list('id', flat=True))
+
+
+# 장르 구성이 바뀐 영화의 관련 영화 목록을 만료 표시 (build_related_movies --stale 로 다시 계산)
+@receiver(m2m_changed, sender=Movie.genres.through)
+def expire_related_on_genres_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if not reverse:
+        mark_related_stale([instance.pk])
+    elif action == 'pre_clear':
+        # genre.movies.clear(): 지금 이 장르를 가진 영화들 (post_clear 에서는 알 수 없음)
+        mark_related_stale(instance.movies.values_list('id', flat=True))
+    else:
+        # genre.movies.add(...) 처럼 장르 쪽에서 변경한 경우: pk_set 은 영화 ID
+        mark_related_stale(pk_set or ())
+
+
+# 좋아요한 영화의 장르 구성이 바뀌면 그 영화를 좋아요한 사용자 프로필의 장르별 좋아요 수를 다시 셈
+@receiver(m2m_changed, sender=Movie.genres.through)
+def recount_taste_on_genres_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # genre.movies.clear(): 빠질 영화는 post_clear 에서 알 수 없으므로 미리 기록
+        instance._taste_cleared_movie_ids = list(instance.movies.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        recount_liked_genres([instance.pk])
+    elif action == 'post_clear':
+        recount_liked_genres(getattr(instance, '_taste_cleared_movie_ids', []))
+    else:
+        # genre.movies.add(...) 처럼 장르 쪽에서 변경한 경우: pk_set 은 영화 ID
+        recount_liked_genres(pk_set or ())
+
+
+# 영화 상세 공용 응답 캐시 무효화
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_detail_on_movie_change(sender, instance, **kwargs):
+    bump_movie_detail_version(instance.pk)
+
+
+# 리뷰, 댓글, 뉴스, 출연 배역이 바뀌면 해당 영화의 상세 캐시 무효화
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=ActorCharacter)
+@receiver(post_delete, sender=ActorCharacter)
+def invalidate_detail_on_related_change(sender, instance, **kwargs):
+    bump_movie_detail_version(instance.movie_id)
+
+
+# 장르/감독 연결이 바뀌면 해당 영화의 상세 캐시 무효화
+@receiver(m2m_changed, sender=Movie.genres.through)
+@receiver(m2m_changed, sender=Director.movies.through)
+def invalidate_detail_on_m2m_change(sender, instance, action, reverse, pk_set, model, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if isinstance(instance, Movie):
+        bump_movie_detail_version(instance.pk)
+    elif model is Movie:
+        # 반대편(genre.movies, director.movies)에서 변경한 경우: clear 는 변경 전 영화 목록으로 처리
+        movie_ids = instance.movies.values_list('id', flat=True) if action == 'pre_clear' else pk_set
+        bump_movie_detail_version(*movie_ids)
+
+
+# 배우/감독 정보(이름, 프로필 사진)가 바뀌면 출연/연출한 영화의 상세 캐시 무효화
+@receiver(post_save, sender=Actor)
+def invalidate_detail_on_actor_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    bump_movie_detail_version(*instance.movie_roles.values_list('movie_id', flat=True))
+
+
+@receiver(post_save, sender=Director)
+def invalidate_detail_on_director_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    bump_movie_detail_version(*instance.movies.values_list('id', flat=True))
+
+
+# 좋아요/선호 장르/즐겨찾기 배우·감독이 바뀌면 사용자 취향 프로필에 변경분만 반영
+TASTE_THROUGH_FIELDS = {getattr(CustomUser, field).through: field for field in PROFILE_FIELDS}
+
+
+@receiver(m2m_changed, sender=CustomUser.liked_movies.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_genres.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_actors.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_directors.through)
+def update_taste_on_preference_change(sender, instance, action, reverse, pk_set, **kwargs):
+    field = TASTE_THROUGH_FIELDS[sender]
+    if action == 'pre_clear':
+        # clear 는 뺀 항목을 알 수 없으므로 영향받는 프로필을 지워 다음 조회 때 새로 만들게 함
+        if reverse:
+            user_column = CustomUser._meta.get_field(field).m2m_column_name()
+            target_column = CustomUser._meta.get_field(field).m2m_reverse_name()
+            invalidate_taste_profiles(
+                sender.objects.filter(**{target_column: instance.pk}).values_list(user_column, flat=True)
+            )
+        else:
+            invalidate_taste_profiles([instance.pk])
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    key = 'added' if action == 'post_add' else 'removed'
+    if not reverse:
+        update_taste_profile(instance.pk, field, **{key: sorted(pk_set)})
+    else:
+        # actor.favorited_actors_by_users.add(user) 처럼 반대편에서 변경한 경우: pk_set 은 사용자 ID
+        for user_id in pk_set:
+            update_taste_profile(user_id, field, **{key: [instance.pk]})
+
+
+# 좋아요/시청/선호/팔로우가 바뀌면 미리 계산한 추천 목록 만료 (좋아요는 팔로워의 친구 좋아요 점수도 바뀜)
+RECOMMENDATION_THROUGH_FIELDS = {
+    getattr(CustomUser, field).through: field
+    for field in ('liked_movies', 'watched_movies', 'favorite_genres', 'favorite_actors', 'favorite_directors', 'following')
+}
+
+
+@receiver(m2m_changed, sender=CustomUser.liked_movies.through)
+@receiver(m2m_changed, sender=CustomUser.watched_movies.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_genres.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_actors.through)
+@receiver(m2m_changed, sender=CustomUser.favorite_directors.through)
+@receiver(m2m_changed, sender=CustomUser.following.through)
+def expire_precomputed_on_preference_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    field = RECOMMENDATION_THROUGH_FIELDS[sender]
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == 'pre_clear':
+        # 반대편에서 clear: 지금 연결된 사용자들 (post_clear 에서는 알 수 없음)
+        user_column = CustomUser._meta.get_field(field).m2m_column_name()
+        target_column = CustomUser._meta.get_field(field).m2m_reverse_name()
+        user_ids = sender.objects.filter(**{target_column: instance.pk}).values_list(user_column, flat=True)
+    else:
+        # movie.liked_movies_by_users.add(user), user.followers.add(other) 처럼 반대편에서 변경: pk_set 은 사용자 ID
+        user_ids = pk_set or ()
+    mark_recommendations_stale(user_ids, include_followers=field == 'liked_movies')
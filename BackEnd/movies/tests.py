@@ -1,3 +1,959 @@
-from django.test import TestCase
+import base64
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from scipy import sparse
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from movies.cache import get_movie_detail_version, get_or_build_movie_detail
+from movies.models import Genre, Movie, RelatedMovies, UserTasteProfile
+from movies.serializers import UnifiedMovieDetailSerializer
+from movies.recommendation import catalog as catalog_module
+from movies.recommendation.als import ALSModel
+from movies.recommendation.ann import IVFIndex
+from movies.recommendation.batcher import EncodeBatcher
+from movies.recommendation.budget import popular_fallback, run_with_budget
+from movies.recommendation.catalog import get_catalog
+from movies.recommendation.diversity import mmr_order, mmr_rerank
+from movies.recommendation.embeddings import (
+    EmbeddingStore, build_embedding_store, normalize_rows, upsert_embedding_store,
+    stale_movie_ids as stale_embedding_ids,
+)
+from movies.recommendation.interactions import Interactions
+from movies.recommendation.item_cf import ItemNeighbors, compute_item_neighbors
+from movies.recommendation.keyword import ann_recall, combined_vectors, quantized_recall, quantized_search
+from movies.recommendation.personalized import _overlap_ratio, personalized_scores
+from movies.recommendation.pipeline import CANDIDATE_GENERATORS, two_stage_recommendations
+from movies.recommendation.quantized import QuantizedVectors, quantize_rows
+from movies.recommendation.query_cache import TTLLRUCache, normalize_keyword
+from movies.recommendation.taste import build_taste_profile, get_taste_profile
+from movies.related import compute_related_movies, defer_related_refresh, get_related_movie_ids, stale_movie_ids
+from movies.recommendation.precompute import (
+    get_precomputed_recommendations, precompute_recommendations, stale_user_ids,
+)
+
+User = get_user_model()
+
+# 추천 테스트는 운영 임베딩 파일을 읽지 않도록 빈 임시 디렉터리를 사용
+EMBEDDING_DIR = tempfile.mkdtemp(prefix='movie-test-embeddings-')
+
+
+def create_movies(count, genres):
+    movies = []
+    for index in range(count):
+        movie = Movie.objects.create(
+            tmdb_id=1000 + index, title=f"Movie {index}", overview=f"Overview {index}",
+            popularity=count - index, normalized_popularity=float(count - index),
+        )
+        movie.genres.set([genres[index % len(genres)]])
+        movies.append(movie)
+    return movies
+
+
+def create_user(username, **extra_fields):
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password='pw', **extra_fields)
+
+
+@override_settings(MOVIE_EMBEDDING_DIR=EMBEDDING_DIR)
+class PrecomputedFreshnessTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2)]
+        self.movies = create_movies(6, self.genres)
+        self.user = create_user('viewer')
+        self.user.favorite_genres.add(self.genres[0])
+        self.other = create_user('friend')
+        precompute_recommendations([self.user.pk, self.other.pk], catalog=get_catalog(refresh=True))
+
+    def first_recommended(self):
+        return Movie.objects.get(pk=get_precomputed_recommendations(self.user)[0]["movie_id"])
+
+    def assertStale(self, user):
+        self.assertIsNone(get_precomputed_recommendations(user))
+        self.assertIn(user.pk, stale_user_ids())
+
+    def test_fresh_list_is_served(self):
+        self.assertTrue(get_precomputed_recommendations(self.user))
+        self.assertNotIn(self.user.pk, stale_user_ids())
+
+    def test_like_without_taste_profile_expires_list(self):
+        self.assertFalse(hasattr(self.user, 'taste_profile'))
+        self.user.liked_movies.add(self.first_recommended())
+        self.assertStale(self.user)
+
+    def test_watch_expires_list(self):
+        self.user.watched_movies.add(self.first_recommended())
+        self.assertStale(self.user)
+
+    def test_preference_clear_expires_list(self):
+        self.user.favorite_genres.clear()
+        self.assertStale(self.user)
+
+    def test_reverse_side_changes_expire_list(self):
+        movie = self.first_recommended()
+        movie.liked_movies_by_users.add(self.user)
+        self.assertStale(self.user)
+
+        precompute_recommendations([self.user.pk])
+        movie.liked_movies_by_users.clear()
+        self.assertStale(self.user)
+
+    def test_follow_and_followee_like_expire_list(self):
+        self.user.following.add(self.other)
+        self.assertStale(self.user)
+
+        precompute_recommendations([self.user.pk])
+        self.assertIsNotNone(get_precomputed_recommendations(self.user))
+        self.other.liked_movies.add(self.movies[-1])
+        self.assertStale(self.user)
+
+    def test_recompute_makes_list_fresh_again(self):
+        self.user.liked_movies.add(self.first_recommended())
+        precompute_recommendations([self.user.pk])
+        self.assertIsNotNone(get_precomputed_recommendations(self.user))
+        self.assertNotIn(self.user.pk, stale_user_ids())
+
+
+@override_settings(MOVIE_EMBEDDING_DIR=EMBEDDING_DIR)
+class RecommendationsViewFreshnessTests(TransactionTestCase):
+    # 추천 소스는 스레드 풀에서 실행되므로 커밋된 데이터로 확인
+
+    def test_like_after_precompute_serves_on_demand(self):
+        genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2)]
+        create_movies(6, genres)
+        # recommendations_view 는 12번 사용자로 추천
+        user = create_user('viewer', id=12)
+        user.favorite_genres.add(genres[0])
+        precompute_recommendations([user.pk], catalog=get_catalog(refresh=True))
+        client = APIClient()
+
+        response = client.post('/movies/recommendations_view', {}, format='json')
+        self.assertEqual(response.data["pipeline"]["source"], "precomputed")
+        first_id = response.data["personalized_recommendations"][0]["id"]
+
+        user.liked_movies.add(first_id)
+        response = client.post('/movies/recommendations_view', {}, format='json')
+        self.assertEqual(response.data["pipeline"]["source"], "on_demand")
+        self.assertNotIn(first_id, [movie["id"] for movie in response.data["personalized_recommendations"]])
+
+
+# 기본 캐시(LocMemCache)에서는 상세 캐시가 꺼지므로 공용 백엔드(DB 캐시)를 지정해 확인
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'movie_test_cache'}})
+class MovieDetailCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('createcachetable', stdout=open(os.devnull, 'w'))
+
+    def setUp(self):
+        self.genre = Genre.objects.create(tmdb_id=1, name="Drama")
+        self.movie = create_movies(1, [self.genre])[0]
+        self.client = APIClient()
+
+    def test_shared_detail_is_built_without_user(self):
+        user = create_user('fan')
+        user.liked_movies.add(self.movie)
+        self.client.force_authenticate(user)
+        with mock.patch('movies.views.UnifiedMovieDetailSerializer', wraps=UnifiedMovieDetailSerializer) as serializer:
+            self.assertTrue(self.client.get(f'/movies/{self.movie.pk}/').data["is_liked"])
+        self.assertNotIn('context', serializer.call_args.kwargs)
+
+        # 좋아요 한 사용자가 채운 캐시를 다른 사용자가 받아도 사용자별 값은 섞이지 않음
+        self.client.force_authenticate(None)
+        self.assertFalse(self.client.get(f'/movies/{self.movie.pk}/').data["is_liked"])
+        self.assertEqual(serializer.call_count, 1)
+
+    def test_movie_save_invalidates_cached_detail(self):
+        self.assertEqual(self.client.get(f'/movies/{self.movie.pk}/').data["title"], "Movie 0")
+        version = get_movie_detail_version(self.movie.pk)
+
+        self.movie.title = "Renamed"
+        self.movie.save()
+        self.assertGreater(get_movie_detail_version(self.movie.pk), version)
+        self.assertEqual(self.client.get(f'/movies/{self.movie.pk}/').data["title"], "Renamed")
+
+    def test_cached_detail_is_reused(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"title": "cached"}
+
+        get_or_build_movie_detail(self.movie.pk, build)
+        get_or_build_movie_detail(self.movie.pk, build)
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_is_not_used(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"title": "fresh"}
+
+        get_or_build_movie_detail(self.movie.pk, build)
+        get_or_build_movie_detail(self.movie.pk, build)
+        self.assertEqual(len(calls), 2)
+
+
+class RelatedMoviesRefreshTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2)]
+        self.movies = create_movies(6, self.genres)
+        compute_related_movies()
+
+    def test_genre_change_only_marks_changed_movie(self):
+        movie = self.movies[0]
+        before = RelatedMovies.objects.get(pk=movie.pk).movie_ids
+        with CaptureQueriesContext(connection) as queries:
+            movie.genres.add(self.genres[1])
+        # 바뀐 영화 행만 UPDATE 하고 관련 영화 점수는 다시 계산하지 않음
+        related_queries = [query['sql'] for query in queries if 'movies_relatedmovies' in query['sql']]
+        self.assertEqual(len(related_queries), 1)
+        self.assertTrue(related_queries[0].startswith('UPDATE'))
+        self.assertEqual(stale_movie_ids(), [movie.pk])
+        self.assertEqual(RelatedMovies.objects.get(pk=movie.pk).movie_ids, before)
+
+    def test_rollback_discards_stale_mark(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.movies[0].genres.add(self.genres[1])
+            raise RuntimeError
+        self.assertEqual(stale_movie_ids(), [])
+
+    def test_stale_command_recomputes_marked_movies(self):
+        movie = self.movies[0]
+        movie.genres.add(self.genres[1])
+        call_command('build_related_movies', '--stale', stdout=open(os.devnull, 'w'))
+        self.assertEqual(stale_movie_ids(), [])
+        self.assertEqual(len(RelatedMovies.objects.get(pk=movie.pk).movie_ids), len(self.movies) - 1)
+
+    def test_missing_list_is_not_computed_on_read(self):
+        movie = Movie.objects.create(tmdb_id=9999, title="New")
+        self.assertEqual(get_related_movie_ids(movie), [])
+        self.assertFalse(RelatedMovies.objects.filter(pk=movie.pk).exists())
+        self.assertIn(movie.pk, stale_movie_ids())
+
+    def test_deferred_refresh_recomputes_only_stale_movies(self):
+        new_movie = Movie.objects.create(tmdb_id=9999, title="New")
+        new_movie.genres.set([self.genres[0]])
+        changed = self.movies[1]
+        with mock.patch('movies.related.compute_related_movies', wraps=compute_related_movies) as compute:
+            # 수집 중 예외가 나도 그때까지 들어온 영화는 갱신
+            with self.assertRaises(RuntimeError), defer_related_refresh():
+                changed.genres.add(self.genres[0])
+                raise RuntimeError
+        compute.assert_called_once_with(sorted([changed.pk, new_movie.pk]))
+        self.assertEqual(stale_movie_ids(), [])
+        self.assertIn(self.movies[0].pk, get_related_movie_ids(new_movie))
+
+    def test_migration_backfills_missing_lists(self):
+        migration = importlib.import_module('movies.migrations.0010_backfill_related_movies')
+        kept = RelatedMovies.objects.get(pk=self.movies[0].pk)
+        RelatedMovies.objects.exclude(pk=kept.pk).delete()
+        migration.populate_related_movies(apps, None)
+        self.assertEqual(RelatedMovies.objects.count(), len(self.movies))
+        self.assertEqual(stale_movie_ids(), [])
+        self.assertEqual(get_related_movie_ids(self.movies[1]), [self.movies[3].pk, self.movies[5].pk])
+
+
+class MovieSimilarViewTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2)]
+        self.movies = create_movies(4, self.genres)
+        self.client = APIClient()
+
+    def get(self, movie_id, **params):
+        with mock.patch('movies.views.similar_movies', return_value=[]) as similar:
+            response = self.client.get(f'/movies/{movie_id}/similar/', params)
+        return response, similar
+
+    def test_unknown_movie_is_404(self):
+        response, similar = self.get(999999)
+        self.assertEqual(response.status_code, 404)
+        similar.assert_not_called()
+
+    def test_genre_and_year_params_match_movie_list_filter(self):
+        response, similar = self.get(self.movies[0].pk, genre=f"Genre 2,{self.genres[0].pk}", year_min=2000)
+        self.assertEqual(response.status_code, 200)
+        similar.assert_called_once_with(
+            self.movies[0].pk, k=10, genre_ids={self.genres[0].pk, self.genres[1].pk}, year_min=2000,
+        )
+
+        response, similar = self.get(self.movies[0].pk, genre="없는 장르")
+        self.assertEqual(response.data, [])
+        similar.assert_not_called()
+
+        response, _ = self.get(self.movies[0].pk, year_max="abc")
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MOVIE_EMBEDDING_DIR=EMBEDDING_DIR)
+class KeywordRecommendationsWithoutStoreTests(TestCase):
+    def test_missing_store_returns_empty_without_encoding(self):
+        from movies.recommendation.keyword import keyword_recommendations
+
+        create_movies(3, [Genre.objects.create(tmdb_id=1, name="Drama")])
+        with mock.patch('movies.recommendation.keyword.get_sentence_model', side_effect=AssertionError), \
+                self.assertLogs('movies.recommendation.keyword', 'WARNING'):
+            self.assertEqual(keyword_recommendations("space"), [])
+        self.assertEqual(os.listdir(EMBEDDING_DIR), [])
+
+
+class VectorStore(SimpleNamespace):
+    # 재현율 측정에 필요한 임베딩 저장소 속성만 가진 메모리 저장소
+    def __len__(self):
+        return len(self.movie_ids)
+
+
+class SearchIndexRecallTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        titles = rng.normal(size=(300, 16)).astype(np.float32)
+        titles /= np.linalg.norm(titles, axis=1, keepdims=True)
+        self.store = VectorStore(movie_ids=np.arange(1, 301), titles=titles, overviews=titles.copy())
+        self.vectors = combined_vectors(self.store.titles, self.store.overviews)
+
+    def test_add_inserts_into_cluster_ranges(self):
+        index = IVFIndex.train(self.store.movie_ids[:200], self.vectors[:200], nlist=8)
+        index.add(self.store.movie_ids[200:], self.vectors[200:])
+        index.add(self.store.movie_ids[:10], -self.vectors[:10])
+
+        self.assertEqual(sorted(index.ids.tolist()), self.store.movie_ids.tolist())
+        np.testing.assert_array_equal(index.list_numbers(), index.assign(index.vectors))
+        row = index.ids.tolist().index(1)
+        np.testing.assert_allclose(index.vectors[row], -self.vectors[0])
+
+    def test_held_out_recall_does_not_search_query_movies(self):
+        index = IVFIndex.train(self.store.movie_ids, self.vectors, nlist=8)
+        trained = []
+        original_train = IVFIndex.train.__func__
+
+        def train(cls, ids, vectors, **kwargs):
+            trained.append(set(np.asarray(ids).tolist()))
+            return original_train(cls, ids, vectors, **kwargs)
+
+        with mock.patch.object(IVFIndex, 'train', classmethod(train)):
+            recall = ann_recall(self.store, index, queries=20, nprobe=index.nlist)
+        self.assertEqual(recall, {"recall": 1.0, "queries": 20})
+        self.assertEqual(len(trained[0]), 280)
+
+    def test_quantized_recall_excludes_query_movie(self):
+        codes, scales = quantize_rows(self.vectors)
+        vectors = QuantizedVectors(self.store.movie_ids, codes, scales, {})
+        with mock.patch('movies.recommendation.keyword.quantized_search', wraps=quantized_search) as search:
+            recall = quantized_recall(self.store, vectors, queries=20, rerank=300)
+        self.assertEqual(recall["reranked"], 1.0)
+        self.assertEqual(recall["queries"], 20)
+        self.assertGreater(recall["exact_ms"], 0)
+        self.assertGreater(recall["int8_ms"], 0)
+        # 자기 자신을 빼고도 k개가 남도록 k + 1 개를 요청
+        self.assertEqual(search.call_args.args[3], 11)
+
+
+class OverlapRatioTests(TestCase):
+    def test_ratio_is_over_all_selected_ids(self):
+        # 영화 0: 장르 1, 영화 1: 장르 1, 2
+        matrix = sparse.csr_matrix(np.array([[1, 0], [1, 1]], dtype=np.float32))
+        column_ids = np.array([1, 2])
+        # 카탈로그에 없는 장르 99 도 분모에 포함
+        np.testing.assert_allclose(_overlap_ratio(matrix, column_ids, {1, 99}), [0.5, 0.5])
+        np.testing.assert_allclose(_overlap_ratio(matrix, column_ids, {1, 2}), [0.5, 1.0])
+        np.testing.assert_allclose(_overlap_ratio(matrix, column_ids, {99}), [0.0, 0.0])
+
+
+@override_settings(MOVIE_EMBEDDING_DIR=EMBEDDING_DIR)
+class TasteProfileTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2, 3)]
+        self.movies = create_movies(4, self.genres[:2])
+        self.user = create_user('viewer')
+        self.user.liked_movies.add(self.movies[0])
+        self.profile = get_taste_profile(self.user)
+
+    def reload(self):
+        return UserTasteProfile.objects.get(pk=self.user.pk)
+
+    def test_like_and_unlike_apply_deltas(self):
+        genre_a, genre_b = (str(genre.pk) for genre in self.genres[:2])
+        self.assertEqual(self.profile.liked_genre_counts, {genre_a: 1})
+
+        self.user.liked_movies.add(self.movies[1], self.movies[2])
+        profile = self.reload()
+        self.assertEqual(profile.liked_movie_ids, [self.movies[0].pk, self.movies[1].pk, self.movies[2].pk])
+        self.assertEqual(profile.liked_genre_counts, {genre_a: 2, genre_b: 1})
+
+        self.user.liked_movies.remove(self.movies[0])
+        profile = self.reload()
+        self.assertEqual(profile.liked_movie_ids, [self.movies[1].pk, self.movies[2].pk])
+        self.assertEqual(profile.liked_genre_counts, {genre_a: 1, genre_b: 1})
+
+    def test_preference_deltas(self):
+        self.user.favorite_genres.add(self.genres[2], self.genres[0])
+        self.assertEqual(self.reload().favorite_genre_ids, sorted([self.genres[0].pk, self.genres[2].pk]))
+        # 반대편(장르 쪽)에서 뺀 경우도 같은 프로필에 반영
+        self.genres[2].favorite_genres_by_users.remove(self.user)
+        self.assertEqual(self.reload().favorite_genre_ids, [self.genres[0].pk])
+
+    def test_liked_movie_genre_change_recounts(self):
+        movie = self.movies[0]
+        movie.genres.add(self.genres[2])
+        self.assertEqual(self.reload().liked_genre_counts, {str(self.genres[0].pk): 1, str(self.genres[2].pk): 1})
+
+        self.genres[2].movies.clear()
+        self.assertEqual(self.reload().liked_genre_counts, {str(self.genres[0].pk): 1})
+
+        movie.genres.set([self.genres[1]])
+        self.assertEqual(self.reload().liked_genre_counts, {str(self.genres[1].pk): 1})
+
+    def test_row_is_created_before_reading_m2m(self):
+        UserTasteProfile.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            build_taste_profile(self.user)
+        sql = [query['sql'] for query in queries]
+        insert = next(index for index, query in enumerate(sql) if query.startswith('INSERT') and 'usertasteprofile' in query)
+        liked = next(index for index, query in enumerate(sql) if 'liked_movies' in query)
+        self.assertLess(insert, liked)
+
+    def test_profile_being_built_is_not_served(self):
+        UserTasteProfile.objects.filter(pk=self.user.pk).update(built_at=None, liked_movie_ids=[])
+        self.assertEqual(get_taste_profile(self.user).liked_movie_ids, [self.movies[0].pk])
+
+
+class MovieListCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2)]
+        self.movies = []
+        # 인기도 동점과 개봉일이 없는 영화를 섞어 (정렬 값, id) 키셋이 중복/누락 없이 이어지는지 확인
+        for index, (popularity, release_date) in enumerate([
+            (5.0, date(2020, 1, 1)), (5.0, None), (3.0, date(2010, 5, 1)), (9.0, date(2001, 1, 1)),
+            (5.0, date(2015, 1, 1)), (1.0, None), (3.0, date(2022, 3, 1)), (7.0, date(1999, 12, 31)),
+        ]):
+            movie = Movie.objects.create(
+                tmdb_id=2000 + index, title=f"Title {index % 3} {index}", overview="", release_date=release_date,
+            )
+            # save() 는 popularity 로 정규화 값을 다시 계산하므로 원하는 값을 직접 기록
+            Movie.objects.filter(pk=movie.pk).update(normalized_popularity=popularity)
+            movie.normalized_popularity = popularity
+            movie.genres.set([self.genres[index % 2]])  # 카드 테이블도 함께 갱신
+            self.movies.append(movie)
+        self.client = APIClient()
+
+    def walk(self, **params):
+        ids, cursor = [], None
+        while True:
+            query = dict(params, page_size=3, **({'cursor': cursor} if cursor else {}))
+            response = self.client.get('/movies/', query)
+            self.assertEqual(response.status_code, 200)
+            ids += [movie['id'] for movie in response.data['results']]
+            cursor = response.data['cursor']
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_movie_once_in_order(self):
+        by_popularity = sorted(self.movies, key=lambda movie: (-movie.normalized_popularity, -movie.pk))
+        self.assertEqual(self.walk(), [movie.pk for movie in by_popularity])
+
+        # 오름차순에서는 개봉일이 없는 영화가 먼저
+        by_release = sorted(self.movies, key=lambda movie: (movie.release_date is not None, movie.release_date or date.min, movie.pk))
+        self.assertEqual(self.walk(ordering='release_date'), [movie.pk for movie in by_release])
+
+        by_title = sorted(self.movies, key=lambda movie: (movie.title, movie.pk), reverse=True)
+        self.assertEqual(self.walk(ordering='-title'), [movie.pk for movie in by_title])
+
+    def test_deep_page_is_a_single_keyset_query(self):
+        response = self.client.get('/movies/', {'page_size': 2})
+        with self.assertNumQueries(1):
+            response = self.client.get('/movies/', {'page_size': 2, 'cursor': response.data['cursor']})
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_filters_are_applied_before_paging(self):
+        ids = self.walk(genre=str(self.genres[0].pk), popularity_min=4, year_min=2012)
+        # 장르 1 영화 0, 2, 4, 6 중 2 는 2010년 개봉, 6 은 인기도 3 이라 제외
+        self.assertEqual(ids, [self.movies[4].pk, self.movies[0].pk])
+
+    def test_invalid_ordering_and_cursor_are_rejected(self):
+        self.assertEqual(self.client.get('/movies/', {'ordering': 'overview'}).status_code, 400)
+        self.assertEqual(self.client.get('/movies/', {'cursor': 'not-a-cursor'}).status_code, 400)
+
+        cursor = base64.urlsafe_b64encode(json.dumps({'o': 'title', 'v': 'Title', 'id': 1}).encode()).decode()
+        # 다른 정렬 기준으로 만든 커서는 받지 않음
+        self.assertEqual(self.client.get('/movies/', {'cursor': cursor}).status_code, 400)
+
+
+class RecommendationBudgetTests(TestCase):
+    def setUp(self):
+        self.movies = create_movies(3, [Genre.objects.create(tmdb_id=1, name="Drama")])
+        get_catalog(refresh=True)
+
+    def fallback(self):
+        return ["fallback"]
+
+    def slow(self):
+        time.sleep(0.3)
+        return ["slow"]
+
+    def fail(self):
+        raise RuntimeError("source failed")
+
+    def test_timeout_and_error_use_fallback(self):
+        with self.assertLogs('movies.recommendation.budget', 'WARNING'):
+            results, report = run_with_budget(
+                {'fast': lambda: ["fast"], 'slow': self.slow, 'broken': self.fail},
+                {'fast': self.fallback, 'slow': self.fallback, 'broken': self.fallback},
+                budget_ms=100,
+            )
+        self.assertEqual(results, {'fast': ["fast"], 'slow': ["fallback"], 'broken': ["fallback"]})
+        self.assertEqual(report['degraded'], ['slow', 'broken'])
+        self.assertEqual(set(report), {'budget_ms', 'elapsed_ms', 'degraded', 'sources'})
+        self.assertEqual(
+            {name: source['status'] for name, source in report['sources'].items()},
+            {'fast': 'ok', 'slow': 'timeout', 'broken': 'error'},
+        )
+        self.assertIsNone(report['sources']['fast']['fallback_ms'])
+        self.assertIsNotNone(report['sources']['slow']['fallback_ms'])
+        self.assertLess(report['elapsed_ms'], 300)
+
+    def test_source_ms_is_own_latency(self):
+        results, report = run_with_budget(
+            {'slow': lambda: time.sleep(0.1) or [], 'fast': lambda: ["fast"]},
+            {'slow': self.fallback, 'fast': self.fallback},
+            budget_ms=1000,
+        )
+        # fast 는 slow 다음에 결과를 확인하지만, 자기 실행 시간만 기록
+        self.assertGreaterEqual(report['sources']['slow']['ms'], 100)
+        self.assertLess(report['sources']['fast']['ms'], 50)
+
+    def test_failing_fallback_uses_default(self):
+        with self.assertLogs('movies.recommendation.budget', 'ERROR'):
+            results, report = run_with_budget(
+                {'personalized': self.fail}, {'personalized': self.fail},
+                budget_ms=None, defaults={'personalized': ([], {"source": "fallback"})},
+            )
+        self.assertEqual(results['personalized'], ([], {"source": "fallback"}))
+        self.assertEqual(report['sources']['personalized']['status'], 'error')
+
+    def test_fallback_does_not_wait_for_catalog_rebuild(self):
+        catalog = get_catalog()
+        with mock.patch.object(catalog, 'built_at', time.monotonic() - 10 ** 6), catalog_module._catalog_lock:
+            # 다른 스레드가 다시 만드는 중: 만료된 카탈로그를 그대로 반환하고 DB 를 읽지 않음
+            with self.assertNumQueries(0):
+                self.assertIs(get_catalog(), catalog)
+                self.assertEqual(len(popular_fallback(limit=2)), 2)
+
+    def test_fallback_without_catalog_is_empty(self):
+        with mock.patch.object(catalog_module, '_catalog', None), self.assertNumQueries(0):
+            self.assertEqual(popular_fallback(), [])
+
+
+class RecomputeNormalizedPopularityTests(TestCase):
+    def setUp(self):
+        self.movies = create_movies(3, [Genre.objects.create(tmdb_id=1, name="Drama")])
+        Movie.objects.update(normalized_popularity=0)
+
+    def run_command(self, *args):
+        call_command('recompute_normalized_popularity', *args, stdout=open(os.devnull, 'w'))
+
+    def test_matches_movie_save_scale(self):
+        with mock.patch('movies.management.commands.recompute_normalized_popularity.compute_related_movies') as rebuild:
+            self.run_command()
+        rebuild.assert_not_called()
+        for movie in Movie.objects.all():
+            self.assertEqual(movie.normalized_popularity, movie.calculate_normalized_popularity())
+            movie.save()
+            # 다시 저장해도 같은 척도라 값이 바뀌지 않음
+            self.assertEqual(Movie.objects.get(pk=movie.pk).normalized_popularity, movie.normalized_popularity)
+
+    def test_related_rebuild_is_opt_in(self):
+        with mock.patch('movies.management.commands.recompute_normalized_popularity.compute_related_movies') as rebuild:
+            self.run_command('--rebuild-related')
+        rebuild.assert_called_once_with()
+
+
+class RecordingModel:
+    """
+    encode 호출을 기록하는 가짜 문장 임베딩 모델 (문장 길이로 벡터를 만듦)
+    """
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+class EncodeBatcherTests(TestCase):
+    def encode_concurrently(self, batcher, texts):
+        results = [None] * len(texts)
+
+        def encode(index):
+            try:
+                results[index] = batcher.encode(texts[index], timeout=5)
+            except Exception as error:
+                results[index] = error
+
+        threads = [threading.Thread(target=encode, args=(index,)) for index in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_submits_share_one_encode(self):
+        model = RecordingModel()
+        # 대기 시간을 길게 두고 묶음 크기만큼 요청이 차면 바로 처리되는지 확인
+        batcher = EncodeBatcher(lambda: model, max_batch_size=4, max_wait_ms=5000)
+        results = self.encode_concurrently(batcher, ["a", "bb", "bb", "cccc"])
+
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(sorted(model.calls[0]), ["a", "bb", "cccc"])  # 같은 문장은 한 번만 임베딩
+        for text, vector in zip(["a", "bb", "bb", "cccc"], results):
+            np.testing.assert_allclose(vector, normalize_rows(np.array([len(text), 1.0], dtype=np.float32)))
+        stats = batcher.stats()
+        self.assertEqual((stats['requests'], stats['batches'], stats['encoded'], stats['max_batch']), (4, 1, 3, 4))
+
+    def test_error_reaches_every_waiting_future(self):
+        error = RuntimeError("model failed")
+        batcher = EncodeBatcher(lambda: RecordingModel(error), max_batch_size=3, max_wait_ms=5000)
+        results = self.encode_concurrently(batcher, ["a", "b", "c"])
+
+        self.assertEqual(results, [error, error, error])
+        self.assertEqual(batcher.stats()['errors'], 1)
+        # 실패한 뒤에도 워커는 다음 요청을 계속 처리
+        batcher.model_getter, batcher.max_wait = RecordingModel, 0
+        self.assertEqual(batcher.encode("ok", timeout=5).shape, (2,))
+
+    def test_fork_starts_new_worker_and_queue(self):
+        batcher = EncodeBatcher(RecordingModel, max_batch_size=1)
+        batcher.encode("parent", timeout=5)
+        parent_thread, parent_queue = batcher._thread, batcher._queue
+
+        # fork 된 자식 프로세스처럼 pid 가 바뀌면 부모의 대기열/스레드를 버리고 새로 띄움
+        with mock.patch('movies.recommendation.batcher.os.getpid', return_value=os.getpid() + 1):
+            self.assertFalse(batcher.stats()['running'])
+            self.assertEqual(batcher.encode("child", timeout=5).shape, (2,))
+            self.assertTrue(batcher.stats()['running'])
+        self.assertIsNot(batcher._thread, parent_thread)
+        self.assertIsNot(batcher._queue, parent_queue)
+
+
+class KeywordCacheTests(TestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = TTLLRUCache(maxsize=4, ttl=10)
+        with mock.patch('movies.recommendation.query_cache.time.monotonic', return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch('movies.recommendation.query_cache.time.monotonic', return_value=109.9):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch('movies.recommendation.query_cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get("a"))
+        # 만료된 항목은 조회할 때 지워짐
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLLRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a 를 최근 사용으로 옮김
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_get_or_set_builds_once(self):
+        cache = TTLLRUCache(maxsize=2, ttl=60)
+        build = mock.Mock(return_value="value")
+        self.assertEqual(cache.get_or_set("key", build), "value")
+        self.assertEqual(cache.get_or_set("key", build), "value")
+        build.assert_called_once_with()
+
+    def test_normalize_keyword(self):
+        self.assertEqual(normalize_keyword("  Time \t Travel\n"), "time travel")
+        # NFKC: 전각 문자와 호환 문자를 같은 키로
+        self.assertEqual(normalize_keyword("ＳＦ　영화"), "sf 영화")
+        self.assertEqual(normalize_keyword("ﬁlm"), "film")
+        # casefold: 소문자 변환보다 넓은 대소문자 무시
+        self.assertEqual(normalize_keyword("STRASSE"), normalize_keyword("straße"))
+        # 한글 자모 조합형과 완성형도 같은 키
+        self.assertEqual(normalize_keyword("한"), normalize_keyword("한"))
+
+
+class DiversityRerankTests(TestCase):
+    def setUp(self):
+        # 영화 1, 2 는 거의 같은 벡터, 영화 3 은 직교
+        titles = np.array([[1, 0, 0], [0.99, 0.14, 0], [0, 0, 1]], dtype=np.float32)
+        titles = normalize_rows(titles)
+        self.store = VectorStore(
+            movie_ids=np.array([1, 2, 3]), titles=titles, overviews=titles.copy(), row_of={1: 0, 2: 1, 3: 2},
+        )
+        self.items = [{"movie_id": 1, "score": 3.0}, {"movie_id": 2, "score": 2.5}, {"movie_id": 3, "score": 1.0}]
+
+    def test_lambda_one_keeps_relevance_order(self):
+        relevance = np.array([0.2, 1.0, 0.5, 0.7], dtype=np.float32)
+        vectors = normalize_rows(np.random.default_rng(0).normal(size=(4, 8)).astype(np.float32))
+        self.assertEqual(mmr_order(relevance, vectors, 4, lambda_=1).tolist(), [1, 3, 2, 0])
+        self.assertEqual(mmr_rerank(self.items, 3, lambda_=1, store=self.store), self.items)
+
+    def test_lambda_zero_spreads_near_duplicates(self):
+        reranked = mmr_rerank(self.items, 3, lambda_=0, store=self.store)
+        self.assertEqual([item["movie_id"] for item in reranked], [1, 3, 2])
+        # 중간 값이면 점수 차이와 유사도를 함께 봄 (가까운 2번보다 멀리 있는 3번이 먼저)
+        reranked = mmr_rerank(self.items, 2, lambda_=0.5, store=self.store)
+        self.assertEqual([item["movie_id"] for item in reranked], [1, 3])
+
+    def test_movies_missing_from_store_have_zero_similarity(self):
+        items = self.items[:1] + [{"movie_id": 99, "score": 2.9}] + self.items[1:]
+        reranked = mmr_rerank(items, 4, lambda_=0.3, store=self.store)
+        self.assertEqual([item["movie_id"] for item in reranked][:2], [1, 99])
+
+    def test_invalid_mmr_lambda_is_rejected(self):
+        # recommendations_view 는 12번 사용자로 추천
+        create_user('viewer', id=12)
+        client = APIClient()
+        for value in (-0.1, 1.5, "abc", "nan"):
+            response = client.post('/movies/recommendations_view', {"mmr_lambda": value}, format='json')
+            self.assertEqual(response.status_code, 400, value)
+            self.assertIn("mmr_lambda", response.data)
+
+
+class ItemNeighborsTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        dense = (rng.random((40, 12)) < 0.3).astype(np.float32) * rng.integers(1, 4, size=(40, 12))
+        self.dense = dense
+        self.matrix = sparse.csr_matrix(dense)
+
+    def neighbor_scores(self, cols, scores):
+        return {
+            (row, int(col)): float(score)
+            for row in range(len(cols)) for col, score in zip(cols[row], scores[row]) if col >= 0
+        }
+
+    def test_full_neighbors_are_symmetric_cosine(self):
+        cols, scores = compute_item_neighbors(self.matrix, top_k=11, chunk_size=5)
+        pairs = self.neighbor_scores(cols, scores)
+
+        norms = np.linalg.norm(self.dense, axis=0)
+        cosine = (self.dense.T @ self.dense) / np.outer(norms, norms)
+        for (row, col), score in pairs.items():
+            self.assertNotEqual(row, col)
+            self.assertAlmostEqual(score, cosine[row, col], places=5)
+            self.assertAlmostEqual(pairs[col, row], score, places=6)
+        expected = {(row, col) for row in range(12) for col in range(12) if row != col and cosine[row, col] > 0}
+        self.assertEqual(set(pairs), expected)
+
+    def test_top_k_is_prefix_of_full_ranking(self):
+        full_cols, full_scores = compute_item_neighbors(self.matrix, top_k=11)
+        cols, scores = compute_item_neighbors(self.matrix, top_k=3, chunk_size=4)
+        np.testing.assert_array_equal(cols, full_cols[:, :3])
+        np.testing.assert_allclose(scores, full_scores[:, :3])
+        # 점수 내림차순
+        self.assertTrue(np.all(np.diff(scores, axis=1) <= 0))
+
+    def test_min_common_drops_rare_pairs(self):
+        cols, scores = compute_item_neighbors(self.matrix, top_k=11, min_common=3)
+        pairs = self.neighbor_scores(cols, scores)
+        binary = (self.dense > 0).astype(np.int64)
+        common = binary.T @ binary
+        expected = {(row, col) for row in range(12) for col in range(12) if row != col and common[row, col] >= 3}
+        self.assertTrue(expected)
+        self.assertEqual(set(pairs), expected)
+
+    def test_build_maps_columns_to_movie_ids(self):
+        movie_ids = np.arange(101, 113)
+        interactions = SimpleNamespace(matrix=self.matrix, movie_ids=movie_ids, shape=self.matrix.shape)
+        neighbors = ItemNeighbors.build(interactions, top_k=3)
+        cols, scores = compute_item_neighbors(self.matrix, top_k=3)
+
+        self.assertEqual(
+            [rec["movie_id"] for rec in neighbors.neighbors(101, k=2)], [int(movie_ids[col]) for col in cols[0, :2]],
+        )
+        self.assertEqual(neighbors.neighbors(999), [])
+        # 좋아요한 영화들의 이웃 점수를 합산
+        totals = neighbors.scores_for([101, 102])
+        first = dict((rec["movie_id"], rec["score"]) for rec in neighbors.neighbors(101, k=3))
+        second = dict((rec["movie_id"], rec["score"]) for rec in neighbors.neighbors(102, k=3))
+        for movie_id, score in totals.items():
+            self.assertAlmostEqual(score, first.get(movie_id, 0) + second.get(movie_id, 0), places=5)
+
+
+class ALSModelTests(TestCase):
+    def setUp(self):
+        # 사용자 1~6 은 영화 10~12, 사용자 7~12 는 영화 20~22 를 주로 봄
+        triples = []
+        for user_id in range(1, 13):
+            movies = (10, 11, 12) if user_id <= 6 else (20, 21, 22)
+            triples += [(user_id, movie_id, 1.0) for movie_id in movies if (user_id + movie_id) % 4]
+        triples += [(1, 20, 0.3), (7, 10, 0.3)]
+        self.interactions = Interactions.from_triples(triples)
+
+    def train(self, **kwargs):
+        options = dict(factors=4, iterations=10, regularization=0.1, alpha=10.0, workers=1)
+        options.update(kwargs)
+        return ALSModel.train(self.interactions, **options)
+
+    def loss(self, model):
+        # 암묵적 피드백 ALS 목적 함수: sum C (P - X Y^T)^2 + λ(|X|^2 + |Y|^2)
+        strengths = self.interactions.matrix.toarray()
+        confidence = 1 + model.meta['alpha'] * strengths
+        error = (strengths > 0) - model.user_factors @ model.item_factors.T
+        penalty = (model.user_factors ** 2).sum() + (model.item_factors ** 2).sum()
+        return float((confidence * error ** 2).sum() + model.meta['regularization'] * penalty)
+
+    def test_fold_in_solves_normal_equation(self):
+        model = self.train()
+        vector = model.fold_in([10, 11, 999], [1.0, 0.5, 1.0])  # 학습에 없는 영화는 무시
+
+        item_factors = model.item_factors
+        confidence = np.ones(len(model.movie_ids), dtype=np.float32)
+        preference = np.zeros(len(model.movie_ids), dtype=np.float32)
+        for movie_id, strength in ((10, 1.0), (11, 0.5)):
+            confidence[model.movie_col_of[movie_id]] = 1 + 10.0 * strength
+            preference[model.movie_col_of[movie_id]] = 1
+        lhs = item_factors.T @ (confidence[:, None] * item_factors) + 0.1 * np.eye(4)
+        np.testing.assert_allclose(lhs @ vector, item_factors.T @ (confidence * preference), rtol=1e-3, atol=1e-4)
+
+        # 같은 취향 묶음의 영화가 위로
+        ranked = model.movie_ids[np.argsort(-model.scores(vector))].tolist()
+        self.assertEqual(set(ranked[:3]), {10, 11, 12})
+        self.assertIsNone(model.fold_in([999], [1.0]))
+
+    def test_warm_start_reuses_factors_by_id(self):
+        model = self.train()
+        # 새 사용자/영화가 섞여 행 순서가 바뀌어도 같은 ID 의 인자에서 시작
+        rows, cols = self.interactions.matrix.nonzero()
+        self.interactions = Interactions.from_triples([(0, 5, 1.0)] + [
+            (int(self.interactions.user_ids[row]), int(self.interactions.movie_ids[col]), 1.0)
+            for row, col in zip(rows, cols)
+        ])
+        self.assertEqual((self.interactions.user_ids[0], self.interactions.movie_ids[0]), (0, 5))
+        started = ALSModel.train(self.interactions, factors=4, iterations=0, initial=model)
+        for user_id in model.user_ids.tolist():
+            np.testing.assert_array_equal(
+                started.user_factors[started.user_row_of[user_id]], model.user_factors[model.user_row_of[user_id]],
+            )
+        for movie_id in model.movie_ids.tolist():
+            np.testing.assert_array_equal(
+                started.item_factors[started.movie_col_of[movie_id]], model.item_factors[model.movie_col_of[movie_id]],
+            )
+        self.assertTrue(started.meta['warm_start'])
+
+    def test_warm_start_converges_faster(self):
+        model = self.train()
+        warm = self.train(iterations=1, initial=model)
+        cold = self.train(iterations=1)
+        self.assertLess(self.loss(warm), self.loss(cold))
+        self.assertLessEqual(self.loss(warm), self.loss(model) * 1.01)
+
+
+@override_settings(MOVIE_EMBEDDING_DIR=EMBEDDING_DIR)
+class TwoStagePipelineTests(TestCase):
+    def setUp(self):
+        self.genres = [Genre.objects.create(tmdb_id=tmdb_id, name=f"Genre {tmdb_id}") for tmdb_id in (1, 2, 3)]
+        # 영화 0, 3, 6, 9 는 장르 1 / 인기순은 영화 번호 순
+        self.movies = create_movies(12, self.genres)
+        self.user = create_user('viewer')
+        self.user.favorite_genres.add(self.genres[0])
+        self.user.liked_movies.add(self.movies[0])
+        self.user.watched_movies.add(self.movies[1])
+        self.catalog = get_catalog(refresh=True)
+
+    def test_candidates_are_union_without_seen_movies(self):
+        result = two_stage_recommendations(
+            self.user, k=20, generators=['genre', 'popularity'], limit=3, catalog=self.catalog,
+        )
+        genre_ids = {self.movies[index].pk for index in (0, 3, 6)}
+        popular_ids = {self.movies[index].pk for index in (0, 1, 2)}
+        candidates = (genre_ids | popular_ids) - {self.movies[0].pk, self.movies[1].pk}
+
+        self.assertEqual(result["candidate_count"], len(candidates))
+        sources = {item["movie_id"]: item["sources"] for item in result["items"]}
+        self.assertEqual(set(sources), candidates)
+        self.assertEqual(sources[self.movies[3].pk], ['genre'])
+        self.assertEqual(sources[self.movies[2].pk], ['popularity'])
+
+    def test_rerank_matches_full_catalog_scores(self):
+        result = two_stage_recommendations(self.user, k=3, catalog=self.catalog)
+        _, full_scores = personalized_scores(self.user, self.catalog)
+        for item in result["items"]:
+            self.assertAlmostEqual(item["score"], full_scores[self.catalog.row_of[item["movie_id"]]])
+        scores = [item["score"] for item in result["items"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(len(result["items"]), 3)
+
+    def test_timings_cover_every_stage(self):
+        result = two_stage_recommendations(self.user, k=5, limit=4, catalog=self.catalog)
+        timings = result["timings"]
+        self.assertEqual(set(timings["candidates"]), set(CANDIDATE_GENERATORS))
+        self.assertEqual(timings["candidates"]["popularity"]["count"], 4)
+        self.assertEqual(timings["candidates"]["embedding"]["count"], 0)  # 임베딩 저장소 없음
+        stages = [timings["context_ms"], timings["exclude_ms"], timings["rerank_ms"]]
+        stages += [stage["ms"] for stage in timings["candidates"].values()]
+        self.assertTrue(all(ms >= 0 for ms in stages))
+        self.assertGreaterEqual(timings["total_ms"] + 0.01, sum(stages))
+
+
+class EmbeddingUpsertTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='movie-test-upsert-')
+        self.genre = Genre.objects.create(tmdb_id=1, name="Drama")
+        self.movies = create_movies(4, [self.genre])
+        build_embedding_store(RecordingModel(), 'fake', self.directory)
+
+    def test_only_changed_movies_are_re_embedded(self):
+        before = EmbeddingStore(self.directory)
+        unchanged_title = np.array(before.titles[before.row_of[self.movies[0].pk]])
+        self.assertEqual([len(ids) for ids in stale_embedding_ids(before)], [0, 0])
+
+        Movie.objects.filter(pk=self.movies[1].pk).update(title="A much longer title")
+        Movie.objects.filter(pk=self.movies[2].pk).update(popularity=999)  # 제목/설명이 아니면 그대로
+        removed_id = self.movies[3].pk
+        self.movies[3].delete()
+        new_movie = Movie.objects.create(tmdb_id=9999, title="New", overview="Fresh overview")
+
+        stale_ids, removed_ids = stale_embedding_ids(before)
+        self.assertEqual(stale_ids.tolist(), [self.movies[1].pk, new_movie.pk])
+        self.assertEqual(removed_ids.tolist(), [removed_id])
+
+        model = RecordingModel()
+        _, new_ids, _, _ = upsert_embedding_store(
+            model, 'fake', stale_ids, self.directory, removed_ids=removed_ids,
+        )
+        self.assertEqual(new_ids.tolist(), stale_ids.tolist())
+        self.assertEqual(model.calls, [["A much longer title", "New"], ["Overview 1", "Fresh overview"]])
+
+        after = EmbeddingStore(self.directory)
+        self.assertEqual(
+            sorted(after.movie_ids.tolist()),
+            sorted([self.movies[0].pk, self.movies[1].pk, self.movies[2].pk, new_movie.pk]),
+        )
+        np.testing.assert_array_equal(after.titles[after.row_of[self.movies[0].pk]], unchanged_title)
+        np.testing.assert_allclose(
+            after.titles[after.row_of[self.movies[1].pk]],
+            normalize_rows(np.array([len("A much longer title"), 1.0], dtype=np.float32)),
+        )
+        self.assertEqual([len(ids) for ids in stale_embedding_ids(after)], [0, 0])
+
+    def test_nothing_changed_keeps_store(self):
+        built_at = EmbeddingStore(self.directory).meta['built_at']
+        model = RecordingModel()
+        upsert_embedding_store(model, 'fake', [], self.directory)
+        self.assertEqual(model.calls, [])
+        self.assertEqual(EmbeddingStore(self.directory).meta['built_at'], built_at)
@@ -34,12 +34,20 @@ urlpatterns = [
     
     # 영화 추천 엔드포인트 : 11-24 AHS
     path('recommendations_view', views.recommendations_view, name='recommendations_view'),
+    # 추천 모델 상태 / 키워드 캐시 적중률
+    path('recommendations/metrics/', views.recommendation_metrics_view, name='recommendation_metrics'),
     
 
     # --------------------------------------------------------------------------------------------
     # Cast & Crews 탭
     path('<int:movie_id>/', views.unified_movie_detail_view, name='unified_movie_detail'),
 
+    # 이 영화를 좋아한 사용자들이 함께 좋아한 영화 (협업 필터링)
+    path('<int:movie_id>/also-liked/', views.movie_also_liked_view, name='movie_also_liked'),
+
+    # 줄거리/제목이 비슷한 영화 (임베딩 유사도)
+    path('<int:movie_id>/similar/', views.movie_similar_view, name='movie_similar'),
+
     # 영화 좋아요/좋아요 취소 경로
     path('<int:movie_id>/like/', views.like_movie_view, name='like_movie'),
     
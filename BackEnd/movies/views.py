@@ -2,7 +2,7 @@
 
 import requests
 from django.http import JsonResponse
-from movies.models import Movie, Actor, Director, Genre
+from movies.models import Movie, MovieCard, Actor, Director, Genre
 from datetime import datetime
 import time
 from django.shortcuts import render
@@ -19,7 +19,19 @@ from rest_framework.permissions import IsAuthenticated
 from movies.serializers import ActorDetailSerializer
 from django.shortcuts import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
-from utils import create_notification
+from movies.pagination import MovieCursorPagination
+from movies.filters import filter_movies, genre_ids_from_params, year_range_from_params
+from community.comment_tree import load_comment_tree, comment_tree_options
+from movies.related import get_related_movie_ids, defer_related_refresh
+from movies.cache import get_or_build_movie_detail
+from movies.recommendation import (
+    keyword_recommendations, get_embedding_store, refresh_keyword_index,
+    keyword_cache_stats, model_status, also_liked_recommendations, als_recommendations, two_stage_recommendations,
+    encode_batcher_stats, get_precomputed_recommendations, popular_fallback, run_with_budget, budget_stats,
+    similar_movies, mmr_rerank,
+)
+from movies.recommendation.diversity import MMR_CANDIDATES
+from utils import create_notification, get_liked_ids
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.views import APIView
@@ -28,11 +40,8 @@ from django.db.models import Count
 from accounts.models import CustomUser
 from movies.models import Actor, Director
 from .serializers import ActorSerializer, DirectorSerializer, CustomUserSerializer, UnifiedMovieDetailSerializer
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
-# Sentence Transformers 모델 로드
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Sentence Transformers 모델은 movies.recommendation.get_sentence_model 에서 처음 필요할 때 로드
 User = get_user_model()
 
 '''# ㅍ페이지네이터
@@ -60,17 +69,31 @@ class CustomPagination(PageNumberPagination):
 # 영화 리스트 뷰 함수 (영화 검색 결과도 동일한 것 사용)
 @swagger_auto_schema(
     method='get',
-    operation_summary="영화 목록 조회 (페이지네이션 적용)",
-    operation_description="영화 목록 데이터를 반환합니다. 필터링 및 검색은 프론트엔드에서 처리됩니다.",
+    operation_summary="영화 목록 조회 (커서 페이지네이션 적용)",
+    operation_description="""
+        영화 목록 데이터를 반환합니다. 검색 및 필터링은 서버에서 처리됩니다.
+        - 정렬 가능 필드: normalized_popularity, release_date, title (내림차순은 '-' 접두사)
+        - 다음 페이지는 응답의 `next` URL 또는 `cursor` 값으로 요청합니다.
+    """,
+    manual_parameters=[
+        openapi.Parameter('ordering', openapi.IN_QUERY, description="정렬 기준 (기본값: -normalized_popularity)", type=openapi.TYPE_STRING),
+        openapi.Parameter('cursor', openapi.IN_QUERY, description="다음 페이지 커서", type=openapi.TYPE_STRING),
+        openapi.Parameter('page_size', openapi.IN_QUERY, description="페이지 크기 (기본값: 20, 최대 100)", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('search', openapi.IN_QUERY, description="영화 제목 검색어", type=openapi.TYPE_STRING),
+        openapi.Parameter('genre', openapi.IN_QUERY, description="장르 이름 또는 ID (쉼표로 구분)", type=openapi.TYPE_STRING),
+        openapi.Parameter('year_min', openapi.IN_QUERY, description="최소 개봉 연도", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('year_max', openapi.IN_QUERY, description="최대 개봉 연도", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('popularity_min', openapi.IN_QUERY, description="최소 정규화 평점", type=openapi.TYPE_NUMBER),
+        openapi.Parameter('popularity_max', openapi.IN_QUERY, description="최대 정규화 평점", type=openapi.TYPE_NUMBER),
+    ],
     responses={
         200: openapi.Response(
             description="성공적으로 영화 목록을 조회함",
             schema=openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
-                    "count": openapi.Schema(type=openapi.TYPE_INTEGER, description="총 데이터 개수"),
                     "next": openapi.Schema(type=openapi.TYPE_STRING, description="다음 페이지 URL"),
-                    "previous": openapi.Schema(type=openapi.TYPE_STRING, description="이전 페이지 URL"),
+                    "cursor": openapi.Schema(type=openapi.TYPE_STRING, description="다음 페이지 커서"),
                     "results": openapi.Schema(
                         type=openapi.TYPE_ARRAY,
                         items=openapi.Schema(
@@ -92,6 +115,7 @@ class CustomPagination(PageNumberPagination):
                 },
             )
         ),
+        400: openapi.Response(description="잘못된 정렬 기준, 커서 또는 필터 값"),
     }
 )
 @api_view(['GET'])
@@ -99,26 +123,21 @@ def movie_list_view(request):
     """
     영화 목록 조회 API
     - 기본 정렬 기준: normalized_popularity 내림차순
-    - 클라이언트가 다른 정렬 기준을 요청하면 이를 적용합니다.
+    - 허용된 정렬 기준만 적용하며, (정렬 값, id) 키셋 커서로 페이지를 나눕니다.
+    - 장르, 개봉 연도, 평점 범위, 제목 검색 필터를 서버에서 적용합니다.
     """
-    # 기본 정렬 기준 설정: normalized_popularity 내림차순
-    default_ordering = '-normalized_popularity'
+    # 필터 적용 (카드 테이블만 조회)
+    movies = filter_movies(MovieCard.objects.all(), request.query_params)
 
-    # 클라이언트 요청에서 정렬 기준 가져오기 (없으면 기본값 사용)
-    ordering = request.query_params.get('ordering', default_ordering)
-
-    # 정렬된 영화 데이터 가져오기
-    movies = Movie.objects.all().order_by(ordering)
-
-    # 페이지네이터 생성 및 적용
-    # paginator = CustomPagination()
-    # paginated_movies = paginator.paginate_queryset(movies, request)
+    # 커서 페이지네이션 적용 (정렬 기준 검증 포함)
+    paginator = MovieCursorPagination()
+    paginated_movies = paginator.paginate_queryset(movies, request)
 
     # 데이터 직렬화
-    serializer = MovieCardSerializer(movies, many=True)
+    serializer = MovieCardSerializer(paginated_movies, many=True)
 
     # 페이지네이션 응답 반환
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 # ----------------------------------------영화 디테일 통합 -------------------------------------    
 
@@ -142,7 +161,25 @@ def movie_list_view(request):
             description="조회할 영화의 ID",
             type=openapi.TYPE_INTEGER,
             required=True
-        )
+        ),
+        openapi.Parameter(
+            'comment_depth',
+            openapi.IN_QUERY,
+            description="대댓글을 포함할 최대 깊이 (0이면 최상위 댓글만, 기본값: 제한 없음)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            'replies_page_size',
+            openapi.IN_QUERY,
+            description="댓글마다 포함할 대댓글 최대 개수 (기본값: 전부)",
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            'replies_after',
+            openapi.IN_QUERY,
+            description="대댓글 커서 (댓글의 replies_next_cursor 값, 쉼표로 여러 개 지정)",
+            type=openapi.TYPE_STRING
+        ),
     ],
     responses={
         200: openapi.Response(description="성공적으로 영화 데이터를 반환"),
@@ -160,46 +197,60 @@ def unified_movie_detail_view(request, movie_id):
     - 뉴스 및 댓글
     - 영화 리뷰
     """
-    # 영화 객체 가져오기
-    movie = get_object_or_404(Movie, pk=movie_id)
+    comment_options = comment_tree_options(request)
+
+    def build_shared_data():
+        """
+        사용자와 무관한 공용 응답(출연진, 감독, 뉴스, 관련 영화, 리뷰, 댓글)을 만듭니다.
+        """
+        # 영화 객체 가져오기
+        movie = get_object_or_404(Movie, pk=movie_id)
+
+        # 기본 직렬화 데이터 (캐시를 모든 사용자가 공유하므로 요청 사용자 context 없이 직렬화)
+        serializer = UnifiedMovieDetailSerializer(movie)
+        serialized_data = serializer.data
+        serialized_data.pop('is_liked', None)
+
+        # 관련 영화 데이터 추가 (미리 계산된 이웃 목록 + 카드 테이블 기본 키 조회)
+        related_movies = MovieCard.in_order(get_related_movie_ids(movie, limit=8))
+        serialized_data['related_movies'] = [
+            {
+                'id': rel_movie.id,
+                'title': rel_movie.title,
+                'poster_path': rel_movie.poster_path,
+                'normalized_popularity': rel_movie.normalized_popularity,
+                'genres': rel_movie.genre_names,
+            }
+            for rel_movie in related_movies
+        ]
+
+        # 리뷰 데이터 추가
+        reviews_queryset = movie.reviews.select_related('user').order_by('-rating')
+        serialized_data['reviews'] = [
+            {
+                "id": review.id,
+                "rating": review.rating,
+                "content": review.content,
+                "user": review.user.username,
+                "created_at": review.created_at,
+                "updated_at": review.updated_at,
+            }
+            for review in reviews_queryset
+        ]
 
-    # 기본 직렬화 데이터
-    serializer = UnifiedMovieDetailSerializer(movie, context={'request': request})
-    serialized_data = serializer.data
+        # 댓글 데이터 추가 (전체 댓글을 한 번에 조회한 뒤 부모 댓글 기준 트리로 구성)
+        comment_tree = load_comment_tree(movie=movie, **comment_options)
+        comments_data = CommentSerializer(comment_tree.roots, many=True).data
+        serialized_data['comments'] = comments_data
 
-    # 관련 영화 데이터 추가
-    related_movies = Movie.objects.filter(
-        genres__in=movie.genres.all()
-    ).exclude(id=movie.id).distinct().order_by('-normalized_popularity')[:8]
-    serialized_data['related_movies'] = [
-        {
-            'id': rel_movie.id,
-            'title': rel_movie.title,
-            'poster_path': rel_movie.poster_path,
-            'normalized_popularity': rel_movie.normalized_popularity,
-            'genres': [genre.name for genre in rel_movie.genres.all()],
-        }
-        for rel_movie in related_movies
-    ]
+        return serialized_data
 
-    # 리뷰 데이터 추가
-    reviews_queryset = movie.reviews.all().order_by('-rating')
-    serialized_data['reviews'] = [
-        {
-            "id": review.id,
-            "rating": review.rating,
-            "content": review.content,
-            "user": review.user.username,
-            "created_at": review.created_at,
-            "updated_at": review.updated_at,
-        }
-        for review in reviews_queryset
-    ]
+    # 공용 응답은 영화별 버전 키로 캐시 (리뷰/댓글/뉴스/출연진 변경 시 버전이 올라가 무효화)
+    variant = '-'.join(f'{key}={value}' for key, value in sorted(comment_options.items()))
+    serialized_data = get_or_build_movie_detail(movie_id, build_shared_data, variant)
 
-    # 댓글 데이터 추가 (부모 댓글만 포함)
-    parent_comments = movie.movie_comments.filter(parent=None).order_by('-created_at')
-    comments_data = CommentSerializer(parent_comments, many=True, context={'request': request}).data
-    serialized_data['comments'] = comments_data
+    # 사용자별 값은 응답 시점에 덮어씀
+    serialized_data['is_liked'] = get_liked_ids(request).contains('movie', movie_id)
 
     return Response(serialized_data, status=status.HTTP_200_OK)
 
@@ -786,11 +837,11 @@ def actor_detail_view(request, actor_id):
     # 1. actor_id에 해당하는 Actor 객체를 가져옴. 없으면 404 반환.
     actor = get_object_or_404(Actor, pk=actor_id)
 
-    # 2. 배우에 달린 parent가 없는 댓글만 가져오기
-    comments_queryset = Comment.objects.filter(actor_id=actor_id, parent=None).order_by('-created_at')
+    # 2. 배우에 달린 댓글을 한 번에 가져와 parent가 없는 댓글 기준으로 트리 구성
+    comment_tree = load_comment_tree(actor=actor, **comment_tree_options(request))
 
     # 3. CommentSerializer를 활용하여 댓글 직렬화
-    comments_data = CommentSerializer(comments_queryset, many=True, context={'request': request}).data
+    comments_data = CommentSerializer(comment_tree.roots, many=True, context={'request': request}).data
 
     # 4. 배우 기본 데이터 직렬화
     serializer = ActorDetailSerializer(actor, context={'request': request})
@@ -1046,11 +1097,11 @@ def director_detail_view(request, director_id):
     # 1. director_id에 해당하는 Director 객체를 가져옴. 없으면 404 반환.
     director = get_object_or_404(Director, pk=director_id)
 
-    # 2. 감독에 달린 parent가 없는 댓글만 가져오기
-    comments_queryset = Comment.objects.filter(director_id=director_id, parent=None).order_by('-created_at')
+    # 2. 감독에 달린 댓글을 한 번에 가져와 parent가 없는 댓글 기준으로 트리 구성
+    comment_tree = load_comment_tree(director=director, **comment_tree_options(request))
 
     # 3. CommentSerializer를 활용하여 댓글 직렬화
-    comments_data = CommentSerializer(comments_queryset, many=True, context={'request': request}).data
+    comments_data = CommentSerializer(comment_tree.roots, many=True, context={'request': request}).data
 
     # 4. 감독 기본 데이터 직렬화
     serializer = DirectorDetailSerializer(director, context={'request': request})
@@ -1362,48 +1413,54 @@ def fetch_popular_movies_and_credits(request):
         # TMDB에서 장르 데이터를 가져와 저장
         fetch_and_store_genres()
 
-        # TMDB에서 인기 영화 데이터를 5페이지씩 가져오기
-        for page in range(1, 5):  # 페이지 범위는 필요에 따라 변경
-            url = f'{BASE_URL}/movie/popular'
-            headers = {'Authorization': settings.TMDB_API_TOKEN}
-            params = {'language': 'ko-KR', 'page': page}
-            response = requests.get(url, headers=headers, params=params)
+        # 수집이 끝나면 관련 영화 목록을 한 번에 다시 계산 (영화마다 갱신하지 않음)
+        with defer_related_refresh():
+            # TMDB에서 인기 영화 데이터를 5페이지씩 가져오기
+            for page in range(1, 5):  # 페이지 범위는 필요에 따라 변경
+                url = f'{BASE_URL}/movie/popular'
+                headers = {'Authorization': settings.TMDB_API_TOKEN}
+                params = {'language': 'ko-KR', 'page': page}
+                response = requests.get(url, headers=headers, params=params)
+
+                if response.status_code == 200:
+                    movies = response.json().get('results', [])
+                    for movie_data in movies:
+                        # 영화 정보를 저장 (업데이트 또는 새로 생성)
+                        movie, created = Movie.objects.update_or_create(
+                            tmdb_id=movie_data['id'],
+                            defaults={
+                                'title': movie_data['title'],
+                                'overview': movie_data['overview'],
+                                'release_date': parse_release_date(movie_data.get('release_date')),
+                                'popularity': movie_data.get('popularity'),
+                                'poster_path': movie_data.get('poster_path'),
+                            }
+                        )
+                        print(f"영화 저장 완료: {movie.title} ({'새로 생성됨' if created else '업데이트됨'})")
 
-            if response.status_code == 200:
-                movies = response.json().get('results', [])
-                for movie_data in movies:
-                    # 영화 정보를 저장 (업데이트 또는 새로 생성)
-                    movie, created = Movie.objects.update_or_create(
-                        tmdb_id=movie_data['id'],
-                        defaults={
-                            'title': movie_data['title'],
-                            'overview': movie_data['overview'],
-                            'release_date': parse_release_date(movie_data.get('release_date')),
-                            'popularity': movie_data.get('popularity'),
-                            'poster_path': movie_data.get('poster_path'),
-                        }
-                    )
-                    print(f"영화 저장 완료: {movie.title} ({'새로 생성됨' if created else '업데이트됨'})")
-
-                    # 영화 장르 설정
-                    genre_ids = movie_data.get('genre_ids', [])
-                    genres = Genre.objects.filter(tmdb_id__in=genre_ids)
-                    movie.genres.set(genres)
-
-                    # 영화 출연진 및 감독 정보 저장
-                    fetch_movie_credits(movie)
-
-                    # YouTube에서 영화 트레일러 가져오기
-                    trailer_link = fetch_trailer_from_youtube(movie.title)
-                    if trailer_link:
-                        movie.trailer_link = trailer_link
-                        movie.save()
-                        print(f"트레일러 저장 완료: {movie.title} - {trailer_link}")
-            else:
-                print(f"영화 데이터를 가져오는 데 실패했습니다. 상태 코드: {response.status_code}")
+                        # 영화 장르 설정
+                        genre_ids = movie_data.get('genre_ids', [])
+                        genres = Genre.objects.filter(tmdb_id__in=genre_ids)
+                        movie.genres.set(genres)
+
+                        # 영화 출연진 및 감독 정보 저장
+                        fetch_movie_credits(movie)
+
+                        # YouTube에서 영화 트레일러 가져오기
+                        trailer_link = fetch_trailer_from_youtube(movie.title)
+                        if trailer_link:
+                            movie.trailer_link = trailer_link
+                            movie.save()
+                            print(f"트레일러 저장 완료: {movie.title} - {trailer_link}")
+                else:
+                    print(f"영화 데이터를 가져오는 데 실패했습니다. 상태 코드: {response.status_code}")
 
-            # API 요청 제한을 고려하여 페이지 간 요청마다 1초 대기
-            time.sleep(1)
+                # API 요청 제한을 고려하여 페이지 간 요청마다 1초 대기
+                time.sleep(1)
+
+        # 새로 생겼거나 제목/설명이 바뀐 영화만 다시 임베딩 (저장소가 이미 있을 때만)
+        if get_embedding_store() is not None:
+            refresh_keyword_index()
 
         return JsonResponse({'success': '영화 데이터가 성공적으로 저장되었습니다!'})
     except Exception as e:
@@ -1545,6 +1602,10 @@ def update_overview_for_all_movies(request):
             else:
                 print(f"영화 정보를 가져오는 데 실패했습니다. 영화: {movie.title}, 상태 코드: {response.status_code}")
 
+        # 설명이 바뀐 영화만 다시 임베딩 (저장소가 이미 있을 때만)
+        if get_embedding_store() is not None:
+            refresh_keyword_index()
+
         return JsonResponse({'success': '모든 영화에 대한 overview 업데이트 완료'})
     except Exception as e:
         return JsonResponse({'error': f'오류 발생: {str(e)}'}, status=500)
@@ -1620,136 +1681,19 @@ class SearchDataView(APIView):
 
 # 1. 사용자 정보 기반
 
-def calculate_genre_similarity(movie, user):
-    """
-    사용자 선호 장르와 영화 장르 간의 유사도를 계산.
-    """
-    user_genres = user.favorite_genres.all()
-    movie_genres = movie.genres.all()
-    common_genres = set(user_genres).intersection(movie_genres)
-    return len(common_genres) / len(user_genres) if user_genres else 0
-
-
-def calculate_liked_movies_similarity(movie, user):
-    """
-    사용자가 좋아요한 영화와 현재 영화의 장르 유사도를 계산.
-    """
-    liked_movies = user.liked_movies.all()
-    similarities = [
-        1 for liked_movie in liked_movies
-        if liked_movie.genres.filter(id__in=movie.genres.values_list('id', flat=True)).exists()
-    ]
-    return sum(similarities) / len(liked_movies) if liked_movies else 0
-
-
-def calculate_actor_similarity(movie, user):
-    """
-    사용자가 즐겨찾기한 배우가 출연한 영화인지 확인.
-    """
-    favorite_actors = user.favorite_actors.all()
-    movie_actors = movie.actor_movies.all()
-    common_actors = set(favorite_actors).intersection(movie_actors)
-    return len(common_actors) / len(favorite_actors) if favorite_actors else 0
-
-def calculate_director_similarity(movie, user):
-    """
-    사용자가 즐겨찾기한 감독이 연출한 영화인지 확인.
-    """
-    favorite_directors = user.favorite_directors.all()
-    movie_directors = movie.director_movies.all()
-    common_directors = set(favorite_directors).intersection(movie_directors)
-    return len(common_directors) / len(favorite_directors) if favorite_directors else 0
-
-def calculate_friend_activity(movie, user):
-    """
-    팔로우한 친구들이 좋아요한 영화와의 유사도 계산.
-    """
-    friends = user.following.all()
-    friend_liked_movies = Movie.objects.filter(liked_movies_by_users__in=friends).distinct()
-    return 1 if movie in friend_liked_movies else 0
-
-
-def personalized_recommendations(user):
-    """
-    사용자 개인화 추천 리스트 생성
-    """
-    movies = Movie.objects.prefetch_related('genres', 'actor_movies', 'director_movies').all()
-    recommendations = []
-
-    for movie in movies:
-        genre_score = calculate_genre_similarity(movie, user)
-        liked_movie_score = calculate_liked_movies_similarity(movie, user)
-        actor_score = calculate_actor_similarity(movie, user)
-        director_score = calculate_director_similarity(movie, user)
-        friend_score = calculate_friend_activity(movie, user)
-
-        # 가중치 기반 최종 점수 계산
-        total_score = (
-            0.3 * genre_score +
-            0.2 * liked_movie_score +
-            0.2 * actor_score +
-            0.2 * director_score +
-            0.1 * friend_score
-        )
-
-        recommendations.append({"movie": movie, "score": total_score})
-
-    # 점수 기준 정렬
-    recommendations = sorted(recommendations, key=lambda x: x["score"], reverse=True)
-    return recommendations[:10]  # 상위 10개 영화 반환
+# 개인화 추천은 movies.recommendation.two_stage_recommendations 에서 후보 생성 -> 후보만 재정렬로 계산
+# (전체 카탈로그 점수는 movies.recommendation.personalized_recommendations)
 
 
 # 2. 키워드 기반
 
 
-# 전역 캐싱 딕셔너리
-movie_embeddings_cache = {}
-
-def get_movie_embeddings(movie):
-    """
-    영화의 제목과 설명 임베딩을 반환. 캐싱을 사용해 중복 계산 방지.
-    """
-    if movie.id not in movie_embeddings_cache:
-        movie_embeddings_cache[movie.id] = {
-            "title_embedding": model.encode(movie.title),
-            "overview_embedding": model.encode(movie.overview or "")
-        }
-    return movie_embeddings_cache[movie.id]
-
-
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-
-def keyword_based_recommendations_optimized(keyword):
+def keyword_based_recommendations_optimized(keyword, k=10):
     """
     최적화된 키워드 기반 영화 추천.
+    (영화 임베딩은 워커들이 공유하는 메모리 맵 저장소에서 읽음)
     """
-    movies = Movie.objects.prefetch_related('genres').all()
-    keyword_embedding = model.encode(keyword)
-
-    title_embeddings = []
-    overview_embeddings = []
-    movie_list = []
-
-    # 영화 데이터에서 캐싱된 임베딩 가져오기
-    for movie in movies:
-        embeddings = get_movie_embeddings(movie)
-        title_embeddings.append(embeddings["title_embedding"])
-        overview_embeddings.append(embeddings["overview_embedding"])
-        movie_list.append(movie)
-
-    # 배치로 코사인 유사도 계산
-    title_similarities = cosine_similarity([keyword_embedding], title_embeddings)[0]
-    overview_similarities = cosine_similarity([keyword_embedding], overview_embeddings)[0]
-
-    # 가중치를 적용해 점수 계산
-    recommendations = []
-    for i, movie in enumerate(movie_list):
-        total_score = 0.6 * title_similarities[i] + 0.4 * overview_similarities[i]
-        recommendations.append({"movie": movie, "score": total_score})
-
-    # 점수 기준으로 정렬
-    return sorted(recommendations, key=lambda x: x["score"], reverse=True)[:10]
+    return keyword_recommendations(keyword, k=k)
 
 
 
@@ -1767,6 +1711,14 @@ def keyword_based_recommendations_optimized(keyword):
                 description='추천받고 싶은 영화의 키워드 (선택)',
                 example='time travel'
             ),
+            'mmr_lambda': openapi.Schema(
+                type=openapi.TYPE_NUMBER,
+                description=(
+                    '다양성 재정렬(MMR) 가중치 0~1 (선택). 주면 개인화/키워드 추천 후보 중 서로 비슷한 영화를 덜 고릅니다. '
+                    '1 이면 점수 순서 그대로, 낮을수록 다양하게'
+                ),
+                example=0.7
+            ),
         },
         required=[]  # 키워드는 선택 필드
     ),
@@ -1793,6 +1745,31 @@ def keyword_based_recommendations_optimized(keyword):
                         }
                     )
                 ),
+                'pipeline': openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    description=(
+                        "개인화 추천 출처(source: precomputed | on_demand). "
+                        "즉석 생성한 경우 단계별 소요 시간(ms)과 재정렬한 후보 수 포함, 시간 제한을 넘기면 fallback"
+                    ),
+                ),
+                'mmr_lambda': openapi.Schema(
+                    type=openapi.TYPE_NUMBER,
+                    description="적용한 다양성 재정렬(MMR) 가중치 (주지 않았으면 null)",
+                ),
+                'degraded': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    description="시간 제한을 넘기거나 실패해 인기순/장르 인기순 목록으로 대신한 소스 이름",
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                ),
+                'budget': openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    description="요청 시간 제한(budget_ms), 전체 소요 시간(elapsed_ms), 소스별 상태(ok | timeout | error), 소스 자체 실행 시간(ms)과 대체 추천 시간(fallback_ms)",
+                ),
+                'collaborative_recommendations': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    description="협업 필터링(ALS) 추천 영화 리스트 (학습된 모델이 없으면 빈 리스트)",
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
                 'keyword_based_recommendations': openapi.Schema(
                     type=openapi.TYPE_ARRAY,
                     description="키워드 기반 추천 영화 리스트",
@@ -1832,30 +1809,150 @@ def recommendations_view(request):
     keyword = request.data.get('keyword', None)  # 키워드 입력받기
 
     user = User.objects.get(pk=12)
-    # 개인화 추천 생성
-    personalized = personalized_recommendations(user)
-    personalized_movies = [rec["movie"] for rec in personalized]
 
-    # 키워드 기반 추천 생성
-    if keyword:
-        keyword_based = keyword_based_recommendations_optimized(keyword)
-        keyword_movies = [rec["movie"] for rec in keyword_based]
+    # 다양성 재정렬(MMR): 주면 후보를 넉넉히 가져와 서로 비슷한 영화를 덜 고르도록 10개를 다시 고름
+    mmr_lambda = request.data.get('mmr_lambda', None)
+    if mmr_lambda not in (None, ''):
+        try:
+            mmr_lambda = float(mmr_lambda)
+        except (TypeError, ValueError):
+            mmr_lambda = -1
+        if not 0 <= mmr_lambda <= 1:
+            return Response({"mmr_lambda": "0 이상 1 이하의 숫자를 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
     else:
-        keyword_movies = []
+        mmr_lambda = None
+    k = MMR_CANDIDATES if mmr_lambda is not None else 10
+
+    def diversify(items):
+        return mmr_rerank(items, 10, mmr_lambda) if mmr_lambda is not None else items
+
+    def personalized_source():
+        # 야간 배치로 미리 계산한 목록을 한 번의 조회로 사용하고,
+        # 목록이 없거나(신규 사용자) 계산 뒤 좋아요/선호가 바뀌었으면 즉석에서 생성 (후보 생성 -> 후보만 재정렬)
+        precomputed = get_precomputed_recommendations(user, k)
+        if precomputed is not None:
+            return diversify(precomputed), {"source": "precomputed"}
+        personalized = two_stage_recommendations(user, k)
+        return diversify(personalized["items"]), {
+            "source": "on_demand",
+            "candidate_count": personalized["candidate_count"],
+            "timings": personalized["timings"],
+        }
+
+    # 대체 추천은 DB 를 읽지 않아야 하므로 선호 장르는 소스를 실행하기 전에 요청 스레드에서 한 번만 조회
+    favorite_genre_ids = list(user.favorite_genres.values_list('id', flat=True))
+
+    def personalized_fallback():
+        # 선호 장르 영화 중 인기순 (메모리의 카탈로그만 사용)
+        return popular_fallback(genre_ids=favorite_genre_ids), {"source": "fallback"}
+
+    # 소스마다 요청 시간 제한 안에서 실행하고, 넘기거나 실패한 소스는 메모리의 인기순/장르 인기순 목록으로 채움
+    sources = {
+        'personalized': personalized_source,
+        # 협업 필터링(ALS) 추천 (train_als 로 학습한 인자 행렬이 없으면 빈 목록)
+        'collaborative': lambda: als_recommendations(user),
+    }
+    fallbacks = {'personalized': personalized_fallback, 'collaborative': popular_fallback}
+    if keyword:
+        sources['keyword'] = lambda: diversify(keyword_based_recommendations_optimized(keyword, k))
+        fallbacks['keyword'] = popular_fallback
+    results, budget = run_with_budget(sources, fallbacks, defaults={'personalized': ([], {"source": "fallback"})})
+
+    personalized, pipeline = results['personalized']
+    personalized_movies = MovieCard.in_order(rec["movie_id"] for rec in personalized)
+    collaborative_movies = MovieCard.in_order(rec["movie_id"] for rec in results['collaborative'])
+    keyword_movies = MovieCard.in_order(rec["movie_id"] for rec in results['keyword']) if keyword else []
 
     # 영화 정보 직렬화
     personalized_serialized = MovieCardSerializer(personalized_movies, many=True).data
     keyword_serialized = MovieCardSerializer(keyword_movies, many=True).data
+    collaborative_serialized = MovieCardSerializer(collaborative_movies, many=True).data
 
     # 결과 반환
     response_data = {
         "personalized_recommendations": personalized_serialized,
         "keyword_based_recommendations": keyword_serialized,
+        "collaborative_recommendations": collaborative_serialized,
+        "pipeline": pipeline,
+        "degraded": budget["degraded"],
+        "budget": budget,
+        "mmr_lambda": mmr_lambda,
     }
 
     return Response(response_data)
 
 
+@swagger_auto_schema(
+    method='get',
+    operation_summary="함께 좋아한 영화",
+    operation_description="이 영화를 좋아요/시청/높게 평가한 사용자들이 함께 좋아한 영화를 반환합니다. (build_item_neighbors 로 미리 계산)",
+    manual_parameters=[
+        openapi.Parameter('limit', openapi.IN_QUERY, description="최대 개수 (기본값 10, 최대 50)", type=openapi.TYPE_INTEGER),
+    ],
+)
+@api_view(['GET'])
+def movie_also_liked_view(request, movie_id):
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    neighbors = also_liked_recommendations(movie_id, k=limit)
+    movies = MovieCard.in_order(rec["movie_id"] for rec in neighbors)
+    return Response(MovieCardSerializer(movies, many=True).data)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="비슷한 영화",
+    operation_description=(
+        "이 영화의 제목/설명 임베딩과 가까운 영화를 반환합니다. "
+        "키워드 추천과 같은 저장 벡터를 쓰므로 요청 시 모델을 호출하지 않으며, "
+        "많이 본 영화는 build_similar_movies 로 미리 계산한 목록을 사용합니다."
+    ),
+    manual_parameters=[
+        openapi.Parameter('limit', openapi.IN_QUERY, description="최대 개수 (기본값 10, 최대 50)", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('genre', openapi.IN_QUERY, description="장르 ID 또는 이름 (쉼표로 여러 개, 하나라도 포함)", type=openapi.TYPE_STRING),
+        openapi.Parameter('year_min', openapi.IN_QUERY, description="최소 개봉 연도", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('year_max', openapi.IN_QUERY, description="최대 개봉 연도", type=openapi.TYPE_INTEGER),
+    ],
+)
+@api_view(['GET'])
+def movie_similar_view(request, movie_id):
+    get_object_or_404(Movie, pk=movie_id)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+
+    # 영화 목록 필터와 같은 방식으로 장르/연도 파라미터 해석 (숫자가 아닌 연도는 400)
+    years = year_range_from_params(request.query_params)
+    genre_ids = genre_ids_from_params(request.query_params)
+    if genre_ids is not None and not genre_ids:
+        return Response([])
+
+    neighbors = similar_movies(movie_id, k=limit, genre_ids=genre_ids or (), **years)
+    movies = MovieCard.in_order(rec["movie_id"] for rec in neighbors)
+    return Response(MovieCardSerializer(movies, many=True).data)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="추천 지표",
+    operation_description=(
+        "현재 워커의 문장 임베딩 모델 상태, 키워드 캐시 적중/미스 통계, "
+        "키워드 임베딩 묶음 처리 대기열 길이와 묶음 크기 통계, 추천 소스별 시간 초과/대체 횟수를 반환합니다."
+    ),
+)
+@api_view(['GET'])
+def recommendation_metrics_view(request):
+    return Response({
+        "model": model_status(),
+        "keyword_cache": keyword_cache_stats(),
+        "encode_batcher": encode_batcher_stats(),
+        "recommendation_sources": budget_stats(),
+    })
+
+
 '''
 24.11.24. WKH
 '''
@@ -168,6 +168,36 @@ DATABASES = {
     }
 }
 
+# Cache
+# 기본값은 별도 설정 없이 동작하는 프로세스 로컬 캐시이며, 이때 영화 상세 응답 캐시는 꺼집니다.
+# (상세 캐시 버전 키는 모든 워커가 공유해야 하므로 movies.cache.detail_cache_enabled 가 LocMemCache 를 제외)
+# 상세 캐시를 쓰려면 CACHE_URL 로 공용 백엔드를 지정합니다.
+# 예: redis://127.0.0.1:6379/1, pymemcache://127.0.0.1:11211,
+#     dbcache://movierec_cache (이 경우 배포 시 python manage.py createcachetable 실행)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+MOVIE_DETAIL_CACHE_TIMEOUT = 60 * 10  # 영화 상세 공용 응답 캐시 유지 시간 (초)
+RECOMMENDATION_CATALOG_TTL = 60 * 5  # 추천용 영화 카탈로그 행렬 재사용 시간 (초)
+RECOMMENDATION_PRECOMPUTE_TOP_K = 50  # precompute_recommendations 가 사용자마다 저장할 추천 수
+RECOMMENDATION_TIME_BUDGET_MS = 500  # 추천 요청 하나의 시간 제한 (ms), 넘긴 소스는 인기순/장르 인기순 목록으로 대체 (None 이면 제한 없음)
+RECOMMENDATION_SOURCE_THREADS = 8  # 추천 소스를 동시에 실행할 워커 프로세스당 스레드 수
+RECOMMENDATION_MMR_LAMBDA = 0.7  # MMR 다양성 재정렬 기본 가중치 (1 이면 점수 순서 그대로, 낮을수록 다양하게)
+RECOMMENDATION_MMR_CANDIDATES = 50  # MMR 을 쓸 때 추천 소스마다 가져와 다시 고를 후보 수
+
+# 추천 임베딩
+SENTENCE_TRANSFORMER_MODEL = 'all-MiniLM-L6-v2'  # 키워드 추천에 사용하는 문장 임베딩 모델
+MOVIE_EMBEDDING_DIR = os.path.join(BASE_DIR, 'embeddings')  # build_movie_embeddings 로 만든 .npy 저장 위치
+MOVIE_ANN_MIN_SIZE = 10000  # 영화 수가 이 값 이상일 때만 IVF 근사 검색 사용 (미만이면 전수 검색)
+MOVIE_ANN_NPROBE = 8  # 검색 시 탐색할 클러스터 수 (클수록 재현율 증가, 지연 시간 증가)
+MOVIE_EMBEDDING_QUANTIZED = False  # True 면 전수 검색 대신 int8 양자화 벡터(약 1/4 메모리)로 점수 계산 후 상위 후보만 float32 재정렬
+MOVIE_QUANTIZED_RERANK = 200  # int8 근사 점수 상위 몇 개를 float32 로 다시 점수 매길지
+KEYWORD_CACHE_SIZE = 1024  # 키워드 질의 벡터/결과 LRU 캐시 최대 항목 수
+KEYWORD_CACHE_TTL = 60 * 60  # 키워드 캐시 항목 유지 시간 (초)
+KEYWORD_ENCODE_BATCHING = True  # 동시에 들어온 키워드 임베딩 요청을 모아 한 번에 추론
+KEYWORD_ENCODE_BATCH_SIZE = 32  # 한 번에 추론할 최대 키워드 수
+KEYWORD_ENCODE_MAX_WAIT_MS = 5  # 첫 요청 이후 요청을 더 모으는 최대 대기 시간 (ms)
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_HEADERS = [
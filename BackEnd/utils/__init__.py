@@ -1,8 +1,11 @@
 # utils/__init__.py
 
 from .notifications import create_notification  # 알림 유틸리티
+from .liked_ids import LikedIds, get_liked_ids  # 요청 단위 좋아요 ID 집합
 
 __all__ = [
     'create_notification', 
+    'LikedIds',
+    'get_liked_ids',
 
 ]
@@ -0,0 +1,70 @@
+# utils/liked_ids.py
+
+
+class LikedIds:
+    """
+    현재 사용자의 좋아요/즐겨찾기 대상 ID 집합을 요청 단위로 보관하는 클래스
+
+    - 종류별로 처음 필요할 때 한 번만 조회하고, 이후에는 메모리의 집합으로 판별합니다.
+    - 시리얼라이저의 is_liked 가 객체마다 EXISTS 쿼리를 실행하지 않도록 하기 위해 사용합니다.
+    """
+    # 종류 -> CustomUser 의 관계 이름
+    RELATIONS = {
+        'movie': 'liked_movies',
+        'post': 'liked_posts',
+        'review': 'liked_reviews',
+        'actor': 'favorite_actors',
+        'director': 'favorite_directors',
+        'comment': 'liked_comments',
+        'disliked_comment': 'disliked_comments',
+    }
+
+    def __init__(self, user):
+        self.user = user if user is not None and user.is_authenticated else None
+        self._ids = {}
+
+    def ids(self, kind):
+        """
+        종류(kind)에 해당하는 ID 집합을 반환합니다. (비로그인 사용자는 빈 집합)
+        """
+        if kind not in self.RELATIONS:
+            raise ValueError(f"지원하지 않는 종류입니다: {kind}")
+        if kind not in self._ids:
+            if self.user is None:
+                self._ids[kind] = frozenset()
+            else:
+                relation = getattr(self.user, self.RELATIONS[kind])
+                self._ids[kind] = frozenset(relation.values_list('pk', flat=True))
+        return self._ids[kind]
+
+    def contains(self, kind, obj):
+        """
+        객체(또는 pk)가 현재 사용자의 좋아요/즐겨찾기 대상인지 여부를 반환합니다.
+        """
+        pk = getattr(obj, 'pk', obj)
+        return pk in self.ids(kind)
+
+    def invalidate(self, kind=None):
+        """
+        좋아요 토글 등으로 관계가 바뀐 뒤 다시 조회하도록 캐시를 비웁니다.
+        """
+        if kind is None:
+            self._ids.clear()
+        else:
+            self._ids.pop(kind, None)
+
+
+def get_liked_ids(request):
+    """
+    요청 객체에 LikedIds 를 한 번만 만들어 붙여두고 반환합니다.
+    같은 요청을 공유하는 모든 시리얼라이저가 같은 ID 집합을 사용합니다.
+    """
+    if request is None:
+        return LikedIds(None)
+    # DRF Request 와 Django HttpRequest 어느 쪽에서 불러도 같은 객체를 쓰도록 원본 요청에 보관
+    http_request = getattr(request, '_request', request)
+    liked_ids = getattr(http_request, '_liked_ids', None)
+    if liked_ids is None:
+        liked_ids = LikedIds(getattr(request, 'user', None))
+        http_request._liked_ids = liked_ids
+    return liked_ids
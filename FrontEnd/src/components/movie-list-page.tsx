@@ -107,8 +107,8 @@ const GenreSwiper: React.FC<{ genres: Genre[] }> = ({ genres }) => {
 };
 
 export default function MovieListPage() {
-  const [allMovies, setAllMovies] = useState<Movie[]>([]);
   const [visibleMovies, setVisibleMovies] = useState<Movie[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedGenre, setSelectedGenre] = useState('전체');
   const [yearRange, setYearRange] = useState([1900, 2024]);
@@ -139,11 +139,26 @@ export default function MovieListPage() {
     if (node) observer.current.observe(node);
   }, []);
 
+  // 필터 조건이 바뀌면 첫 페이지부터 다시 조회 (검색/필터링은 서버에서 처리)
+  const buildParams = useCallback((cursor: string | null) => {
+    const params: Record<string, string | number> = {
+      year_min: yearRange[0],
+      year_max: yearRange[1],
+      popularity_min: ratingRange[0],
+      popularity_max: ratingRange[1],
+    };
+    if (searchTerm) params.search = searchTerm;
+    if (selectedGenre !== '전체') params.genre = selectedGenre;
+    if (cursor) params.cursor = cursor;
+    return params;
+  }, [searchTerm, selectedGenre, yearRange, ratingRange]);
+
   useEffect(() => {
     const fetchMovies = async () => {
       try {
-        const response = await api.get('/movies/');
-        setAllMovies(response.data);
+        const response = await api.get('/movies/', { params: buildParams(null) });
+        setVisibleMovies(response.data.results);
+        setNextCursor(response.data.cursor);
       } catch (err) {
         setError('영화를 불러오는데 실패했습니다. 나중에 다시 시도해주세요.');
       } finally {
@@ -152,24 +167,25 @@ export default function MovieListPage() {
     };
 
     fetchMovies();
-  }, []);
+  }, [buildParams]);
 
+  // 스크롤이 마지막 카드에 닿으면 다음 커서 페이지를 이어서 조회
   useEffect(() => {
-    const filteredMovies = allMovies.filter(movie => {
-      if (!movie.release_date) return false;
+    if (page === 1 || !nextCursor) return;
 
-      const movieYear = parseInt(movie.release_date.substring(0, 4));
-
-      return movie.title.toLowerCase().includes(searchTerm.toLowerCase()) &&
-        (selectedGenre === '전체' || movie.genres.some(genre => genre.name === selectedGenre)) &&
-        movieYear >= yearRange[0] &&
-        movieYear <= yearRange[1] &&
-        movie.normalized_popularity >= ratingRange[0] &&
-        movie.normalized_popularity <= ratingRange[1];
-    });
+    const fetchNextPage = async () => {
+      try {
+        const response = await api.get('/movies/', { params: buildParams(nextCursor) });
+        setVisibleMovies(prevMovies => [...prevMovies, ...response.data.results]);
+        setNextCursor(response.data.cursor);
+      } catch (err) {
+        setError('영화를 불러오는데 실패했습니다. 나중에 다시 시도해주세요.');
+      }
+    };
 
-    setVisibleMovies(filteredMovies.slice(0, page * 20)); // 20 movies per page
-  }, [allMovies, searchTerm, selectedGenre, yearRange, ratingRange, page]);
+    fetchNextPage();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [page]);
 
   const handleMovieClick = (movieId: number) => {
     router.push(`/?movieId=${movieId}`, { scroll: false });